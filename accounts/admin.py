@@ -2,21 +2,23 @@ from django.contrib import admin
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
-from shared_features.mixins import ModelAdminMixin
+from shared_features.mixins import ScalableModelAdminMixin
 
 from .models import JobSeeker, Company, IndustryArea, Address, FileStore
 
 
 # @admin.register(User)
-class UserModelAdmin(ModelAdminMixin):
+class UserModelAdmin(ScalableModelAdminMixin):
     """
     handle User class instance in Django admin panel
+
+    search is a case-sensitive prefix match on indexed email and username,
+    filters are limited to low cardinality fields
     """
 
-    list_display = ("username", "email", "first_name", "last_name")
-    search_fields = ("username", "email", "first_name", "last_name")
-    list_filter = ("username", "email", "first_name", "last_name")
-    ordering = ("username", "email", "first_name", "last_name")
+    list_display = ("email", "username", "first_name", "last_name", "usage_type")
+    search_fields = ("email__startswith", "username__startswith")
+    list_filter = ("usage_type", "is_active", "is_staff", "is_removed")
 
 
 admin.site.register(User, UserModelAdmin)
@@ -0,0 +1,155 @@
+"""
+build elasticsearch documents of candidates (job seekers searched by
+employers)
+
+a candidate document carries what employers search and see of a job seeker,
+denormalized from User, JobSeeker, its active Address, skills and resumes
+(FileStore), so candidate searches read the index only. gender and birth
+date are left out of the index, candidates are not filtered by them.
+"""
+
+import logging
+import os
+
+from django.db.models import Prefetch
+
+from shared_features.utils.elasticsearch_utils import es_service
+from shared_features.utils.geocoding import Location, geocode_city
+
+from .elastic_index_keys import candidate_index_keys
+from .models import FileStore, JobSeeker
+
+logger = logging.getLogger(__name__)
+
+# text of resumes in these formats is indexed, other formats only by file name
+RESUME_TEXT_EXTENSIONS = (".txt", ".md")
+RESUME_TEXT_MAX_BYTES = 64 * 1024
+
+# changing them needs a new index: manage.py rebuild_candidate_index
+candidate_index_mappings = {
+    "dynamic": False,
+    "properties": {
+        "id": {"type": "integer"},
+        "user_id": {"type": "integer"},
+        "first_name": {"type": "text"},
+        "last_name": {"type": "text"},
+        "education": {"type": "keyword"},
+        "skills": {"type": "text", "fields": {"keyword": {"type": "keyword"}}},
+        "skill_ids": {"type": "integer"},
+        # normalized city (shared_features.utils.geocoding.normalize_city)
+        "city": {"type": "keyword"},
+        "location": {"type": "geo_point"},
+        "resume_text": {"type": "text"},
+        "resume_names": {"type": "text"},
+        # returned to employers as stored, not searched
+        "resumes": {"type": "object", "enabled": False},
+        "updated_at": {"type": "date"},
+    },
+}
+
+
+def active_candidates(queryset=None):
+    """
+    job seekers of active users, with the relations of their documents
+    """
+    if queryset is None:
+        queryset = JobSeeker.objects.all()
+    return (
+        queryset.filter(user__is_active=True, user__is_removed=False)
+        .select_related("user", "active_address")
+        .prefetch_related(
+            "skills",
+            Prefetch(
+                "file_stores",
+                queryset=FileStore.objects.filter(is_active=True).order_by("-pk"),
+            ),
+        )
+        .order_by("pk")
+    )
+
+
+def resume_text(file_store):
+    """
+    leading text of a plain text resume, empty for other formats or
+    unreadable files
+    """
+    name = file_store.file_path.name
+    if os.path.splitext(name)[1].lower() not in RESUME_TEXT_EXTENSIONS:
+        return ""
+    try:
+        with file_store.file_path.open("rb") as resume:
+            return resume.read(RESUME_TEXT_MAX_BYTES).decode("utf-8", "ignore")
+    except OSError:
+        logger.warning("resume %s of file store %s unreadable", name, file_store.pk)
+        return ""
+
+
+def candidate_location(job_seeker):
+    address = job_seeker.active_address
+    if address is None or address.is_removed:
+        return Location("")
+    return geocode_city(address.city)
+
+
+def candidate_document(job_seeker):
+    """
+    document of a job seeker, relations must be loaded (see
+    `candidate_documents`) to avoid a query per field
+    """
+    location = candidate_location(job_seeker)
+    skills = list(job_seeker.skills.all())
+    resumes = list(job_seeker.file_stores.all())
+    return {
+        "id": job_seeker.pk,
+        "user_id": job_seeker.user_id,
+        "first_name": job_seeker.user.first_name,
+        "last_name": job_seeker.user.last_name,
+        "education": job_seeker.education,
+        "skills": [skill.name for skill in skills],
+        "skill_ids": [skill.pk for skill in skills],
+        "city": location.city,
+        "location": (
+            {"lat": location.latitude, "lon": location.longitude}
+            if location.latitude is not None
+            else None
+        ),
+        "resume_text": "\n".join(filter(None, map(resume_text, resumes))),
+        "resume_names": [os.path.basename(resume.file_path.name) for resume in resumes],
+        "resumes": [
+            {"id": resume.pk, "url": resume.file_path.url} for resume in resumes
+        ],
+        "updated_at": job_seeker.updated_at.isoformat(),
+    }
+
+
+def candidate_documents(queryset=None, batch_size=1000):
+    """
+    yield documents of active candidates of `queryset` (every job seeker by
+    default), relations are prefetched per batch so memory stays bound by
+    `batch_size`
+    """
+    for job_seeker in active_candidates(queryset).iterator(chunk_size=batch_size):
+        yield candidate_document(job_seeker)
+
+
+def create_candidate_index():
+    """
+    create the candidate index with its mappings unless it exists
+    """
+    return es_service.create_index(candidate_index_keys, candidate_index_mappings)
+
+
+def index_candidates(pks):
+    """
+    (re)index documents of job seekers `pks` with one bulk request, removed
+    job seekers and the ones of inactive users are deleted from the index
+    """
+    pks = set(pks)
+    documents = list(candidate_documents(JobSeeker.objects.filter(pk__in=pks)))
+    try:
+        es_service.bulk_index(documents, candidate_index_keys)
+        removed = pks - {document["id"] for document in documents}
+        if removed:
+            es_service.bulk_delete(removed, candidate_index_keys)
+    except Exception:
+        logger.exception("indexing of %s candidates failed", len(pks))
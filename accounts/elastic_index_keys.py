@@ -0,0 +1,5 @@
+"""
+define elasticsearch index keys
+"""
+
+candidate_index_keys = "candidate_index"
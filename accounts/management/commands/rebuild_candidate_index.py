@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.documents import candidate_documents, create_candidate_index
+from accounts.elastic_index_keys import candidate_index_keys
+from shared_features.utils.elasticsearch_utils import es_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the candidate index with its current mappings and index every "
+        "active job seeker again. Needed after a mapping change or writes that "
+        "bypassed signals, candidate searches are incomplete while it runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="only create the index when it is missing and reindex into it",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if not options["keep"]:
+            es_service.delete_index(candidate_index_keys)
+        create_candidate_index()
+        indexed = es_service.bulk_index(
+            candidate_documents(batch_size=options["batch_size"]),
+            candidate_index_keys,
+            chunk_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{indexed} candidates indexed in {time.monotonic() - started:.1f}s"
+            )
+        )
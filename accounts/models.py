@@ -89,6 +89,21 @@ class User(AbstractBaseUser, PermissionsMixin, ModelMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
 
+    class Meta:
+        indexes = [
+            # prefix search of the admin, LIKE 'x%' needs pattern ops on PostgreSQL
+            models.Index(
+                fields=["email"],
+                name="user_email_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(
+                fields=["username"],
+                name="user_username_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
+
     def __str__(self):
         return self.email
     
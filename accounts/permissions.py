@@ -0,0 +1,27 @@
+from rest_framework import permissions
+
+
+class IsEmployer(permissions.BasePermission):
+    """
+    Allows access only to authenticated users registered as Employer.
+    """
+
+    def has_permission(self, request, view):
+        return bool(
+            request.user
+            and request.user.is_authenticated
+            and request.user.usage_type == "Employer"
+        )
+
+
+class IsJobSeeker(permissions.BasePermission):
+    """
+    Allows access only to authenticated users registered as JobSeeker.
+    """
+
+    def has_permission(self, request, view):
+        return bool(
+            request.user
+            and request.user.is_authenticated
+            and request.user.usage_type == "JobSeeker"
+        )
@@ -0,0 +1,73 @@
+"""
+candidate search of employers on elasticsearch
+
+pages are served from the stored candidate documents (accounts.documents),
+without database queries. the in-memory backend has no query dsl and no
+database fallback, searches are then unavailable.
+"""
+
+from shared_features.utils.elasticsearch_utils import SearchResults
+from shared_features.utils.geocoding import geocode_city
+
+from .elastic_index_keys import candidate_index_keys
+
+CANDIDATE_TEXT_FIELDS = (
+    "skills^3",
+    "resume_text",
+    "resume_names",
+    "first_name",
+    "last_name",
+)
+
+CANDIDATE_SOURCE_FIELDS = (
+    "id",
+    "first_name",
+    "last_name",
+    "education",
+    "skills",
+    "skill_ids",
+    "city",
+    "resumes",
+    "updated_at",
+)
+
+
+def candidate_search_body(params):
+    """
+    search request body of validated search parameters (see
+    CandidateSearchSerializer), without `from` / `size`. searches with words
+    are ranked by relevance, the others list recently updated profiles first
+    """
+    filters = [{"term": {"skill_ids": pk}} for pk in params.get("skill_ids", ())]
+    if params.get("education"):
+        filters.append({"terms": {"education": params["education"]}})
+    if params.get("city"):
+        filters.append({"term": {"city": geocode_city(params["city"]).city}})
+    query = {"bool": {"filter": filters}}
+    sort = [{"updated_at": "desc"}, {"id": "desc"}]
+    if params.get("q"):
+        query["bool"]["must"] = [
+            {
+                "multi_match": {
+                    "query": params["q"],
+                    "fields": list(CANDIDATE_TEXT_FIELDS),
+                    "operator": "and",
+                }
+            }
+        ]
+        sort.insert(0, "_score")
+    return {"query": query, "sort": sort}
+
+
+class CandidateSearchResults(SearchResults):
+    """
+    candidates matching a search body, read from the stored documents
+    """
+
+    source = list(CANDIDATE_SOURCE_FIELDS)
+
+    def __init__(self, body, index_name=candidate_index_keys):
+        super().__init__(body, None, index_name)
+
+    def load(self, hits):
+        return [hit["_source"] for hit in hits]
@@ -1,9 +1,21 @@
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
 
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
-from .models import User
+from shared_features.reference_data import skills
+from shared_features.serializers import (
+    MeasuredRepresentationMixin,
+    ReferencePrimaryKeyField,
+    SkillsWriteSerializerMixin,
+)
+from shared_features.utils.m2m import set_m2m
+
+from .choices import EDUCATION_CHOICES
+from .models import JobSeeker, User
+
+CANDIDATE_SEARCH_MAX_SKILLS = 20
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -118,4 +130,97 @@ class StaffRegisterSerializer(BaseRegisterSerializer):
             password=validated_data["password"],
             usage_type="JobSeeker",
         )
-        return user
\ No newline at end of file
+        return user
+
+
+class JobSeekerProfileSerializer(
+    MeasuredRepresentationMixin, SkillsWriteSerializerMixin, serializers.ModelSerializer
+):
+    """
+    profile serializer for jobseeker
+
+    fields:
+        skill_ids / skill_names: see SkillsWriteSerializerMixin, replace the
+            skills of the job seeker when given
+        skills: id and name of skills of the job seeker (read only)
+    """
+
+    class Meta:
+        model = JobSeeker
+        fields = (
+            "id",
+            "birth_date",
+            "gender",
+            "education",
+            "skill_ids",
+            "skill_names",
+        )
+        read_only_fields = ("id",)
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            skill_ids = self.pop_skill_ids(validated_data)
+            instance = super().update(instance, validated_data)
+            if skill_ids is not None:
+                set_m2m(instance, "skills", skill_ids)
+        return instance
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # one query for the ids, names come from the reference data cache
+        skill_ids = sorted(
+            JobSeeker.skills.through.objects.filter(
+                jobseeker_id=instance.pk
+            ).values_list("skill_id", flat=True)
+        )
+        data["skills"] = [
+            {"id": pk, "name": skills.get_name(pk)}
+            for pk in skill_ids
+            if skills.exists(pk)
+        ]
+        return data
+
+
+class CandidateSearchSerializer(serializers.Serializer):
+    """
+    query parameters of the candidate search route
+
+    fields:
+        q: words to find in skills, resumes and names
+        skill_ids: candidates must have every skill, repeatable
+        education: any of the education levels, repeatable
+        city: city of the candidate's active address, any gazetteer spelling
+    """
+
+    q = serializers.CharField(required=False, max_length=255)
+    skill_ids = serializers.ListField(
+        child=ReferencePrimaryKeyField(skills),
+        required=False,
+        max_length=CANDIDATE_SEARCH_MAX_SKILLS,
+    )
+    education = serializers.ListField(
+        child=serializers.ChoiceField(EDUCATION_CHOICES), required=False
+    )
+    city = serializers.CharField(required=False, max_length=100)
+
+
+class CandidateSerializer(MeasuredRepresentationMixin, serializers.Serializer):
+    """
+    candidate of a search result, built from its stored search document
+    (accounts.documents) without queries
+    """
+
+    id = serializers.IntegerField()
+    first_name = serializers.CharField()
+    last_name = serializers.CharField()
+    education = serializers.CharField(allow_null=True)
+    city = serializers.CharField()
+    skills = serializers.SerializerMethodField()
+    resumes = serializers.ListField(child=serializers.DictField())
+    updated_at = serializers.DateTimeField()
+
+    def get_skills(self, document):
+        return [
+            {"id": pk, "name": name}
+            for pk, name in zip(document["skill_ids"], document["skills"])
+        ]
@@ -0,0 +1,82 @@
+import threading
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from shared_features.signals import m2m_bulk_changed, skills_merged
+
+from .models import Address, FileStore, JobSeeker, User
+from .tasks import queue_candidates_index
+
+# reindex task of job seekers changed by the current transaction
+pending_candidate_index = threading.local()
+
+
+def candidates_changed(pks):
+    """
+    queue the reindexing of candidates `pks`, one task shared by every
+    change of the transaction
+    """
+    queue_candidates_index(pks, pending_candidate_index)
+
+
+@receiver(post_save, sender=JobSeeker)
+@receiver(post_delete, sender=JobSeeker)
+def refresh_candidate(sender, instance, raw=False, **kwargs):
+    if not raw:
+        candidates_changed([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def refresh_user_candidate(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    names and the active flag of the user are part of the candidate, logins
+    (which only write `last_login`) are not
+    """
+    if raw or instance.usage_type != "JobSeeker":
+        return
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    pks = list(JobSeeker.objects.filter(user=instance).values_list("pk", flat=True))
+    if pks:
+        candidates_changed(pks)
+
+
+@receiver(post_save, sender=Address)
+def refresh_address_candidates(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    pks = list(
+        JobSeeker.objects.filter(active_address=instance).values_list("pk", flat=True)
+    )
+    if pks:
+        candidates_changed(pks)
+
+
+@receiver(post_save, sender=FileStore)
+@receiver(post_delete, sender=FileStore)
+def refresh_resume_candidate(sender, instance, raw=False, **kwargs):
+    if not raw and instance.job_seeker_id is not None:
+        candidates_changed([instance.job_seeker_id])
+
+
+@receiver(m2m_changed, sender=JobSeeker.skills.through)
+def refresh_skills_candidates(sender, instance, action, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, JobSeeker):
+        candidates_changed([instance.pk])
+    elif kwargs["pk_set"]:
+        candidates_changed(kwargs["pk_set"])
+
+
+@receiver(m2m_bulk_changed, sender=JobSeeker.skills.through)
+def refresh_bulk_skills_candidates(sender, pks, **kwargs):
+    candidates_changed(pks)
+
+
+@receiver(skills_merged)
+def refresh_merged_skills_candidates(sender, changed, **kwargs):
+    pks = changed.get(JobSeeker)
+    if pks:
+        candidates_changed(pks)
@@ -0,0 +1,20 @@
+"""
+background tasks of accounts, run by manage.py run_workers (see
+shared_features.task_queue)
+"""
+
+from shared_features.task_queue import enqueue_in_transaction, task
+
+from .documents import index_candidates
+
+
+@task(name="accounts.index_candidates")
+def index_candidates_task(pks):
+    """
+    reindex candidates `pks` with one bulk request
+    """
+    index_candidates(pks)
+
+
+def queue_candidates_index(pks, pending):
+    enqueue_in_transaction(index_candidates_task, pks, pending)
@@ -0,0 +1,127 @@
+from django.conf import settings
+
+from rest_framework.exceptions import Throttled
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from shared_features.utils.rate_limit import (
+    CacheTokenBucketStore,
+    ConcurrencyLimiter,
+    InMemoryTokenBucketStore,
+)
+
+DEFAULT_AUTH_RATE_LIMIT = {
+    # "memory" for per process buckets, "cache" to share them between workers
+    "STORE": "memory",
+    "CACHE_ALIAS": "default",
+    "IP": {"CAPACITY": 20, "REFILL_PER_SECOND": 0.5},
+    "EMAIL": {"CAPACITY": 5, "REFILL_PER_SECOND": 0.05},
+    # password hashing requests running at once in one process
+    "MAX_CONCURRENT_HASHING": 4,
+}
+
+_store = None
+_hashing_limiter = None
+
+
+def get_auth_rate_limit():
+    return {**DEFAULT_AUTH_RATE_LIMIT, **getattr(settings, "AUTH_RATE_LIMIT", {})}
+
+
+def get_token_bucket_store():
+    global _store
+    if _store is None:
+        config = get_auth_rate_limit()
+        if config["STORE"] == "cache":
+            _store = CacheTokenBucketStore(alias=config["CACHE_ALIAS"])
+        else:
+            _store = InMemoryTokenBucketStore()
+    return _store
+
+
+def get_hashing_limiter():
+    global _hashing_limiter
+    if _hashing_limiter is None:
+        _hashing_limiter = ConcurrencyLimiter(
+            get_auth_rate_limit()["MAX_CONCURRENT_HASHING"]
+        )
+    return _hashing_limiter
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    token bucket throttle, `scope` selects the bucket config in AUTH_RATE_LIMIT
+    """
+
+    scope = None
+
+    def get_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        key = self.get_key(request, view)
+        if key is None:
+            return True
+
+        config = get_auth_rate_limit()[self.scope]
+        allowed, self.wait_seconds = get_token_bucket_store().consume(
+            f"{self.scope}:{key}", config["CAPACITY"], config["REFILL_PER_SECOND"]
+        )
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    """
+    limits auth requests per client ip
+    """
+
+    scope = "IP"
+
+    def get_key(self, request, view):
+        # without NUM_PROXIES get_ident keys on the raw X-Forwarded-For, any
+        # client could take a fresh bucket per request by changing it
+        if api_settings.NUM_PROXIES is None:
+            return request.META.get("REMOTE_ADDR")
+        return self.get_ident(request)
+
+
+class AuthEmailThrottle(TokenBucketThrottle):
+    """
+    limits auth requests per email, slows down credential stuffing on one
+    account from many ips
+    """
+
+    scope = "EMAIL"
+
+    def get_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email:
+            return None
+        return email.strip().lower()
+
+
+class HashingConcurrencyLimitMixin:
+    """
+    view mixin for endpoints that hash passwords, sheds load with 429 when
+    MAX_CONCURRENT_HASHING requests of this process are already hashing so
+    they can not take every worker
+    """
+
+    throttle_classes = (AuthIPThrottle, AuthEmailThrottle)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not get_hashing_limiter().try_acquire():
+            raise Throttled(wait=1, detail="Server is busy, try again later.")
+        self._hashing_slot = True
+
+    def dispatch(self, request, *args, **kwargs):
+        self._hashing_slot = False
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._hashing_slot:
+                get_hashing_limiter().release()
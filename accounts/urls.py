@@ -10,6 +10,8 @@ from .views import (
     EmployerRegisterCreateAPIView,
     LogoutGenericAPIView,
     CustomTokenObtainPairView,
+    JobSeekerProfileRetrieveUpdateAPIView,
+    CandidateSearchAPIView,
 )
 
 urlpatterns = [
@@ -31,4 +33,14 @@ urlpatterns = [
     path("v1/login/", CustomTokenObtainPairView.as_view(), name="v1_token_obtain_pair"),
     path("v1/token/refresh/", TokenRefreshView.as_view(), name="v1_token_refresh"),
     path("v1/logout/", LogoutGenericAPIView.as_view(), name="v1_logout"),
+    path(
+        "v1/jobseeker-profile/",
+        JobSeekerProfileRetrieveUpdateAPIView.as_view(),
+        name="v1_jobseeker_profile",
+    ),
+    path(
+        "v1/candidates/search/",
+        CandidateSearchAPIView.as_view(),
+        name="v1_candidate_search",
+    ),
 ]
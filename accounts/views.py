@@ -1,6 +1,9 @@
+import logging
+
 from django.contrib.auth import get_user_model
 
 from rest_framework import generics, permissions
+from rest_framework.exceptions import APIException, NotFound
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -10,23 +13,36 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.response import Response
 from rest_framework import status
 
+from shared_features.paginations import StandardResultsSetPagination
+from shared_features.utils.elasticsearch_utils import elasticsearch_search_enabled
+
+from .models import JobSeeker
+from .permissions import IsEmployer, IsJobSeeker
+from .search import CandidateSearchResults, candidate_search_body
 from .serializers import (
+    CandidateSearchSerializer,
+    CandidateSerializer,
     JobSeekerRegisterSerializer,
     EmployerRegisterSerializer,
     StaffRegisterSerializer,
     CustomTokenObtainPairSerializer,
+    JobSeekerProfileSerializer,
 )
+from .throttling import HashingConcurrencyLimitMixin
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
 
-class CustomTokenObtainPairView(TokenObtainPairView):
+class CustomTokenObtainPairView(HashingConcurrencyLimitMixin, TokenObtainPairView):
     """
     LOGIN ROUTE (CustomTokenObtainPairView)
 
         **Permissions**
         ---------------
         - **Allow Any**: This endpoint is accessible to all users, including unauthenticated users, to allow login.
+        - **Rate Limited**: Token buckets per ip and per email, plus a cap on concurrent password hashing.
 
         **Request Method**
         ------------------
@@ -74,6 +90,12 @@ class CustomTokenObtainPairView(TokenObtainPairView):
                 ```
 
         - **On Failure**:
+            - **Rate Limited** (`429 Too Many Requests`, with `Retry-After` header):
+                ```json
+                {
+                    "detail": "Request was throttled. Expected available in 10 seconds."
+                }
+                ```
             - **Invalid Credentials**:
                 ```json
                 {
@@ -140,9 +162,11 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
-class RegisterCreateAPIViewMixin(generics.CreateAPIView):
+class RegisterCreateAPIViewMixin(HashingConcurrencyLimitMixin, generics.CreateAPIView):
     """
     Register CreateAPIView Mixin
+
+    rate limited per ip and per email, password hashing is capped per process
     """
     queryset = User.objects.select_related().prefetch_related().all()
     permission_classes = (permissions.AllowAny,)
@@ -154,6 +178,7 @@ class StaffRegisterCreateAPIView(RegisterCreateAPIViewMixin):
         **Permissions**
         ---------------
         - **Allow Any**: This endpoint is accessible to all users, including unauthenticated users, to allow registration.
+        - **Rate Limited**: Token buckets per ip and per email, plus a cap on concurrent password hashing.
 
         **Request Method**
         ------------------
@@ -206,6 +231,12 @@ class StaffRegisterCreateAPIView(RegisterCreateAPIViewMixin):
                 ```
 
         - **On Failure**:
+            - **Rate Limited** (`429 Too Many Requests`, with `Retry-After` header):
+                ```json
+                {
+                    "detail": "Request was throttled. Expected available in 10 seconds."
+                }
+                ```
             - **Missing or Invalid `username`, `email`, `password`, `password2`**:
                 ```json
                 {
@@ -278,7 +309,6 @@ class StaffRegisterCreateAPIView(RegisterCreateAPIViewMixin):
     serializer_class = StaffRegisterSerializer
 
 
-# TODO: implement rate limit
 class EmployerRegisterCreateAPIView(RegisterCreateAPIViewMixin):
     """
     REGISTER ROUTE (EmployerRegisterCreateAPIView)
@@ -286,6 +316,7 @@ class EmployerRegisterCreateAPIView(RegisterCreateAPIViewMixin):
         **Permissions**
         ---------------
         - **Allow Any**: This endpoint is accessible to all users, including unauthenticated users, to allow registration.
+        - **Rate Limited**: Token buckets per ip and per email, plus a cap on concurrent password hashing.
 
         **Request Method**
         ------------------
@@ -338,6 +369,12 @@ class EmployerRegisterCreateAPIView(RegisterCreateAPIViewMixin):
                 ```
 
         - **On Failure**:
+            - **Rate Limited** (`429 Too Many Requests`, with `Retry-After` header):
+                ```json
+                {
+                    "detail": "Request was throttled. Expected available in 10 seconds."
+                }
+                ```
             - **Missing or Invalid `username`, `email`, `password`, `password2`**:
                 ```json
                 {
@@ -410,7 +447,6 @@ class EmployerRegisterCreateAPIView(RegisterCreateAPIViewMixin):
     serializer_class = EmployerRegisterSerializer
 
 
-# TODO: implement rate limit
 class JobSeekerRegisterCreateAPIView(RegisterCreateAPIViewMixin):
     """
     REGISTER ROUTE (JobSeekerRegisterCreateAPIView)
@@ -418,6 +454,7 @@ class JobSeekerRegisterCreateAPIView(RegisterCreateAPIViewMixin):
         **Permissions**
         ---------------
         - **Allow Any**: This endpoint is accessible to all users, including unauthenticated users, to allow registration.
+        - **Rate Limited**: Token buckets per ip and per email, plus a cap on concurrent password hashing.
 
         **Request Method**
         ------------------
@@ -470,6 +507,12 @@ class JobSeekerRegisterCreateAPIView(RegisterCreateAPIViewMixin):
                 ```
 
         - **On Failure**:
+            - **Rate Limited** (`429 Too Many Requests`, with `Retry-After` header):
+                ```json
+                {
+                    "detail": "Request was throttled. Expected available in 10 seconds."
+                }
+                ```
             - **Missing or Invalid `username`, `email`, `password`, `password2`**:
                 ```json
                 {
@@ -667,3 +710,179 @@ class LogoutGenericAPIView(generics.GenericAPIView):
             return Response(status=status.HTTP_205_RESET_CONTENT)
         except Exception as e:
             return Response(status=status.HTTP_400_BAD_REQUEST)
+
+
+class JobSeekerProfileRetrieveUpdateAPIView(generics.RetrieveUpdateAPIView):
+    """
+    JOB SEEKER PROFILE ROUTE (JobSeekerProfileRetrieveUpdateAPIView)
+
+        **Permissions**
+        ---------------
+        - **Job Seeker**: Only authenticated job seekers with a profile.
+
+        **Request Method**
+        ------------------
+        - `GET`, `PUT`, `PATCH`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/accounts/v1/jobseeker-profile/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Body Parameters** (all optional with `PATCH`):
+            - **`birth_date`** (`date`), **`gender`**, **`education`** (choices)
+            - **`skill_ids`** (`list[int]`): ids of existing skills.
+            - **`skill_names`** (`list[str]`): free text skill names, matched case
+              and whitespace insensitively, missing skills are created.
+
+        **Processing & Output**
+        -----------------------
+        1. **Validate Skills**:
+            - Skill ids are checked against the in-process reference data cache.
+        2. **Apply Skills**:
+            - When `skill_ids` or `skill_names` is given, the current skills are
+              read once, compared in memory and changed with one bulk insert and
+              one delete, the query count does not grow with the number of skills.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK`
+            - **Body**:
+                ```json
+                {
+                    "id": 1,
+                    "birth_date": "1995-04-02",
+                    "gender": "Female",
+                    "education": "Bachelor",
+                    "skills": [{"id": 1, "name": "Python"}, {"id": 3, "name": "Django"}]
+                }
+                ```
+        - **On Failure**:
+            - **No Job Seeker Profile**:
+                ```json
+                {
+                    "detail": "Job seeker profile not found."
+                }
+                ```
+    """
+
+    permission_classes = (IsJobSeeker,)
+    serializer_class = JobSeekerProfileSerializer
+
+    def get_object(self):
+        job_seeker = JobSeeker.objects.filter(user=self.request.user).first()
+        if job_seeker is None:
+            raise NotFound("Job seeker profile not found.")
+        return job_seeker
+
+
+class CandidateSearchUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Candidate search is unavailable, try again later."
+    default_code = "service_unavailable"
+
+
+class CandidateSearchAPIView(generics.ListAPIView):
+    """
+    CANDIDATE SEARCH ROUTE (CandidateSearchAPIView)
+
+        **Permissions**
+        ---------------
+        - **Employer**: Only authenticated employers.
+
+        **Request Method**
+        ------------------
+        - `GET`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/accounts/v1/candidates/search/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Query Parameters**:
+            - **`q`** (`str`, Optional): words to find in skills, resumes and
+              names.
+            - **`skill_ids`** (`int`, Optional, repeatable): candidates must
+              have every skill.
+            - **`education`** (`str`, Optional, repeatable): any of the
+              education levels.
+            - **`city`** (`str`, Optional): city of the candidate's active
+              address, any gazetteer spelling.
+            - **`page`**, **`page_size`** (`int`, Optional): pagination.
+
+        **Processing & Output**
+        -----------------------
+        1. **Search**:
+            - Runs on the candidate index, denormalized from users, job
+              seekers, addresses, skills and resumes and refreshed when any of
+              them changes (see accounts.documents). Gender and birth date are
+              not indexed and cannot be filtered on.
+        2. **Serve**:
+            - Candidates of the page are served from the stored documents,
+              without database queries. Searches with `q` are ranked by
+              relevance, others list recently updated profiles first.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK`
+            - **Body**:
+                ```json
+                {
+                    "count": 1,
+                    "next": null,
+                    "previous": null,
+                    "results": [
+                        {
+                            "id": 1,
+                            "first_name": "Sara",
+                            "last_name": "Ahmadi",
+                            "education": "Bachelor",
+                            "city": "tehran",
+                            "skills": [{"id": 1, "name": "Python"}],
+                            "resumes": [{"id": 3, "url": "/media/files/cv.pdf"}],
+                            "updated_at": "2024-01-01T00:00:00+00:00"
+                        }
+                    ]
+                }
+                ```
+        - **On Failure**:
+            - **Invalid Skill**:
+                ```json
+                {
+                    "skill_ids": {"0": ["Invalid pk \"999\" - object does not exist."]}
+                }
+                ```
+            - **Search Unavailable**:
+                - **Status Code**: `503 Service Unavailable` when elasticsearch
+                  is unreachable or the in-memory backend is used.
+    """
+
+    permission_classes = (IsEmployer,)
+    serializer_class = CandidateSerializer
+    pagination_class = StandardResultsSetPagination
+
+    def list(self, request, *args, **kwargs):
+        params = CandidateSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        if not elasticsearch_search_enabled():
+            raise CandidateSearchUnavailable()
+        results = CandidateSearchResults(candidate_search_body(params.validated_data))
+        try:
+            page = self.paginate_queryset(results)
+        except NotFound:
+            raise
+        except Exception:
+            logger.exception("candidate search failed")
+            raise CandidateSearchUnavailable()
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
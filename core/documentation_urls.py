@@ -0,0 +1,27 @@
+"""
+API documentation routes, not loaded in lean startup mode (LEAN_STARTUP=1)
+"""
+
+from django.urls import path
+from drf_spectacular.views import (
+    SpectacularAPIView,
+    SpectacularRedocView,
+    SpectacularSwaggerView,
+)
+
+urlpatterns = [
+    # Schema generation
+    path("schema/", SpectacularAPIView.as_view(), name="schema"),
+    # Swagger UI
+    path(
+        "schema/swagger-ui/",
+        SpectacularSwaggerView.as_view(url_name="schema"),
+        name="swagger-ui",
+    ),
+    # ReDoc UI
+    path(
+        "schema/redoc/",
+        SpectacularRedocView.as_view(url_name="schema"),
+        name="redoc",
+    ),
+]
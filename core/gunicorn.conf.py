@@ -0,0 +1,92 @@
+"""
+gunicorn configuration of the production web server (docker_dir/web.Dockerfile)
+
+    gunicorn -c core/gunicorn.conf.py core.wsgi:application
+
+every value comes from the environment (docker_dir/docker_env_sample.txt):
+
+    WEB_WORKERS: worker processes, 2 x cpus + 1 by default
+    WEB_THREADS: request threads of each worker, more than one runs gthread
+        workers, so requests waiting on the database or elasticsearch do not
+        hold a whole process
+    WEB_TIMEOUT: seconds a worker may stay silent (stuck in one request)
+        before it is killed and replaced
+    WEB_GRACEFUL_TIMEOUT: seconds workers get to finish their requests on
+        reload or shutdown
+    WEB_KEEPALIVE: seconds an idle keep-alive connection stays open
+    WEB_MAX_REQUESTS, WEB_MAX_REQUESTS_JITTER: a worker is recycled after
+        this many requests (plus up to the jitter, so they do not all restart
+        at once), bounding the memory of leaks and grown caches
+    METRICS_DIRECTORY: where the workers write their request metrics so
+        /metrics sums every worker, a fresh temporary directory by default.
+        It is emptied on start, files of exited workers are merged into one
+        archive so counters survive recycling
+
+the application is loaded once in the master and forked, workers share its
+memory and start without importing django again. SIGHUP replaces the workers
+gracefully, finishing their requests, but keeps the preloaded code: deploy
+code by restarting the container (SIGTERM also finishes running requests).
+"""
+
+import gc
+import multiprocessing
+import os
+import tempfile
+from pathlib import Path
+
+bind = os.environ.get("WEB_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("WEB_THREADS", 4))
+timeout = int(os.environ.get("WEB_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("WEB_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("WEB_KEEPALIVE", 5))
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("WEB_MAX_REQUESTS_JITTER", 100))
+
+preload_app = True
+# heartbeat files of the workers, a tmpfs avoids stalls on the overlay disk
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = os.environ.get("WEB_ACCESS_LOG", "-")
+errorlog = "-"
+
+# read by core/settings.py, so set before the application is loaded
+if not os.environ.get("METRICS_DIRECTORY"):
+    os.environ["METRICS_DIRECTORY"] = tempfile.mkdtemp(prefix="gunicorn-metrics-")
+
+
+def on_starting(server):
+    # metrics of a previous server would be summed into this one
+    for path in Path(os.environ["METRICS_DIRECTORY"]).glob("*.json"):
+        path.unlink()
+
+
+def when_ready(server):
+    # resolve the urlconf (importing every view) before forking, then keep
+    # the loaded objects out of the collector so workers do not copy the
+    # pages it would touch
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # connections opened while loading must not be shared between workers
+    from django.db import connections
+
+    connections.close_all()
+
+
+def worker_exit(server, worker):
+    # requests since the last periodic write of the worker
+    from shared_features.utils.metrics import registry
+
+    registry.flush()
+
+
+def child_exit(server, worker):
+    from shared_features.utils.metrics import archive_worker_metrics
+
+    archive_worker_metrics(os.environ["METRICS_DIRECTORY"], worker.pid)
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -20,6 +21,8 @@ CORS_ALLOWED_ORIGINS = [
 ENVIRONMENT = "local"
 
 MIDDLEWARE = [
+    "shared_features.middleware.PerformanceMetricsMiddleware",
+    "shared_features.middleware.ReplicaPinningMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -31,6 +34,13 @@ MIDDLEWARE = [
 ]
 
 
+# requests slower than this are logged by `performance` logger
+SLOW_REQUEST_THRESHOLD_MS = 1000
+# bearer token required by /metrics, without one only staff users (e.g.
+# logged in to the admin) can read it
+METRICS_TOKEN = None
+
+
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
@@ -38,29 +48,133 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+        # keep connections open between requests, checked before reuse
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
+    },
+    # read replicas of "default", listed in DATABASE_REPLICAS
+    # "replica_1": {
+    #     "ENGINE": "django.db.backends.postgresql",
+    #     "HOST": "replica-1.internal",
+    #     "NAME": "job_search_system",
+    #     "USER": "job_search_system_readonly",
+    #     "PASSWORD": "",
+    #     "CONN_MAX_AGE": 60,
+    #     "CONN_HEALTH_CHECKS": True,
+    #     "TEST": {"MIRROR": "default"},
+    # },
 }
 
+DATABASE_ROUTERS = ["shared_features.db_routers.PrimaryReplicaRouter"]
+# aliases of DATABASES that serve reads, empty sends everything to "default"
+DATABASE_REPLICAS = []
+# clients read from "default" for this many seconds after they wrote
+REPLICA_PIN_SECONDS = 5
+
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = "static/"
+# STATIC_ROOT defaults to BASE_DIR / "staticfiles", filled by
+# `manage.py collectstatic` and served by whitenoise (see core/settings.py)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# use "django.core.cache.backends.memcached.PyMemcacheCache" with
+# "LOCATION": "memcached_job_search_system:11211" to share it between workers
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# skills and industry areas are cached in every worker, the version stamp in
+# the cache is checked at most every REFERENCE_DATA_CHECK_INTERVAL seconds and
+# snapshots are reloaded after REFERENCE_DATA_MAX_AGE seconds in any case
+REFERENCE_DATA_CHECK_INTERVAL = 1
+REFERENCE_DATA_MAX_AGE = 300
 
 
 ELASTICSEARCH_PARAMETERS = {
     "address": "http://localhost:9200",
+    # "memory" keeps documents in process, used by local load tests
+    "backend": os.environ.get("ELASTICSEARCH_BACKEND", "elasticsearch"),
 }
 
+# weights of ranked job posting searches, missing keys keep the defaults of
+# jobs.ranking.DEFAULT_RANKING_WEIGHTS. compare candidates with
+# `manage.py evaluate_ranking <labeled queries> --weights '{"recency": 0.5}'`
+JOB_POSTING_RANKING = {
+    "text": 1.0,
+    "skills": 2.0,
+    "recency": 1.0,
+    "recency_scale_days": 30,
+    "expiry": 1.0,
+    "expiry_horizon_days": 14,
+}
+
+# csv of cities (name, latitude, longitude, aliases) used to geocode job
+# posting locations offline, run refresh_job_posting_locations after a change
+# GAZETTEER_PATH = BASE_DIR / "shared_features" / "data" / "gazetteer.csv"
+
+# new job alerts of saved searches (manage.py send_job_alerts)
+EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+DEFAULT_FROM_EMAIL = "alerts@example.com"
+
+# estimated title and description similarity (0-1) above which job postings
+# are grouped as near-duplicates (jobs.dedup), regroup existing postings
+# with `manage.py dedupe_job_postings` after changing it
+JOB_POSTING_DUPLICATE_THRESHOLD = 0.8
+
+# job postings per precomputed recommendation feed, refreshed by
+# `manage.py refresh_recommendation_feeds` (jobs.recommendations)
+RECOMMENDATION_FEED_SIZE = 50
+
+# background tasks (shared_features.task_queue, manage.py run_workers).
+# retries wait TASK_RETRY_DELAY seconds doubled per attempt up to
+# TASK_RETRY_MAX_DELAY, tasks running over TASK_LEASE_SECONDS are taken as
+# lost and queued again, finished tasks are kept TASK_RETENTION_DAYS
+TASK_MAX_ATTEMPTS = 5
+TASK_RETRY_DELAY = 10
+TASK_RETRY_MAX_DELAY = 3600
+TASK_LEASE_SECONDS = 600
+TASK_RETENTION_DAYS = 7
+
 
 REST_FRAMEWORK = {
+    # proxies in front of the app, X-Forwarded-For is only trusted (e.g. for
+    # the per ip auth rate limit) when set, REMOTE_ADDR is used otherwise
+    # "NUM_PROXIES": 1,
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson for JSON, MessagePack when requested by `Accept` header
+    "DEFAULT_RENDERER_CLASSES": (
+        "shared_features.renderers.ORJSONRenderer",
+        "shared_features.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "shared_features.parsers.ORJSONParser",
+        "shared_features.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
 }
 
+# Rate limit of login and register routes (see accounts/throttling.py)
+AUTH_RATE_LIMIT = {
+    "STORE": "memory",  # "cache" shares the buckets through CACHES between workers
+    "IP": {"CAPACITY": 20, "REFILL_PER_SECOND": 0.5},
+    "EMAIL": {"CAPACITY": 5, "REFILL_PER_SECOND": 0.05},
+    "MAX_CONCURRENT_HASHING": 4,
+}
+
 # SimpleJWT Configuration (optional: customize as needed)
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
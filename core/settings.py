@@ -13,8 +13,23 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
 
+import os
+
 from .local_settings import *
 
+# Lean startup skips the api documentation apps and routes, for workers and
+# management processes that never serve /docs/ (LEAN_STARTUP=1)
+LEAN_STARTUP = os.environ.get("LEAN_STARTUP", "0") == "1"
+
+DOCUMENTATION_APPS = [
+    "drf_spectacular",
+    "drf_spectacular_sidecar",
+]
+
+# workers of a multi-worker server share their request metrics through files
+# of this directory (set by core/gunicorn.conf.py), /metrics sums them
+METRICS_DIRECTORY = os.environ.get("METRICS_DIRECTORY") or None
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -28,8 +43,8 @@ INSTALLED_APPS = [
     "rest_framework",
     "rest_framework_simplejwt.token_blacklist",
     "corsheaders",
-    'drf_spectacular',
-    'drf_spectacular_sidecar',
+    "django_filters",
+    *([] if LEAN_STARTUP else DOCUMENTATION_APPS),
     # local apps
     "accounts",
     "jobs",
@@ -58,6 +73,22 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "core.wsgi.application"
 
+# Static files are collected to STATIC_ROOT (`manage.py collectstatic`) and
+# served by whitenoise right after the security middleware, so the server
+# does not depend on runserver or a proxy for the admin and api docs assets
+if "STATIC_ROOT" not in globals():
+    STATIC_ROOT = BASE_DIR / "staticfiles"
+
+WHITENOISE_MIDDLEWARE = "whitenoise.middleware.WhiteNoiseMiddleware"
+if WHITENOISE_MIDDLEWARE not in MIDDLEWARE:
+    MIDDLEWARE = list(MIDDLEWARE)
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1
+        if "django.middleware.security.SecurityMiddleware" in MIDDLEWARE
+        else 0,
+        WHITENOISE_MIDDLEWARE,
+    )
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -103,6 +134,10 @@ LOGGING = {
             "class": "logging.FileHandler",
             "filename": "auth.log",
         },
+        "console": {
+            "level": "INFO",
+            "class": "logging.StreamHandler",
+        },
     },
     "loggers": {
         "django.security.Authentication": {
@@ -110,5 +145,16 @@ LOGGING = {
             "level": "INFO",
             "propagate": True,
         },
+        "performance": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        # worker throughput of manage.py run_workers
+        "shared_features.task_queue": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
@@ -15,37 +15,22 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
+
+from shared_features.views import metrics_view
 
 apis_patterns = [
     path("accounts/", include("accounts.urls")),
-]
-
-documentation_patterns = [
-    # Schema generation
-    path("schema/", SpectacularAPIView.as_view(), name="schema"),
-    # Swagger UI
-    path(
-        "schema/swagger-ui/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
-    # ReDoc UI
-    path(
-        "schema/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
-        name="redoc",
-    ),
+    path("jobs/", include("jobs.urls")),
 ]
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include(apis_patterns)),
-    path("docs/", include(documentation_patterns)),
+    path("metrics", metrics_view, name="metrics"),
 ]
+
+if not settings.LEAN_STARTUP:
+    urlpatterns.append(path("docs/", include("core.documentation_urls")))
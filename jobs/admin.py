@@ -1,8 +1,57 @@
 from django.contrib import admin
 
+from shared_features.mixins import ScalableModelAdminMixin
+
+from .models import JobAlert, JobPosting, JobPostingPhoto, Application, SavedSearch
+
+
+@admin.register(JobPosting)
+class JobPostingModelAdmin(ScalableModelAdminMixin):
+    """
+    handle JobPosting class instance in Django admin panel
+    """
+
+    list_display = ("id", "title", "company", "expiry_date", "created_at", "is_removed")
+    list_select_related = ("company",)
+    search_fields = ("title__startswith",)
+    list_filter = ("is_removed",)
+    raw_id_fields = ("company", "active_photo", "skills", "industry_areas")
+
+
+@admin.register(Application)
+class ApplicationModelAdmin(ScalableModelAdminMixin):
+    """
+    handle Application class instance in Django admin panel
+    """
+
+    list_display = ("id", "job_seeker", "job_posting", "status", "application_date")
+    # __str__ of job seeker reads its user
+    list_select_related = ("job_seeker__user", "job_posting")
+    list_filter = ("status", "is_removed")
+    raw_id_fields = ("job_seeker", "job_posting")
+
+
+@admin.register(SavedSearch)
+class SavedSearchModelAdmin(ScalableModelAdminMixin):
+    """
+    handle SavedSearch class instance in Django admin panel
+    """
+
+    list_display = ("id", "name", "job_seeker", "is_active", "created_at")
+    list_select_related = ("job_seeker__user",)
+    list_filter = ("is_active", "is_removed")
+    raw_id_fields = ("job_seeker",)
+
+
+@admin.register(JobAlert)
+class JobAlertModelAdmin(ScalableModelAdminMixin):
+    """
+    handle JobAlert class instance in Django admin panel
+    """
+
+    list_display = ("id", "saved_search", "job_posting", "created_at", "sent_at")
+    list_select_related = ("saved_search", "job_posting")
+    raw_id_fields = ("saved_search", "job_posting")
 
-from .models import JobPosting, JobPostingPhoto, Application
 
-admin.site.register(JobPosting)
 admin.site.register(JobPostingPhoto)
-admin.site.register(Application)
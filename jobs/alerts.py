@@ -0,0 +1,227 @@
+"""
+new job alerts of saved searches
+
+saved searches are stored as percolator queries in their own index. the job
+postings written by a transaction are percolated against all of them with one
+request by the reindex task it queued (jobs.index_job_postings), matches are
+queued as JobAlert rows with one bulk insert and sent as one email per job
+seeker by manage.py send_job_alerts, or by the jobs.send_job_alerts task
+queued with them (jobs.tasks). alert cost follows the postings written, not
+saved searches times postings.
+"""
+
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db import transaction
+from django.utils import timezone
+
+from shared_features.utils.elasticsearch_utils import es_service
+
+from .documents import job_posting_index_mappings
+from .elastic_index_keys import saved_search_index_keys
+from .models import JobAlert, SavedSearch
+from .ranking import text_clause
+from .search import elasticsearch_search_enabled, job_posting_filters
+
+logger = logging.getLogger(__name__)
+
+# job postings per percolate request and saved searches per page of its hits
+PERCOLATE_BATCH_SIZE = 100
+PERCOLATE_PAGE_SIZE = 1000
+ALERT_BATCH_SIZE = 500
+
+# percolator queries run on the fields of job posting documents, so the
+# index maps them as the job posting index does
+saved_search_index_mappings = {
+    "dynamic": False,
+    "properties": {
+        **job_posting_index_mappings["properties"],
+        "job_seeker_id": {"type": "integer"},
+        "query": {"type": "percolator"},
+    },
+}
+
+
+def create_saved_search_index():
+    """
+    create the saved search index with its mappings unless it exists
+    """
+    return es_service.create_index(saved_search_index_keys, saved_search_index_mappings)
+
+
+def saved_search_query(params):
+    """
+    percolator query of saved search parameters. the expiry filter is left
+    out, `now` of a stored query would be resolved when it is indexed, and
+    only current postings are percolated
+    """
+    query = {"bool": {"filter": job_posting_filters(params, include_expired=True)}}
+    if params.get("q"):
+        query["bool"]["must"] = [text_clause(params["q"])]
+    return query
+
+
+def saved_search_document(saved_search):
+    return {
+        "id": saved_search.pk,
+        "job_seeker_id": saved_search.job_seeker_id,
+        "query": saved_search_query(saved_search.params),
+    }
+
+
+def saved_search_documents(queryset=None, batch_size=1000):
+    """
+    yield documents of active saved searches of `queryset` (every one by
+    default)
+    """
+    if queryset is None:
+        queryset = SavedSearch.objects.all()
+    for saved_search in queryset.filter(is_active=True).order_by("pk").iterator(
+        chunk_size=batch_size
+    ):
+        yield saved_search_document(saved_search)
+
+
+def index_saved_search(saved_search):
+    """
+    store the percolator query of an active saved search, drop the one of an
+    inactive or removed search
+    """
+    from elasticsearch import NotFoundError
+
+    try:
+        if saved_search.is_active and not saved_search.is_removed:
+            es_service.bulk_index(
+                [saved_search_document(saved_search)], saved_search_index_keys
+            )
+        else:
+            es_service.delete(saved_search.pk, saved_search_index_keys)
+    except NotFoundError:
+        pass
+    except Exception:
+        logger.exception("indexing of saved search %s failed", saved_search.pk)
+
+
+def percolate(documents):
+    """
+    {saved search id: [job posting ids]} of the saved searches matching job
+    posting `documents`, all documents go in one percolate request per page
+    of matching saved searches
+    """
+    matches = defaultdict(list)
+    body = {
+        "query": {"percolate": {"field": "query", "documents": documents}},
+        "size": PERCOLATE_PAGE_SIZE,
+        "sort": [{"id": "asc"}],
+        "_source": False,
+    }
+    while True:
+        hits = es_service.query(body, saved_search_index_keys)["hits"]["hits"]
+        for hit in hits:
+            matches[int(hit["_id"])].extend(
+                documents[slot]["id"]
+                for slot in hit["fields"]["_percolator_document_slot"]
+            )
+        if len(hits) < PERCOLATE_PAGE_SIZE:
+            return matches
+        body["search_after"] = hits[-1]["sort"]
+
+
+def queue_job_alerts(documents):
+    """
+    queue alerts of the saved searches matching job posting `documents`
+    (see jobs.documents.job_posting_document), expired postings are skipped.
+    returns the number of matches, postings already alerted to a saved
+    search are not queued again
+    """
+    if not elasticsearch_search_enabled():
+        # the in-memory backend has no percolator
+        return 0
+    today = timezone.localdate().isoformat()
+    documents = [document for document in documents if document["expiry_date"] >= today]
+
+    alerts = []
+    for start in range(0, len(documents), PERCOLATE_BATCH_SIZE):
+        try:
+            matches = percolate(documents[start : start + PERCOLATE_BATCH_SIZE])
+        except Exception:
+            logger.exception("percolation of %s job postings failed", len(documents))
+            continue
+        # the index may still hold searches removed while it was unreachable
+        active = set(
+            SavedSearch.objects.filter(pk__in=matches, is_active=True).values_list(
+                "pk", flat=True
+            )
+        )
+        alerts.extend(
+            JobAlert(saved_search_id=saved_search_id, job_posting_id=job_posting_id)
+            for saved_search_id, job_posting_ids in matches.items()
+            if saved_search_id in active
+            for job_posting_id in job_posting_ids
+        )
+    JobAlert.objects.bulk_create(alerts, ignore_conflicts=True, batch_size=1000)
+    return len(alerts)
+
+
+def alert_message(email, alerts):
+    """
+    (subject, body, from, recipients) of one job seeker's alerts
+    """
+    by_search = defaultdict(list)
+    for alert in alerts:
+        by_search[alert.saved_search.name].append(alert.job_posting)
+    lines = []
+    for name, job_postings in by_search.items():
+        lines.append(f"{name}:")
+        lines.extend(
+            f"  - {job_posting.title}, {job_posting.company.name}"
+            + (f" ({job_posting.location_city})" if job_posting.location_city else "")
+            for job_posting in job_postings
+        )
+        lines.append("")
+    count = len(alerts)
+    subject = f"{count} new job posting{'s' if count > 1 else ''} for your searches"
+    return subject, "\n".join(lines), settings.DEFAULT_FROM_EMAIL, [email]
+
+
+def send_job_alerts(batch_size=ALERT_BATCH_SIZE):
+    """
+    send the oldest `batch_size` queued alerts as one email per job seeker
+    over one connection, returns the number of alerts taken off the queue.
+    alerts of postings removed or expired and of searches removed or
+    deactivated since they matched are dropped.
+    concurrent senders skip each other's rows where the database supports
+    it, a failed send leaves the batch queued
+    """
+    today = timezone.localdate()
+    with transaction.atomic():
+        alerts = list(
+            JobAlert.objects.filter(sent_at__isnull=True)
+            .select_related(
+                "saved_search__job_seeker__user", "job_posting__company"
+            )
+            .select_for_update(skip_locked=True, of=("self",))
+            .order_by("pk")[:batch_size]
+        )
+        by_email = defaultdict(list)
+        for alert in alerts:
+            job_posting, saved_search = alert.job_posting, alert.saved_search
+            if (
+                job_posting.is_removed
+                or job_posting.expiry_date < today
+                or saved_search.is_removed
+                or not saved_search.is_active
+            ):
+                continue
+            by_email[saved_search.job_seeker.user.email].append(alert)
+        if by_email:
+            send_mass_mail(
+                [alert_message(email, queued) for email, queued in by_email.items()]
+            )
+        JobAlert.objects.filter(pk__in=[alert.pk for alert in alerts]).update(
+            sent_at=timezone.now()
+        )
+    return len(alerts)
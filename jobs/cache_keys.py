@@ -0,0 +1,5 @@
+"""
+define cache keys
+"""
+
+job_posting_detail_cache_key = "job_posting_detail:{pk}"
@@ -3,3 +3,10 @@ APPLICATION_STATUS_CHOICES = (
     ("Accepted", "Accepted"),
     ("Rejected", "Rejected"),
 )
+
+# status changes an employer may make, accepted and rejected are final
+APPLICATION_STATUS_TRANSITIONS = {
+    "Pending": ("Accepted", "Rejected"),
+    "Accepted": (),
+    "Rejected": (),
+}
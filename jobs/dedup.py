@@ -0,0 +1,258 @@
+"""
+near-duplicate job postings
+
+agencies repost a job with small changes. current postings whose title and
+description are at least JOB_POSTING_DUPLICATE_THRESHOLD similar (MinHash
+estimate of their shingles, shared_features.utils.minhash) form a group:
+every member but the one expiring last points at it with `duplicate_of` and
+is left out of searches. that member outlives the others, so a group always
+shows one current posting.
+
+`detect_duplicates` runs when a job posting is saved (jobs.signals), its
+signature and LSH band buckets are stored and candidates are looked up by
+bucket, without comparing it to every posting. manage.py dedupe_job_postings
+computes signatures of the corpus in parallel processes and regroups every
+current posting, after threshold changes or writes that bypassed signals.
+
+changes are {job posting id: duplicate_of id or None}, applied by the
+caller so caches and the search index follow (see jobs.signals).
+"""
+
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from shared_features.utils.minhash import (
+    band_buckets,
+    pack,
+    signature,
+    similarity,
+    unpack,
+)
+
+from .models import JobPosting, JobPostingBand, JobPostingMinHash
+
+DUPLICATE_THRESHOLD = 0.8
+DEDUP_BATCH_SIZE = 1000
+
+
+def duplicate_threshold():
+    return getattr(settings, "JOB_POSTING_DUPLICATE_THRESHOLD", DUPLICATE_THRESHOLD)
+
+
+def posting_signature(title, description):
+    return signature(f"{title}\n{description}")
+
+
+def current_postings():
+    return JobPosting.objects.filter(expiry_date__gte=timezone.localdate())
+
+
+def store_signatures(signatures):
+    """
+    store packed signatures and band buckets of {job posting id: signature}
+    with one statement per table
+    """
+    JobPostingMinHash.objects.bulk_create(
+        [
+            JobPostingMinHash(job_posting_id=pk, signature=pack(values))
+            for pk, values in signatures.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["job_posting"],
+        update_fields=["signature"],
+    )
+    JobPostingBand.objects.filter(job_posting_id__in=list(signatures)).delete()
+    JobPostingBand.objects.bulk_create(
+        [
+            JobPostingBand(job_posting_id=pk, band=band, bucket=bucket)
+            for pk, values in signatures.items()
+            for band, bucket in band_buckets(values)
+        ],
+        batch_size=DEDUP_BATCH_SIZE,
+    )
+
+
+def similar_postings(job_posting_id, values, threshold):
+    """
+    [(similarity, id, expiry_date, duplicate_of id)] of current postings
+    sharing a band bucket with `values` and similar enough
+    """
+    lookup = Q()
+    for band, bucket in band_buckets(values):
+        lookup |= Q(band=band, bucket=bucket)
+    candidate_ids = (
+        JobPostingBand.objects.filter(lookup)
+        .exclude(job_posting_id=job_posting_id)
+        .values("job_posting_id")
+    )
+    similar = []
+    for pk, expiry_date, duplicate_of_id, packed in (
+        current_postings()
+        .filter(pk__in=candidate_ids)
+        .values_list(
+            "pk", "expiry_date", "duplicate_of_id", "job_posting_minhash__signature"
+        )
+    ):
+        score = similarity(values, unpack(packed))
+        if score >= threshold:
+            similar.append((score, pk, expiry_date, duplicate_of_id))
+    return similar
+
+
+def leave_group(job_posting):
+    """
+    changes of a posting leaving its group (removed or text edited), the
+    posting shown for the group hands it to the member expiring last
+    """
+    changes = {}
+    if job_posting.duplicate_of_id is not None:
+        changes[job_posting.pk] = None
+    members = list(
+        JobPosting.objects.filter(duplicate_of_id=job_posting.pk)
+        .order_by("-expiry_date", "-pk")
+        .values_list("pk", flat=True)
+    )
+    if members:
+        changes[members[0]] = None
+        changes.update(dict.fromkeys(members[1:], members[0]))
+    return changes
+
+
+def join_group(job_posting, values, threshold):
+    """
+    changes of a posting joining the group of its most similar current
+    posting, it is shown for the group when it expires last
+    """
+    similar = similar_postings(job_posting.pk, values, threshold)
+    if not similar:
+        return {}
+    _, pk, expiry_date, duplicate_of_id = max(similar)
+    if duplicate_of_id is None:
+        shown_id, shown_expiry_date = pk, expiry_date
+    else:
+        shown_id = duplicate_of_id
+        shown_expiry_date = JobPosting.objects.values_list(
+            "expiry_date", flat=True
+        ).get(pk=shown_id)
+    if (shown_expiry_date, shown_id) > (job_posting.expiry_date, job_posting.pk):
+        return {job_posting.pk: shown_id}
+    members = JobPosting.objects.filter(duplicate_of_id=shown_id).values_list(
+        "pk", flat=True
+    )
+    return {
+        shown_id: job_posting.pk,
+        **dict.fromkeys(members, job_posting.pk),
+        job_posting.pk: None,
+    }
+
+
+def repick_shown(job_posting):
+    """
+    changes of a group whose member expiring last is not the shown one, after
+    an expiry date edit of `job_posting`
+    """
+    shown_id = job_posting.duplicate_of_id or job_posting.pk
+    members = list(
+        JobPosting.objects.filter(Q(pk=shown_id) | Q(duplicate_of_id=shown_id))
+        .order_by("-expiry_date", "-pk")
+        .values_list("pk", flat=True)
+    )
+    if len(members) < 2 or members[0] == shown_id:
+        return {}
+    return {members[0]: None, **dict.fromkeys(members[1:], members[0])}
+
+
+def detect_duplicates(job_posting, apply_changes):
+    """
+    keep the group of a saved job posting up to date, `apply_changes` is
+    called with the changes of leaving the old group and of joining a new
+    one. postings whose title and description did not change stay in their
+    group, which is shown by another member if the expiry date moved
+    """
+    if job_posting.is_removed:
+        apply_changes(leave_group(job_posting))
+        return
+    values = posting_signature(job_posting.title, job_posting.description)
+    stored = (
+        JobPostingMinHash.objects.filter(job_posting_id=job_posting.pk)
+        .values_list("signature", flat=True)
+        .first()
+    )
+    if values is None:
+        return
+    if stored is not None and unpack(stored) == values:
+        apply_changes(repick_shown(job_posting))
+        return
+    store_signatures({job_posting.pk: values})
+    if stored is not None:
+        apply_changes(leave_group(job_posting))
+    apply_changes(join_group(job_posting, values, duplicate_threshold()))
+
+
+def compute_signatures(rows):
+    """
+    [(id, signature)] of (id, title, description) rows, without database
+    access so it runs in worker processes
+    """
+    return [
+        (pk, values)
+        for pk, title, description in rows
+        if (values := posting_signature(title, description)) is not None
+    ]
+
+
+def duplicate_groups(threshold, batch_size=DEDUP_BATCH_SIZE):
+    """
+    {job posting id: duplicate_of id} of every current posting in a group,
+    from stored band buckets. members of a bucket are compared to its first
+    member only, so a bucket shared by boilerplate texts costs linear time,
+    pairs missed there usually meet in another band
+    """
+    current = current_postings().values("pk")
+    bands = (
+        JobPostingBand.objects.filter(job_posting_id__in=current)
+        .values_list("band", "bucket", "job_posting_id")
+        .order_by("band", "bucket", "job_posting_id")
+        .iterator(chunk_size=batch_size)
+    )
+    shared = []
+    for _, rows in groupby(bands, key=itemgetter(0, 1)):
+        members = [pk for _, _, pk in rows]
+        if len(members) > 1:
+            shared.append(members)
+
+    pks = sorted({pk for members in shared for pk in members})
+    signatures, expiry_dates = {}, {}
+    for start in range(0, len(pks), batch_size):
+        for pk, expiry_date, packed in JobPosting.objects.filter(
+            pk__in=pks[start : start + batch_size]
+        ).values_list("pk", "expiry_date", "job_posting_minhash__signature"):
+            signatures[pk] = unpack(packed)
+            expiry_dates[pk] = expiry_date
+
+    parents = {}
+
+    def root(pk):
+        while parents.get(pk, pk) != pk:
+            parents[pk] = parents.get(parents[pk], parents[pk])
+            pk = parents[pk]
+        return pk
+
+    for pivot, *members in shared:
+        for pk in members:
+            if similarity(signatures[pivot], signatures[pk]) >= threshold:
+                parents[root(pk)] = root(pivot)
+
+    groups = defaultdict(list)
+    for pk in signatures:
+        groups[root(pk)].append(pk)
+    duplicates = {}
+    for members in groups.values():
+        shown = max(members, key=lambda pk: (expiry_dates[pk], pk))
+        duplicates.update((pk, shown) for pk in members if pk != shown)
+    return duplicates
@@ -0,0 +1,136 @@
+"""
+build elasticsearch documents of job postings
+"""
+
+import logging
+
+from shared_features.utils.elasticsearch_utils import es_service
+
+from .elastic_index_keys import job_posting_index_keys
+from .models import JobPosting
+
+logger = logging.getLogger(__name__)
+
+# explicit mappings, dynamic mapping would store `salary_range` as an object
+# of two longs that range queries cannot intersect. changing them needs a
+# new index: manage.py rebuild_job_posting_index, and rebuild_saved_search_index
+# for the percolator index sharing them (jobs.alerts)
+job_posting_index_mappings = {
+    "dynamic": False,
+    "properties": {
+        "id": {"type": "integer"},
+        "title": {"type": "text"},
+        "description": {"type": "text"},
+        "company_id": {"type": "integer"},
+        "company_name": {"type": "text", "fields": {"keyword": {"type": "keyword"}}},
+        "skills": {"type": "text", "fields": {"keyword": {"type": "keyword"}}},
+        "skill_ids": {"type": "integer"},
+        "industry_areas": {
+            "type": "text",
+            "fields": {"keyword": {"type": "keyword"}},
+        },
+        "expiry_date": {"type": "date"},
+        "salary_range_start": {"type": "integer"},
+        "salary_range_end": {"type": "integer"},
+        # open ended ranges leave out `gte` / `lte`
+        "salary_range": {"type": "integer_range"},
+        "working_hours": {"type": "keyword"},
+        # normalized city (shared_features.utils.geocoding.normalize_city)
+        "location_city": {"type": "keyword"},
+        # left out when the city is not in the gazetteer
+        "location": {"type": "geo_point"},
+        # left out unless the posting is a near-duplicate (jobs.dedup)
+        "duplicate_of": {"type": "integer"},
+        "created_at": {"type": "date"},
+        "updated_at": {"type": "date"},
+    },
+}
+
+
+def salary_range_document(start, end):
+    """
+    integer_range value of a salary range, None when the posting has no salary
+    """
+    salary_range = {}
+    if start is not None:
+        salary_range["gte"] = start
+    if end is not None:
+        salary_range["lte"] = end
+    return salary_range or None
+
+
+def location_document(latitude, longitude):
+    if latitude is None or longitude is None:
+        return None
+    return {"lat": latitude, "lon": longitude}
+
+
+def job_posting_document(job_posting):
+    """
+    document of a job posting, relations must be loaded (see
+    `job_posting_documents`) to avoid a query per field
+    """
+    return {
+        "id": job_posting.pk,
+        "title": job_posting.title,
+        "description": job_posting.description,
+        "company_id": job_posting.company_id,
+        "company_name": job_posting.company.name,
+        "skills": [skill.name for skill in job_posting.skills.all()],
+        "skill_ids": [skill.pk for skill in job_posting.skills.all()],
+        "industry_areas": [area.name for area in job_posting.industry_areas.all()],
+        "expiry_date": job_posting.expiry_date.isoformat(),
+        "salary_range_start": job_posting.salary_range_start,
+        "salary_range_end": job_posting.salary_range_end,
+        "salary_range": salary_range_document(
+            job_posting.salary_range_start, job_posting.salary_range_end
+        ),
+        "working_hours": job_posting.working_hours,
+        "location_city": job_posting.location_city,
+        "location": location_document(job_posting.latitude, job_posting.longitude),
+        "duplicate_of": job_posting.duplicate_of_id,
+        "created_at": job_posting.created_at.isoformat(),
+        "updated_at": job_posting.updated_at.isoformat(),
+    }
+
+
+def job_posting_documents(queryset=None, batch_size=1000):
+    """
+    yield documents of `queryset` (every job posting by default), relations
+    are prefetched per batch so memory stays bound by `batch_size`
+    """
+    if queryset is None:
+        queryset = JobPosting.objects.all()
+    queryset = (
+        queryset.select_related("company")
+        .prefetch_related("skills", "industry_areas")
+        .order_by("pk")
+    )
+    for job_posting in queryset.iterator(chunk_size=batch_size):
+        yield job_posting_document(job_posting)
+
+
+def create_job_posting_index():
+    """
+    create the job posting index with its mappings unless it exists
+    """
+    return es_service.create_index(job_posting_index_keys, job_posting_index_mappings)
+
+
+def index_job_postings(pks):
+    """
+    (re)index documents of job postings `pks` with one bulk request and
+    return the documents, removed job postings are deleted from the index.
+    the search index lags behind the database when elasticsearch is
+    unreachable
+    """
+    pks = set(pks)
+    documents = list(job_posting_documents(JobPosting.objects.filter(pk__in=pks)))
+    try:
+        es_service.bulk_index(documents, job_posting_index_keys)
+        removed = pks - {document["id"] for document in documents}
+        if removed:
+            es_service.bulk_delete(removed, job_posting_index_keys)
+    except Exception:
+        logger.exception("indexing of %s job postings failed", len(pks))
+    return documents
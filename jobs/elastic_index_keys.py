@@ -2,4 +2,5 @@
 define elasticsearch index keys
 """
 
-job_posting_index_keys = "job_posting_index",
\ No newline at end of file
+job_posting_index_keys = "job_posting_index"
+saved_search_index_keys = "saved_search_index"
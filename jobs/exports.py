@@ -0,0 +1,44 @@
+"""
+define columns and querysets of streaming exports
+"""
+
+from .models import Application, JobPosting
+
+APPLICATION_EXPORT_FIELDS = (
+    "id",
+    "application_date",
+    "status",
+    "job_posting_id",
+    "job_posting__title",
+    "job_posting__company_id",
+    "job_seeker_id",
+    "job_seeker__user__email",
+    "updated_at",
+)
+
+JOB_POSTING_EXPORT_FIELDS = (
+    "id",
+    "title",
+    "company_id",
+    "company__name",
+    "expiry_date",
+    "salary_range_start",
+    "salary_range_end",
+    "working_hours",
+    "created_at",
+    "updated_at",
+)
+
+
+def application_export_queryset(company_id=None):
+    queryset = Application.objects.all()
+    if company_id is not None:
+        queryset = queryset.filter(job_posting__company_id=company_id)
+    return queryset.order_by("id")
+
+
+def job_posting_export_queryset(company_id=None):
+    queryset = JobPosting.objects.all()
+    if company_id is not None:
+        queryset = queryset.filter(company_id=company_id)
+    return queryset.order_by("id")
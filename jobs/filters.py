@@ -0,0 +1,212 @@
+"""
+query parameter filters of job posting list and search routes
+"""
+
+import math
+
+from django import forms
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+import django_filters
+
+from shared_features.utils.geocoding import (
+    EARTH_RADIUS_KM,
+    bounding_box,
+    geocode_city,
+)
+
+from .models import (
+    SALARY_RANGE_MAX,
+    JobPosting,
+    has_salary,
+    salary_high,
+    salary_low,
+)
+
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 500
+
+
+def search_radius_km(params):
+    radius_km = params.get("radius_km")
+    return DEFAULT_RADIUS_KM if radius_km is None else radius_km
+
+
+def salary_overlap(queryset, minimum=None, maximum=None):
+    """
+    job postings whose salary range overlaps [minimum, maximum], both ends
+    of either range may be open (None). postings without any salary are
+    left out of salary searches.
+
+    compares `salary_low` / `salary_high` of jobs.models so the lookups are
+    served by the salary overlap indexes instead of `IS NULL OR` scans
+    """
+    if minimum is None and maximum is None:
+        return queryset
+    queryset = queryset.filter(has_salary)
+    if maximum is not None:
+        queryset = queryset.alias(salary_low=salary_low).filter(
+            salary_low__lte=maximum
+        )
+    if minimum is not None:
+        queryset = queryset.alias(salary_high=salary_high).filter(
+            salary_high__gte=minimum
+        )
+    return queryset
+
+
+def distance_km(latitude, longitude):
+    """
+    haversine distance in kilometers from a point to job posting coordinates
+    """
+    latitude_radians = math.radians(latitude)
+    half_chord = Power(
+        Sin((Radians("latitude") - latitude_radians) / 2), 2
+    ) + math.cos(latitude_radians) * Cos(Radians("latitude")) * Power(
+        Sin((Radians("longitude") - math.radians(longitude)) / 2), 2
+    )
+    return ASin(Sqrt(half_chord), output_field=FloatField()) * (2 * EARTH_RADIUS_KM)
+
+
+def near(queryset, latitude, longitude, radius_km):
+    """
+    job postings within `radius_km` of a point, nearest first. the indexed
+    coordinates are narrowed to a bounding box before distances are computed
+    """
+    min_latitude, max_latitude, min_longitude, max_longitude = bounding_box(
+        latitude, longitude, radius_km
+    )
+    return (
+        queryset.filter(
+            latitude__range=(min_latitude, max_latitude),
+            longitude__range=(min_longitude, max_longitude),
+        )
+        .alias(distance_km=distance_km(latitude, longitude))
+        .filter(distance_km__lte=radius_km)
+        .order_by(F("distance_km").asc(), "-id")
+    )
+
+
+class JobPostingFilterForm(forms.Form):
+    def clean(self):
+        cleaned_data = super().clean()
+        minimum = cleaned_data.get("salary_min")
+        maximum = cleaned_data.get("salary_max")
+        if minimum is not None and maximum is not None and minimum > maximum:
+            self.add_error("salary_max", "Must be greater than salary_min.")
+
+        latitude = cleaned_data.get("lat")
+        longitude = cleaned_data.get("lon")
+        if "lat" in self.errors or "lon" in self.errors:
+            return cleaned_data
+        if (latitude is None) != (longitude is None):
+            self.add_error(
+                "lon" if longitude is None else "lat",
+                "lat and lon must be given together.",
+            )
+        if cleaned_data.get("radius_km") is not None and latitude is None:
+            self.add_error("radius_km", "Requires lat and lon.")
+        return cleaned_data
+
+
+class SalaryFilter(django_filters.NumberFilter):
+    field_class = forms.IntegerField
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("min_value", 0)
+        kwargs.setdefault("max_value", SALARY_RANGE_MAX)
+        super().__init__(*args, **kwargs)
+
+
+class PointFilter(django_filters.NumberFilter):
+    """
+    part of the search point, applied by JobPostingFilter.filter_queryset
+    """
+
+    field_class = forms.FloatField
+
+    def filter(self, qs, value):
+        return qs
+
+
+class JobPostingFilter(django_filters.FilterSet):
+    """
+    filters:
+        salary_min / salary_max: desired salary, a posting matches when its
+            range overlaps the wanted one, either end may be left out
+        city: city of the company's active address, any gazetteer spelling
+        lat / lon / radius_km: postings within `radius_km` (default
+            DEFAULT_RADIUS_KM) of the point, nearest first
+        include_duplicates: near-duplicates of another current posting
+            (jobs.dedup) are left out unless true
+    """
+
+    salary_min = SalaryFilter(method="filter_salary_min")
+    salary_max = SalaryFilter(method="filter_salary_max")
+    city = django_filters.CharFilter(method="filter_city", max_length=100)
+    lat = PointFilter(min_value=-90, max_value=90)
+    lon = PointFilter(min_value=-180, max_value=180)
+    radius_km = PointFilter(min_value=0, max_value=MAX_RADIUS_KM)
+    include_duplicates = django_filters.BooleanFilter(method="filter_duplicates")
+
+    class Meta:
+        model = JobPosting
+        form = JobPostingFilterForm
+        fields = (
+            "salary_min",
+            "salary_max",
+            "city",
+            "lat",
+            "lon",
+            "radius_km",
+            "include_duplicates",
+        )
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = self.form.cleaned_data
+        if not params.get("include_duplicates"):
+            queryset = queryset.filter(duplicate_of__isnull=True)
+        if params.get("lat") is not None:
+            queryset = near(
+                queryset,
+                params["lat"],
+                params["lon"],
+                search_radius_km(params),
+            )
+        return queryset
+
+    def filter_duplicates(self, queryset, name, value):
+        # applied by filter_queryset, duplicates are left out by default
+        return queryset
+
+    def filter_city(self, queryset, name, value):
+        return queryset.filter(location_city=geocode_city(value).city)
+
+    def filter_salary_min(self, queryset, name, value):
+        return salary_overlap(queryset, minimum=value)
+
+    def filter_salary_max(self, queryset, name, value):
+        return salary_overlap(queryset, maximum=value)
+
+
+class JobPostingSearchFilter(JobPostingFilter):
+    """
+    database fallback of the search route (see jobs.search)
+
+    filters:
+        q: every word must be in the title or the description
+    """
+
+    q = django_filters.CharFilter(method="filter_text", max_length=255)
+
+    class Meta(JobPostingFilter.Meta):
+        fields = ("q", *JobPostingFilter.Meta.fields)
+
+    def filter_text(self, queryset, name, value):
+        for word in value.split():
+            queryset = queryset.filter(
+                Q(title__icontains=word) | Q(description__icontains=word)
+            )
+        return queryset
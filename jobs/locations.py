@@ -0,0 +1,89 @@
+"""
+denormalized location of job postings
+
+a job posting carries the city and coordinates of its company's active
+address (geocoded offline with shared_features.utils.geocoding), so city and
+distance searches read indexed columns of the job posting table only.
+
+functions take the models as parameters, migrations keep their own copies
+of what they need (jobs 0005 fills cities only, coordinates come from
+`manage.py refresh_job_posting_locations`).
+"""
+
+from collections import defaultdict
+
+from django.db.models import Q
+
+from shared_features.utils.geocoding import Location, geocode_city
+
+LOCATION_BATCH_SIZE = 1000
+
+
+def location_fields(location):
+    return {
+        "location_city": location.city,
+        "latitude": location.latitude,
+        "longitude": location.longitude,
+    }
+
+
+def company_location(company):
+    """
+    Location of the active address of a company, empty without one
+    """
+    if company.active_address_id is None:
+        return Location("")
+    return geocode_city(company.active_address.city)
+
+
+def company_locations(Company, company_ids=None):
+    """
+    {company id: Location} of `company_ids` (every company by default),
+    each distinct city is geocoded once
+    """
+    companies = Company._base_manager.all()
+    if company_ids is not None:
+        companies = companies.filter(pk__in=company_ids)
+    locations = {}
+    for pk, city in companies.values_list("pk", "active_address__city"):
+        locations[pk] = geocode_city(city) if city is not None else Location("")
+    return locations
+
+
+def stale_job_postings(
+    JobPosting, Company, company_ids=None, batch_size=LOCATION_BATCH_SIZE
+):
+    """
+    yield (queryset, Location) pairs: job postings whose stored location
+    differs from the one of their company, companies are grouped by location
+    so there is one statement per distinct location and batch of companies
+    """
+    companies_by_location = defaultdict(list)
+    for company_id, location in company_locations(Company, company_ids).items():
+        companies_by_location[location].append(company_id)
+
+    for location, ids in companies_by_location.items():
+        for start in range(0, len(ids), batch_size):
+            yield JobPosting._base_manager.filter(
+                company_id__in=ids[start : start + batch_size]
+            ).exclude(
+                Q(location_city=location.city)
+                & Q(latitude=location.latitude)
+                & Q(longitude=location.longitude)
+            ), location
+
+
+def refresh_job_posting_locations(
+    JobPosting, Company, company_ids=None, batch_size=LOCATION_BATCH_SIZE
+):
+    """
+    rewrite stale job posting locations of `company_ids` (every company by
+    default) with set based updates, returns the number of updated rows.
+    caches and the search index are left alone (see jobs.signals)
+    """
+    updated = 0
+    for queryset, location in stale_job_postings(
+        JobPosting, Company, company_ids, batch_size
+    ):
+        updated += queryset.update(**location_fields(location))
+    return updated
@@ -0,0 +1,52 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from shared_features.utils.streaming import (
+    EXPORT_CHUNK_SIZE,
+    export_rows,
+    export_stream,
+)
+
+
+class ExportCommand(BaseCommand):
+    """
+    base command for streaming exports, rows are written as they are fetched
+    so memory stays constant for any table size
+    """
+
+    export_fields = None
+
+    def get_export_queryset(self, company_id):
+        raise NotImplementedError
+
+    def add_arguments(self, parser):
+        parser.add_argument("--company", type=int, default=None)
+        parser.add_argument(
+            "--format", choices=("ndjson", "csv"), default="ndjson", dest="format"
+        )
+        parser.add_argument(
+            "--output", default="-", help="file path, `-` for stdout"
+        )
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        rows = export_rows(
+            self.get_export_queryset(options["company"]),
+            self.export_fields,
+            chunk_size=options["chunk_size"],
+        )
+        binary = options["format"] == "ndjson"
+        if options["output"] == "-":
+            output = sys.stdout.buffer if binary else sys.stdout
+            self.write(output, options["format"], rows)
+            output.flush()
+        else:
+            mode = "wb" if binary else "w"
+            extra = {} if binary else {"newline": "", "encoding": "utf-8"}
+            with open(options["output"], mode, **extra) as output:
+                self.write(output, options["format"], rows)
+
+    def write(self, output, export_format, rows):
+        for chunk in export_stream(export_format, self.export_fields, rows):
+            output.write(chunk)
@@ -0,0 +1,115 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from jobs.filters import salary_overlap
+from jobs.models import JobPosting
+
+SALARY_INDEXES = ("job_salary_low_high_idx", "job_salary_high_low_idx")
+
+
+def naive_salary_overlap(queryset, minimum=None, maximum=None):
+    """
+    same rows as jobs.filters.salary_overlap written with `IS NULL OR`
+    predicates on the raw columns, which the overlap indexes cannot serve
+    """
+    queryset = queryset.exclude(
+        salary_range_start__isnull=True, salary_range_end__isnull=True
+    )
+    if maximum is not None:
+        queryset = queryset.filter(
+            Q(salary_range_start__isnull=True) | Q(salary_range_start__lte=maximum)
+        )
+    if minimum is not None:
+        queryset = queryset.filter(
+            Q(salary_range_end__isnull=True) | Q(salary_range_end__gte=minimum)
+        )
+    return queryset
+
+
+def plan_access(plan):
+    """
+    how a plan reads job postings: the salary index it uses or a scan
+    """
+    for index_name in SALARY_INDEXES:
+        if index_name in plan:
+            return index_name
+    return "scan"
+
+
+class Command(BaseCommand):
+    help = (
+        "Time salary overlap filters on the job postings of the database with "
+        "the indexed expressions (jobs.filters.salary_overlap) against plain "
+        "`IS NULL OR` predicates, and report which plan each one gets. Seed a "
+        "realistic table first, e.g. seed_synthetic_data --job-postings 2000000, "
+        "and ANALYZE it on PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--windows", type=int, default=5, help="per kind")
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--explain", action="store_true", help="print the plan of every query"
+        )
+
+    def handle(self, *args, **options):
+        total = JobPosting.objects.count()
+        if not total:
+            raise CommandError("no job postings, run seed_synthetic_data first")
+        self.stdout.write(f"{total} job postings")
+
+        rng = random.Random(options["seed"])
+        self.stdout.write(
+            f"{'kind':<12}{'variant':<10}{'mean rows':>10}{'median ms':>12}"
+            f"{'max ms':>10}  access"
+        )
+        for kind, windows in self.windows(rng, options["windows"]).items():
+            counts = {}
+            for variant, filter_salary in (
+                ("naive", naive_salary_overlap),
+                ("indexed", salary_overlap),
+            ):
+                timings, counts[variant], accesses = [], [], set()
+                for minimum, maximum in windows:
+                    queryset = filter_salary(JobPosting.objects.all(), minimum, maximum)
+                    plan = queryset.explain()
+                    accesses.add(plan_access(plan))
+                    if options["explain"]:
+                        self.stdout.write(f"-- {variant} {minimum} {maximum}")
+                        self.stdout.write(plan)
+                    for _ in range(options["repeat"]):
+                        started = time.perf_counter()
+                        count = queryset.count()
+                        timings.append((time.perf_counter() - started) * 1000)
+                    counts[variant].append(count)
+                self.stdout.write(
+                    f"{kind:<12}{variant:<10}{statistics.mean(counts[variant]):>10.0f}"
+                    f"{statistics.median(timings):>12.1f}{max(timings):>10.1f}  "
+                    + ", ".join(sorted(accesses))
+                )
+            if counts["naive"] != counts["indexed"]:
+                raise CommandError(f"{kind}: variants matched different rows {counts}")
+
+    @staticmethod
+    def windows(rng, count):
+        """
+        desired salary windows by kind, narrow ones match few postings and
+        are where an index beats a scan, wide ones match most of the table
+        """
+        return {
+            "narrow": [
+                (minimum, minimum + rng.randrange(0, 500, 100))
+                for minimum in (rng.randrange(500, 10000, 100) for _ in range(count))
+            ],
+            "high min": [(rng.randrange(8000, 12000, 100), None) for _ in range(count)],
+            "low max": [(None, rng.randrange(300, 1000, 100)) for _ in range(count)],
+            "wide": [
+                (minimum, minimum + rng.randrange(2000, 6000, 100))
+                for minimum in (rng.randrange(500, 4000, 100) for _ in range(count))
+            ],
+        }
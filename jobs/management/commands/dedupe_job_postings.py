@@ -0,0 +1,126 @@
+import os
+import time
+from itertools import islice
+from multiprocessing import Pool
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from jobs.dedup import (
+    DEDUP_BATCH_SIZE,
+    compute_signatures,
+    current_postings,
+    duplicate_groups,
+    duplicate_threshold,
+    store_signatures,
+)
+from jobs.signals import apply_duplicate_changes
+
+
+def batches(items, size):
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Group near-duplicate current job postings again. MinHash signatures "
+        "of postings without one (every posting with --recompute) are computed "
+        "by worker processes, then postings sharing LSH buckets are compared "
+        "and `duplicate_of` is rewritten where it changed, reindexing those "
+        "postings. Run after changing JOB_POSTING_DUPLICATE_THRESHOLD or the "
+        "MinHash parameters, or after writes that bypassed signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--batch-size", type=int, default=DEDUP_BATCH_SIZE)
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            help="estimated similarity of duplicates, JOB_POSTING_DUPLICATE_THRESHOLD "
+            "by default",
+        )
+        parser.add_argument(
+            "--recompute",
+            action="store_true",
+            help="compute the signatures of every current posting again",
+        )
+
+    def handle(self, *args, **options):
+        threshold = options["threshold"]
+        if threshold is None:
+            threshold = duplicate_threshold()
+        if not 0 < threshold <= 1:
+            raise CommandError("--threshold must be in (0, 1]")
+        started = time.monotonic()
+
+        signed = self.sign(options)
+        signed_at = time.monotonic()
+        with transaction.atomic():
+            duplicates = duplicate_groups(threshold, options["batch_size"])
+            stale = dict(
+                current_postings()
+                .filter(duplicate_of__isnull=False)
+                .values_list("pk", "duplicate_of_id")
+            )
+        changes = {
+            pk: duplicate_of_id
+            for pk, duplicate_of_id in duplicates.items()
+            if stale.get(pk) != duplicate_of_id
+        }
+        changes.update((pk, None) for pk in stale if pk not in duplicates)
+        # one transaction per batch, so every batch is reindexed as it commits
+        for batch in batches(sorted(changes.items()), options["batch_size"]):
+            with transaction.atomic():
+                apply_duplicate_changes(dict(batch))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{signed} signatures in {signed_at - started:.1f}s, "
+                f"{len(duplicates)} duplicates of "
+                f"{len(set(duplicates.values()))} postings, "
+                f"{len(changes)} postings changed in "
+                f"{time.monotonic() - signed_at:.1f}s"
+            )
+        )
+
+    def sign(self, options):
+        """
+        store signatures of current postings, rows of `--workers` batches are
+        read at a time and hashed in parallel. returns the number stored
+        """
+        queryset = current_postings().order_by("pk")
+        if not options["recompute"]:
+            queryset = queryset.filter(job_posting_minhash__isnull=True)
+        pks = list(queryset.values_list("pk", flat=True))
+        workers, batch_size = max(options["workers"], 1), options["batch_size"]
+        # forked workers must not share the parent's database connections
+        connections.close_all()
+        pool = Pool(workers) if workers > 1 and len(pks) > batch_size else None
+        signed = 0
+        try:
+            for chunk in batches(pks, batch_size * workers):
+                rows = [
+                    list(
+                        current_postings()
+                        .filter(pk__in=batch)
+                        .values_list("pk", "title", "description")
+                    )
+                    for batch in batches(chunk, batch_size)
+                ]
+                results = (
+                    pool.map(compute_signatures, rows)
+                    if pool
+                    else map(compute_signatures, rows)
+                )
+                with transaction.atomic():
+                    for signatures in results:
+                        store_signatures(dict(signatures))
+                        signed += len(signatures)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+        return signed
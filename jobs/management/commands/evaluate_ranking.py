@@ -0,0 +1,141 @@
+import json
+import math
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.elastic_index_keys import job_posting_index_keys
+from jobs.filters import JobPostingSearchFilter
+from jobs.models import JobPosting
+from jobs.ranking import ranking_weights
+from jobs.search import elasticsearch_search_enabled, job_posting_search_body
+from shared_features.utils.elasticsearch_utils import es_service
+
+
+def dcg(gains):
+    return sum((2**gain - 1) / math.log2(rank + 2) for rank, gain in enumerate(gains))
+
+
+def ndcg(ranked_ids, relevance, k):
+    """
+    normalized discounted cumulative gain of the first `k` ranked ids,
+    `relevance` maps ids to graded labels (missing ids are not relevant)
+    """
+    ideal = dcg(sorted(relevance.values(), reverse=True)[:k])
+    if not ideal:
+        return 0.0
+    return dcg([relevance.get(pk, 0) for pk in ranked_ids[:k]]) / ideal
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay labeled search queries against elasticsearch and report NDCG@k "
+        "and latency of the current ranking weights and of candidate ones. "
+        "Each line of the queries file is a json object: "
+        '{"id": "...", "params": {"q": "python", "city": "Tehran"}, '
+        '"skill_ids": [1, 2], "relevant": {"<job posting id>": <grade 0-3>}}, '
+        "params are the search route query parameters."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("queries", help="jsonl file of labeled queries")
+        parser.add_argument(
+            "--weights",
+            action="append",
+            default=[],
+            help='json of weights to override, e.g. \'{"recency": 0.5}\', repeatable',
+        )
+        parser.add_argument("--k", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=3, help="runs per query")
+        parser.add_argument(
+            "--per-query", action="store_true", help="print NDCG of every query"
+        )
+        parser.add_argument("--output", help="save results as json")
+
+    def handle(self, *args, **options):
+        if not elasticsearch_search_enabled():
+            raise CommandError("ranking needs elasticsearch, not the in-memory backend")
+        queries = self.load_queries(options["queries"])
+        candidates = [("current", {})]
+        for overrides in options["weights"]:
+            try:
+                candidates.append((overrides, json.loads(overrides)))
+            except ValueError as error:
+                raise CommandError(f"invalid --weights {overrides!r}: {error}")
+
+        results = []
+        self.stdout.write(
+            f"{len(queries)} queries, k={options['k']}\n"
+            f"{'weights':<40}{'NDCG':>8}{'p50 ms':>10}{'p95 ms':>10}{'took p50':>10}"
+        )
+        for name, overrides in candidates:
+            result = self.evaluate(queries, ranking_weights(overrides), options)
+            result["name"] = name
+            results.append(result)
+            self.stdout.write(
+                f"{name[:39]:<40}{result['ndcg']:>8.4f}{result['p50_ms']:>10.1f}"
+                f"{result['p95_ms']:>10.1f}{result['took_p50_ms']:>10.1f}"
+            )
+            if options["per_query"]:
+                for query_id, score in result["per_query"].items():
+                    self.stdout.write(f"    {query_id:<36}{score:>8.4f}")
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"results saved to {options['output']}")
+
+    def load_queries(self, path):
+        queries = []
+        with open(path) as lines:
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                query = json.loads(line)
+                filterset = JobPostingSearchFilter(
+                    query.get("params", {}), queryset=JobPosting.objects.none()
+                )
+                if not filterset.is_valid():
+                    raise CommandError(f"line {number}: {dict(filterset.errors)}")
+                queries.append(
+                    {
+                        "id": str(query.get("id", number)),
+                        "params": filterset.form.cleaned_data,
+                        "skill_ids": query.get("skill_ids", []),
+                        "relevance": {
+                            int(pk): grade
+                            for pk, grade in query.get("relevant", {}).items()
+                        },
+                    }
+                )
+        if not queries:
+            raise CommandError("no labeled queries")
+        return queries
+
+    def evaluate(self, queries, weights, options):
+        k = options["k"]
+        per_query, timings, took = {}, [], []
+        for query in queries:
+            body = job_posting_search_body(query["params"], query["skill_ids"], weights)
+            body.update({"from": 0, "size": k, "_source": False})
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                response = es_service.query(body, job_posting_index_keys)
+                timings.append((time.perf_counter() - started) * 1000)
+                took.append(response["took"])
+            ranked_ids = [int(hit["_id"]) for hit in response["hits"]["hits"]]
+            per_query[query["id"]] = ndcg(ranked_ids, query["relevance"], k)
+        return {
+            "weights": weights,
+            "ndcg": statistics.mean(per_query.values()),
+            "p50_ms": percentile(timings, 0.5),
+            "p95_ms": percentile(timings, 0.95),
+            "took_p50_ms": percentile(took, 0.5),
+            "per_query": per_query,
+        }
@@ -0,0 +1,12 @@
+from jobs.exports import APPLICATION_EXPORT_FIELDS, application_export_queryset
+
+from ._export import ExportCommand
+
+
+class Command(ExportCommand):
+    help = "Stream every application (or one company's) as ndjson or csv."
+
+    export_fields = APPLICATION_EXPORT_FIELDS
+
+    def get_export_queryset(self, company_id):
+        return application_export_queryset(company_id)
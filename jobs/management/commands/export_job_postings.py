@@ -0,0 +1,12 @@
+from jobs.exports import JOB_POSTING_EXPORT_FIELDS, job_posting_export_queryset
+
+from ._export import ExportCommand
+
+
+class Command(ExportCommand):
+    help = "Stream every job posting (or one company's) as ndjson or csv."
+
+    export_fields = JOB_POSTING_EXPORT_FIELDS
+
+    def get_export_queryset(self, company_id):
+        return job_posting_export_queryset(company_id)
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.documents import create_job_posting_index, job_posting_documents
+from jobs.elastic_index_keys import job_posting_index_keys
+from shared_features.utils.elasticsearch_utils import es_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the job posting index with its current mappings and index "
+        "every job posting again. Needed after a mapping change, searches fall "
+        "back to the database while the index is rebuilt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="only create the index when it is missing and reindex into it",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if not options["keep"]:
+            es_service.delete_index(job_posting_index_keys)
+        create_job_posting_index()
+        indexed = es_service.bulk_index(
+            job_posting_documents(batch_size=options["batch_size"]),
+            job_posting_index_keys,
+            chunk_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{indexed} job postings indexed in {time.monotonic() - started:.1f}s"
+            )
+        )
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.alerts import create_saved_search_index, saved_search_documents
+from jobs.elastic_index_keys import saved_search_index_keys
+from shared_features.utils.elasticsearch_utils import es_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the saved search percolator index and store the query of "
+        "every active saved search again. Needed after a job posting mapping "
+        "change, new postings are not alerted while the index is rebuilt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="only create the index when it is missing and reindex into it",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if not options["keep"]:
+            es_service.delete_index(saved_search_index_keys)
+        create_saved_search_index()
+        indexed = es_service.bulk_index(
+            saved_search_documents(batch_size=options["batch_size"]),
+            saved_search_index_keys,
+            chunk_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{indexed} saved searches indexed in {time.monotonic() - started:.1f}s"
+            )
+        )
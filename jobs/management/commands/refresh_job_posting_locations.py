@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import Company
+from jobs.locations import LOCATION_BATCH_SIZE, refresh_job_posting_locations
+from jobs.models import JobPosting
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the geocoded city of every company's active address to its job "
+        "postings with set based updates, after a gazetteer change, writes "
+        "that bypassed signals or the migration adding job posting locations "
+        "(it leaves coordinates empty). Run rebuild_job_posting_index afterwards to "
+        "update the search index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=LOCATION_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = refresh_job_posting_locations(
+                JobPosting, Company, batch_size=options["batch_size"]
+            )
+        self.stdout.write(self.style.SUCCESS(f"{updated} job postings relocated"))
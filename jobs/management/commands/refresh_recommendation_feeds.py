@@ -0,0 +1,52 @@
+import datetime
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import JobSeeker
+from jobs.recommendations import FEED_BATCH_SIZE, refresh_feeds, stale_job_seekers
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the recommendation feeds of job seekers without one, with "
+        "changed skills or with an expired posting in their feed, across "
+        "worker processes. Run periodically, --max-age-hours also refreshes "
+        "old feeds so they pick up new postings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--batch-size", type=int, default=FEED_BATCH_SIZE)
+        parser.add_argument(
+            "--max-age-hours",
+            type=float,
+            help="also refresh feeds computed longer ago than this",
+        )
+        parser.add_argument(
+            "--all", action="store_true", help="refresh the feed of every job seeker"
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if options["all"]:
+            job_seekers = JobSeeker.objects.all()
+        else:
+            computed_before = None
+            if options["max_age_hours"] is not None:
+                computed_before = timezone.now() - datetime.timedelta(
+                    hours=options["max_age_hours"]
+                )
+            job_seekers = stale_job_seekers(computed_before)
+        stored = refresh_feeds(
+            job_seekers.values_list("pk", flat=True),
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{stored} feeds refreshed in {time.monotonic() - started:.1f}s"
+            )
+        )
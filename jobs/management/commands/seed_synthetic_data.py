@@ -0,0 +1,478 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.choices import EDUCATION_CHOICES, GENDER_CHOICES
+from accounts.models import Address, Company, IndustryArea, JobSeeker, User
+from jobs.locations import refresh_job_posting_locations
+from jobs.models import Application, JobPosting
+from shared_features.models import Skill
+from shared_features.reference_data import industry_areas
+
+SKILL_NAMES = (
+    "Python Django PostgreSQL Elasticsearch Docker Kubernetes Linux Git Redis "
+    "JavaScript TypeScript React Vue Angular Node.js Go Rust Java Kotlin Swift "
+    "C# .NET PHP Laravel Ruby Rails SQL MongoDB Kafka RabbitMQ AWS GCP Azure "
+    "Terraform Ansible Pandas NumPy PyTorch TensorFlow Excel Figma Photoshop "
+    "Scrum Jira Communication Leadership Sales Marketing SEO Accounting"
+).split()
+
+INDUSTRY_AREA_NAMES = (
+    "Software", "Finance", "Healthcare", "Education", "Retail", "Manufacturing",
+    "Logistics", "Telecommunications", "Energy", "Media", "Tourism", "Construction",
+    "Agriculture", "Government", "Consulting", "Insurance", "Automotive", "Gaming",
+)
+
+CITY_NAMES = (
+    "Tehran", "Mashhad", "Isfahan", "Karaj", "Shiraz", "Tabriz", "Qom", "Ahvaz",
+    "Kermanshah", "Urmia", "Rasht", "Zahedan", "Hamadan", "Kerman", "Yazd",
+)
+
+TITLE_LEVELS = ("Junior", "Mid-level", "Senior", "Lead", "Principal", "Intern")
+TITLE_ROLES = (
+    "Backend Developer", "Frontend Developer", "Data Engineer", "DevOps Engineer",
+    "Product Manager", "QA Engineer", "Data Scientist", "Mobile Developer",
+    "Accountant", "Sales Representative", "Designer", "Support Specialist",
+)
+WORKING_HOURS = ("9-17", "8-16", "10-18", "Part-time", "Flexible", "Shift")
+DESCRIPTION_WORDS = (
+    "we are looking for a motivated person to join our team and build "
+    "reliable products with modern tools in a friendly environment with "
+    "growth opportunities remote hybrid office benefits insurance training"
+).split()
+
+
+@contextmanager
+def created_at_writable(*models):
+    """
+    let bulk_create store generated `created_at` / `application_date` values
+    instead of now, so data is spread over time like production
+    """
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now_add", False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def zipf_weights(count, exponent=1.1):
+    """popularity weights, a few items are picked very often"""
+    return [1 / (rank**exponent) for rank in range(1, count + 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic dataset (users, companies, job seekers, addresses, "
+        "skills, industry areas, job postings and applications) for capacity "
+        "testing, with bulk inserts and set-based m2m inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--companies", type=int, default=1000)
+        parser.add_argument("--job-seekers", type=int, default=10000)
+        parser.add_argument("--skills", type=int, default=500)
+        parser.add_argument("--industry-areas", type=int, default=len(INDUSTRY_AREA_NAMES))
+        parser.add_argument("--job-postings", type=int, default=20000)
+        parser.add_argument("--skills-per-posting", type=float, default=6, help="mean")
+        parser.add_argument("--skills-per-seeker", type=float, default=8, help="mean")
+        parser.add_argument(
+            "--applications-per-posting", type=float, default=5, help="mean, long tailed"
+        )
+        parser.add_argument("--expired-ratio", type=float, default=0.3)
+        parser.add_argument("--days", type=int, default=365, help="spread of created_at")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--prefix", default="seed", help="prefix of generated emails, must be new"
+        )
+        parser.add_argument(
+            "--index", action="store_true", help="push job postings to the search index"
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+        self.days = options["days"]
+        self.password = make_password("StrongPassword123!")  # hashed once for all users
+
+        started = time.monotonic()
+        with created_at_writable(JobPosting, Application):
+            skill_ids = self.step("skills", self.seed_skills, options["skills"])
+            industry_area_ids = self.step(
+                "industry areas", self.seed_industry_areas, options["industry_areas"]
+            )
+            company_ids = self.step(
+                "companies",
+                self.seed_companies,
+                options["companies"],
+                options["prefix"],
+                industry_area_ids,
+            )
+            job_seeker_ids = self.step(
+                "job seekers",
+                self.seed_job_seekers,
+                options["job_seekers"],
+                options["prefix"],
+                skill_ids,
+                options["skills_per_seeker"],
+            )
+            job_posting_ids = self.step(
+                "job postings",
+                self.seed_job_postings,
+                options["job_postings"],
+                company_ids,
+                skill_ids,
+                industry_area_ids,
+                options["skills_per_posting"],
+                options["expired_ratio"],
+            )
+            self.step(
+                "job posting locations",
+                refresh_job_posting_locations,
+                JobPosting,
+                Company,
+                company_ids,
+            )
+            self.step(
+                "applications",
+                self.seed_applications,
+                job_posting_ids,
+                job_seeker_ids,
+                options["applications_per_posting"],
+            )
+        if options["index"]:
+            self.step("search index", self.index_job_postings, job_posting_ids)
+            self.step("candidate index", self.index_candidates, job_seeker_ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"done in {time.monotonic() - started:.1f}s")
+        )
+
+    def step(self, name, func, *args):
+        started = time.monotonic()
+        result = func(*args)
+        count = len(result) if isinstance(result, list) else result
+        self.stdout.write(f"{name}: {count} in {time.monotonic() - started:.1f}s")
+        return result
+
+    # helpers
+
+    def bulk_insert(self, model, objects):
+        """
+        bulk_create in batches, each in its own transaction, returns the new ids
+        """
+        ids = []
+        for start in range(0, len(objects), self.batch_size):
+            batch = objects[start : start + self.batch_size]
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+                if not connection.features.can_return_rows_from_bulk_insert:
+                    # single writer while seeding, the batch has the newest ids
+                    new_ids = list(
+                        model.objects.everything()
+                        .order_by("-pk")
+                        .values_list("pk", flat=True)[: len(batch)]
+                    )
+                    for obj, pk in zip(batch, reversed(new_ids)):
+                        obj.pk = pk
+            ids.extend(obj.pk for obj in batch)
+        return ids
+
+    def bulk_insert_rows(self, model, rows):
+        """
+        bulk_create rows of an auto created m2m through model
+        """
+        for start in range(0, len(rows), self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    rows[start : start + self.batch_size], batch_size=self.batch_size
+                )
+        return len(rows)
+
+    def sample_count(self, mean, maximum, minimum=0):
+        """poisson like count around `mean`, clamped"""
+        count = int(round(self.random.gammavariate(max(mean, 0.01), 1.0)))
+        return max(minimum, min(maximum, count))
+
+    def random_past(self):
+        return self.now - timedelta(seconds=self.random.randrange(self.days * 86400 or 1))
+
+    # tables
+
+    def seed_skills(self, count):
+        names = [
+            SKILL_NAMES[index % len(SKILL_NAMES)]
+            + ("" if index < len(SKILL_NAMES) else f" {index // len(SKILL_NAMES)}")
+            for index in range(count)
+        ]
+        # skill names are unique, reuse skills of a previous run
+        skill_ids = Skill.objects.resolve_ids(names)
+        return [skill_ids[name] for name in names]
+
+    def seed_industry_areas(self, count):
+        names = [
+            INDUSTRY_AREA_NAMES[index % len(INDUSTRY_AREA_NAMES)]
+            + ("" if index < len(INDUSTRY_AREA_NAMES) else f" {index // len(INDUSTRY_AREA_NAMES)}")
+            for index in range(count)
+        ]
+        industry_area_ids = self.bulk_insert(
+            IndustryArea, [IndustryArea(name=name) for name in names]
+        )
+        industry_areas.invalidate()
+        return industry_area_ids
+
+    def new_users(self, count, prefix, usage_type):
+        users = []
+        for index in range(count):
+            username = f"{prefix}_{usage_type.lower()}_{index}"
+            users.append(
+                User(
+                    email=f"{username}@example.com",
+                    username=username,
+                    password=self.password,
+                    usage_type=usage_type,
+                    first_name=f"First{index}",
+                    last_name=f"Last{index}",
+                )
+            )
+        return self.bulk_insert(User, users)
+
+    def seed_addresses(self, model, object_ids):
+        """one active address per object, returns address ids in object order"""
+        content_type = ContentType.objects.get_for_model(model)
+        return self.bulk_insert(
+            Address,
+            [
+                Address(
+                    address_text=f"No. {self.random.randint(1, 300)}, Street {self.random.randint(1, 90)}",
+                    city=self.random.choice(CITY_NAMES),
+                    content_type=content_type,
+                    object_id=object_id,
+                )
+                for object_id in object_ids
+            ],
+        )
+
+    def seed_companies(self, count, prefix, industry_area_ids):
+        user_ids = self.new_users(count, prefix, "Employer")
+        company_ids = self.bulk_insert(
+            Company,
+            [
+                Company(
+                    name=f"Company {prefix} {index}",
+                    establishment_year=self.random.randint(1950, 2024),
+                    phone_number=f"0912{self.random.randint(0, 9999999):07d}",
+                    user_id=user_id,
+                )
+                for index, user_id in enumerate(user_ids)
+            ],
+        )
+        address_ids = self.seed_addresses(Company, company_ids)
+        self.set_active_addresses(Company, company_ids, address_ids)
+
+        Through = Company.industry_areas.through
+        rows = []
+        for company_id in company_ids:
+            for area_id in self.random.sample(
+                industry_area_ids, min(len(industry_area_ids), self.random.randint(1, 3))
+            ):
+                rows.append(Through(company_id=company_id, industryarea_id=area_id))
+        self.bulk_insert_rows(Through, rows)
+        return company_ids
+
+    def set_active_addresses(self, model, object_ids, address_ids):
+        objects = [
+            model(pk=object_id, active_address_id=address_id)
+            for object_id, address_id in zip(object_ids, address_ids)
+        ]
+        for start in range(0, len(objects), self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_update(
+                    objects[start : start + self.batch_size], ["active_address"]
+                )
+
+    def seed_job_seekers(self, count, prefix, skill_ids, skills_per_seeker):
+        user_ids = self.new_users(count, prefix, "JobSeeker")
+        job_seeker_ids = self.bulk_insert(
+            JobSeeker,
+            [
+                JobSeeker(
+                    user_id=user_id,
+                    birth_date=(self.now - timedelta(days=self.random.randint(18, 60) * 365)).date(),
+                    gender=self.random.choice(GENDER_CHOICES)[0],
+                    education=self.random.choice(EDUCATION_CHOICES)[0],
+                )
+                for user_id in user_ids
+            ],
+        )
+        address_ids = self.seed_addresses(JobSeeker, job_seeker_ids)
+        self.set_active_addresses(JobSeeker, job_seeker_ids, address_ids)
+
+        Through = JobSeeker.skills.through
+        weights = zipf_weights(len(skill_ids))
+        rows = []
+        for job_seeker_id in job_seeker_ids:
+            for skill_id in self.weighted_sample(
+                skill_ids, weights, self.sample_count(skills_per_seeker, len(skill_ids), 1)
+            ):
+                rows.append(Through(jobseeker_id=job_seeker_id, skill_id=skill_id))
+        self.bulk_insert_rows(Through, rows)
+        return job_seeker_ids
+
+    def weighted_sample(self, population, weights, count):
+        """`count` distinct items, popular items first"""
+        chosen = set()
+        attempts = 0
+        while len(chosen) < count and attempts < count * 10:
+            chosen.add(self.random.choices(population, weights)[0])
+            attempts += 1
+        return chosen
+
+    def seed_job_postings(
+        self,
+        count,
+        company_ids,
+        skill_ids,
+        industry_area_ids,
+        skills_per_posting,
+        expired_ratio,
+    ):
+        today = self.now.date()
+        company_weights = zipf_weights(len(company_ids), exponent=0.8)
+        skill_weights = zipf_weights(len(skill_ids))
+        SkillThrough = JobPosting.skills.through
+        AreaThrough = JobPosting.industry_areas.through
+
+        job_posting_ids = []
+        for start in range(0, count, self.batch_size):
+            postings = []
+            for _ in range(min(self.batch_size, count - start)):
+                created_at = self.random_past()
+                if self.random.random() < expired_ratio:
+                    expiry_date = today - timedelta(days=self.random.randint(1, 180))
+                else:
+                    expiry_date = today + timedelta(days=self.random.randint(1, 90))
+                salary_start, salary_end = self.salary_range()
+                postings.append(
+                    JobPosting(
+                        title=f"{self.random.choice(TITLE_LEVELS)} {self.random.choice(TITLE_ROLES)}",
+                        description=" ".join(self.random.choices(DESCRIPTION_WORDS, k=80)),
+                        expiry_date=expiry_date,
+                        salary_range_start=salary_start,
+                        salary_range_end=salary_end,
+                        working_hours=self.random.choice(WORKING_HOURS),
+                        company_id=self.random.choices(company_ids, company_weights)[0],
+                        created_at=created_at,
+                    )
+                )
+            ids = self.bulk_insert(JobPosting, postings)
+
+            skill_rows, area_rows = [], []
+            for job_posting_id in ids:
+                for skill_id in self.weighted_sample(
+                    skill_ids,
+                    skill_weights,
+                    self.sample_count(skills_per_posting, len(skill_ids), 1),
+                ):
+                    skill_rows.append(SkillThrough(jobposting_id=job_posting_id, skill_id=skill_id))
+                for area_id in self.random.sample(
+                    industry_area_ids, min(len(industry_area_ids), self.random.randint(1, 2))
+                ):
+                    area_rows.append(AreaThrough(jobposting_id=job_posting_id, industryarea_id=area_id))
+            self.bulk_insert_rows(SkillThrough, skill_rows)
+            self.bulk_insert_rows(AreaThrough, area_rows)
+            job_posting_ids.extend(ids)
+        return job_posting_ids
+
+    def salary_range(self):
+        """
+        most postings have a range, some are open ended or without salary
+        """
+        roll = self.random.random()
+        start = self.random.randrange(500, 6000, 100)
+        end = start + self.random.randrange(200, 4000, 100)
+        if roll < 0.15:
+            return None, None
+        if roll < 0.25:
+            return start, None
+        if roll < 0.30:
+            return None, end
+        return start, end
+
+    def seed_applications(self, job_posting_ids, job_seeker_ids, applications_per_posting):
+        statuses = ("Pending", "Accepted", "Rejected")
+        status_weights = (0.7, 0.1, 0.2)
+        total = 0
+        applications = []
+        for job_posting_id in job_posting_ids:
+            # long tailed, most postings get a few applications, some get many
+            count = min(
+                len(job_seeker_ids),
+                int(self.random.expovariate(1 / applications_per_posting)) if applications_per_posting else 0,
+            )
+            for job_seeker_id in self.random.sample(job_seeker_ids, count):
+                application_date = self.random_past()
+                applications.append(
+                    Application(
+                        job_posting_id=job_posting_id,
+                        job_seeker_id=job_seeker_id,
+                        status=self.random.choices(statuses, status_weights)[0],
+                        application_date=application_date,
+                        created_at=application_date,
+                    )
+                )
+            if len(applications) >= self.batch_size:
+                total += self.bulk_insert_rows(Application, applications)
+                applications = []
+        total += self.bulk_insert_rows(Application, applications)
+        return total
+
+    def index_job_postings(self, job_posting_ids):
+        from shared_features.utils.elasticsearch_utils import es_service
+
+        from jobs.documents import create_job_posting_index, job_posting_documents
+        from jobs.elastic_index_keys import job_posting_index_keys
+
+        create_job_posting_index()
+        indexed = 0
+        for start in range(0, len(job_posting_ids), self.batch_size):
+            queryset = JobPosting.objects.filter(
+                pk__in=job_posting_ids[start : start + self.batch_size]
+            )
+            indexed += es_service.bulk_index(
+                job_posting_documents(queryset), job_posting_index_keys
+            )
+        return indexed
+
+    def index_candidates(self, job_seeker_ids):
+        from shared_features.utils.elasticsearch_utils import es_service
+
+        from accounts.documents import candidate_documents, create_candidate_index
+        from accounts.elastic_index_keys import candidate_index_keys
+
+        create_candidate_index()
+        indexed = 0
+        for start in range(0, len(job_seeker_ids), self.batch_size):
+            queryset = JobSeeker.objects.filter(
+                pk__in=job_seeker_ids[start : start + self.batch_size]
+            )
+            indexed += es_service.bulk_index(
+                candidate_documents(queryset), candidate_index_keys
+            )
+        return indexed
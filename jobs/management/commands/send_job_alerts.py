@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from jobs.alerts import ALERT_BATCH_SIZE, send_job_alerts
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued new job alerts of saved searches, one email per job seeker "
+        "and batch. Run it periodically (e.g. cron), concurrent runs on "
+        "PostgreSQL share the queue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=ALERT_BATCH_SIZE)
+        parser.add_argument(
+            "--max-batches", type=int, help="stop after this many batches"
+        )
+
+    def handle(self, *args, **options):
+        processed = batches = 0
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            taken = send_job_alerts(options["batch_size"])
+            if not taken:
+                break
+            processed += taken
+            batches += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"{processed} alerts processed in {batches} batches")
+        )
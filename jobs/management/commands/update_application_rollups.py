@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.rollups import ROLLUP_BATCH_SIZE, update_application_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Bring the daily application rollups up to date with applications "
+        "changed since the last run (watermark on updated_at). Run it "
+        "periodically (e.g. cron every few minutes)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=ROLLUP_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        groups = update_application_rollups(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{groups} (day, job posting) groups rewritten in "
+                f"{time.monotonic() - started:.1f}s"
+            )
+        )
@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-19 17:31
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+from django.utils import timezone
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    """
+    soft delete all but the first active application of a job seeker to a
+    job posting, earlier versions did not prevent applying twice
+    """
+    Application = apps.get_model("jobs", "Application")
+    active = Application.objects.filter(is_removed=False)
+    duplicates = (
+        active.values("job_seeker", "job_posting")
+        .annotate(first=Min("pk"), total=Count("pk"))
+        .filter(total__gt=1)
+    )
+    for pair in duplicates.iterator():
+        active.filter(
+            job_seeker=pair["job_seeker"], job_posting=pair["job_posting"]
+        ).exclude(pk=pair["first"]).update(is_removed=True, updated_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_removed', False)), fields=('job_seeker', 'job_posting'), name='unique_active_application'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-19 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_application_unique_active_application'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['title'], name='job_posting_title_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
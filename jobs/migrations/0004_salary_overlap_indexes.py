@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-19 18:01
+
+from django.db import migrations, models
+import django.db.models.expressions
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(django.db.models.functions.comparison.Coalesce('salary_range_start', django.db.models.expressions.RawSQL('0', (), output_field=models.PositiveIntegerField())), django.db.models.functions.comparison.Coalesce('salary_range_end', django.db.models.expressions.RawSQL('2147483647', (), output_field=models.PositiveIntegerField())), condition=models.Q(('is_removed', False), models.Q(('salary_range_start__isnull', False), ('salary_range_end__isnull', False), _connector='OR')), name='job_salary_low_high_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(django.db.models.functions.comparison.Coalesce('salary_range_end', django.db.models.expressions.RawSQL('2147483647', (), output_field=models.PositiveIntegerField())), django.db.models.functions.comparison.Coalesce('salary_range_start', django.db.models.expressions.RawSQL('0', (), output_field=models.PositiveIntegerField())), condition=models.Q(('is_removed', False), models.Q(('salary_range_start__isnull', False), ('salary_range_end__isnull', False), _connector='OR')), name='job_salary_high_low_idx'),
+        ),
+    ]
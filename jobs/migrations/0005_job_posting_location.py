@@ -0,0 +1,71 @@
+# Generated by Django 4.2 on 2026-10-19 18:05
+
+import unicodedata
+
+from django.db import migrations, models
+
+# copy of shared_features.utils.geocoding.normalize_city as of this migration
+CITY_NAME_REPLACEMENTS = str.maketrans(
+    {"ي": "ی", "ك": "ک", "\u200c": " ", "-": " "}
+)
+
+
+def normalize_city(name):
+    name = unicodedata.normalize("NFKC", name or "").translate(CITY_NAME_REPLACEMENTS)
+    return " ".join(name.split()).casefold()
+
+
+def fill_job_posting_cities(apps, schema_editor):
+    """
+    copy the normalized city of each company's active address to its job
+    postings, indexes are created afterwards. coordinates depend on the
+    gazetteer (a setting and a data file), so they are left empty here:
+    run `manage.py refresh_job_posting_locations` after migrating
+    """
+    JobPosting = apps.get_model("jobs", "JobPosting")
+    Company = apps.get_model("accounts", "Company")
+    by_city = {}
+    for pk, city in Company.objects.filter(active_address__isnull=False).values_list(
+        "pk", "active_address__city"
+    ):
+        by_city.setdefault(normalize_city(city), []).append(pk)
+    for city, company_ids in by_city.items():
+        for start in range(0, len(company_ids), 1000):
+            JobPosting.objects.filter(
+                company_id__in=company_ids[start : start + 1000]
+            ).update(location_city=city)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_salary_overlap_indexes'),
+        ('accounts', '0005_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='location_city',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_job_posting_cities, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['location_city'], name='job_posting_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(condition=models.Q(('latitude__isnull', False)), fields=['latitude', 'longitude'], name='job_posting_coordinates_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2 on 2026-10-19 18:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_prefix_search_indexes'),
+        ('jobs', '0005_job_posting_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_removed', models.BooleanField(default=False)),
+                ('name', models.CharField(max_length=100)),
+                ('params', models.JSONField(default=dict)),
+                ('is_active', models.BooleanField(default=True)),
+                ('job_seeker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches_job_seeker', to='accounts.jobseeker')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='JobAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_removed', models.BooleanField(default=False)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_alerts_job_posting', to='jobs.jobposting')),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_alerts_saved_search', to='jobs.savedsearch')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobalert',
+            index=models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['id'], name='job_alert_pending_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobalert',
+            constraint=models.UniqueConstraint(fields=('saved_search', 'job_posting'), name='unique_job_alert'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2 on 2026-10-19 18:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_prefix_search_indexes'),
+        ('jobs', '0006_saved_search_alerts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Accepted', 'Accepted'), ('Rejected', 'Rejected')], max_length=20)),
+                ('count', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['updated_at'], name='application_updated_at_idx'),
+        ),
+        migrations.AddField(
+            model_name='applicationdailyrollup',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_rollups_company', to='accounts.company'),
+        ),
+        migrations.AddField(
+            model_name='applicationdailyrollup',
+            name='job_posting',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_rollups_job_posting', to='jobs.jobposting'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationdailyrollup',
+            index=models.Index(fields=['company', 'day'], name='app_rollup_company_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationdailyrollup',
+            index=models.Index(fields=['day'], name='app_rollup_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='applicationdailyrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'job_posting', 'status'), name='unique_application_rollup'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-19 18:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_application_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobPostingMinHash',
+            fields=[
+                ('job_posting', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='job_posting_minhash', serialize=False, to='jobs.jobposting')),
+                ('signature', models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job_posting_duplicates', to='jobs.jobposting'),
+        ),
+        migrations.CreateModel(
+            name='JobPostingBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_posting_bands', to='jobs.jobposting')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobpostingband',
+            index=models.Index(fields=['band', 'bucket'], name='job_posting_band_bucket_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobpostingband',
+            constraint=models.UniqueConstraint(fields=('job_posting', 'band'), name='unique_job_posting_band'),
+        ),
+    ]
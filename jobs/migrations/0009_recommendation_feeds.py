@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-19 18:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_prefix_search_indexes'),
+        ('jobs', '0008_job_posting_duplicates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationFeed',
+            fields=[
+                ('job_seeker', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recommendation_feed', serialize=False, to='accounts.jobseeker')),
+                ('job_posting_ids', models.BinaryField()),
+                ('scores', models.BinaryField()),
+                ('expires_on', models.DateField(blank=True, null=True)),
+                ('is_stale', models.BooleanField(default=False)),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='recommendationfeed',
+            index=models.Index(fields=['expires_on'], name='feed_expires_on_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recommendationfeed',
+            index=models.Index(condition=models.Q(('is_stale', True)), fields=['is_stale'], name='feed_stale_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_recommendation_feeds'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendationfeed',
+            name='stale_since',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
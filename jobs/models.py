@@ -1,11 +1,34 @@
 from django.db import models
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
 from shared_features.mixins import ModelMixin
 
 from accounts.models import Company
 from accounts.models import IndustryArea, JobSeeker
 from shared_features.models import Skill
 from .choices import APPLICATION_STATUS_CHOICES
+from .locations import company_location, location_fields
 
+# open ended salary ranges as closed ones: a missing start is 0 and a missing
+# end the largest positive integer. the salary overlap indexes are built on
+# these expressions and the salary filter (jobs.filters) queries the same ones.
+# the bounds are sql literals, an expression with a bound parameter does not
+# match the indexed one
+SALARY_RANGE_MAX = 2147483647
+salary_low = Coalesce(
+    "salary_range_start", RawSQL("0", (), output_field=models.PositiveIntegerField())
+)
+salary_high = Coalesce(
+    "salary_range_end",
+    RawSQL(str(SALARY_RANGE_MAX), (), output_field=models.PositiveIntegerField()),
+)
+# postings without any salary never match a salary search, they are left out
+# of the overlap indexes with removed postings. queries repeat this condition
+# word for word so the partial indexes apply
+has_salary = models.Q(salary_range_start__isnull=False) | models.Q(
+    salary_range_end__isnull=False
+)
+salary_index_condition = models.Q(is_removed=False) & has_salary
 
 class JobPosting(ModelMixin):
     """
@@ -25,6 +48,22 @@ class JobPosting(ModelMixin):
         IndustryArea, related_name="job_posting_industry_areas"
     )
     skills = models.ManyToManyField(Skill, related_name="job_posting_skills")
+    # location of the company's active address, denormalized so location
+    # searches do not join through the generic address relation (kept in sync
+    # by jobs.locations)
+    location_city = models.CharField(max_length=100, blank=True, editable=False)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    # the posting of its near-duplicate group shown in searches, the one
+    # expiring last (see jobs.dedup), empty for postings without duplicates
+    duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="job_posting_duplicates",
+    )
     # TODO: Use object storages and pass address
     active_photo = models.ForeignKey(
         "JobPostingPhoto",
@@ -40,6 +79,33 @@ class JobPosting(ModelMixin):
         indexes = [
             models.Index(fields=["title"]),
             models.Index(fields=["company"]),
+            # prefix search of the admin, LIKE 'x%' needs pattern ops on PostgreSQL
+            models.Index(
+                fields=["title"],
+                name="job_posting_title_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(fields=["location_city"], name="job_posting_city_idx"),
+            # bounding box pre-filter of distance searches
+            models.Index(
+                fields=["latitude", "longitude"],
+                name="job_posting_coordinates_idx",
+                condition=models.Q(latitude__isnull=False),
+            ),
+            # salary overlap (low <= wanted max and high >= wanted min), the
+            # planner ranges over the bound that is more selective
+            models.Index(
+                salary_low,
+                salary_high,
+                name="job_salary_low_high_idx",
+                condition=salary_index_condition,
+            ),
+            models.Index(
+                salary_high,
+                salary_low,
+                name="job_salary_high_low_idx",
+                condition=salary_index_condition,
+            ),
         ]
 
     def __str__(self):
@@ -49,9 +115,50 @@ class JobPosting(ModelMixin):
         """
         TODO: index in elasticsearch
         """
+        if self._state.adding and not self.location_city:
+            for field, value in location_fields(company_location(self.company)).items():
+                setattr(self, field, value)
         super().save(*args, **kwargs)
 
 
+class JobPostingMinHash(models.Model):
+    """
+    MinHash signature of the title and description of a job posting
+    (shared_features.utils.minhash), packed as 4 bytes per value
+    """
+
+    job_posting = models.OneToOneField(
+        JobPosting,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="job_posting_minhash",
+    )
+    signature = models.BinaryField()
+
+
+class JobPostingBand(models.Model):
+    """
+    LSH band bucket of a job posting signature, postings sharing a
+    (band, bucket) are candidate near-duplicates
+    """
+
+    job_posting = models.ForeignKey(
+        JobPosting, on_delete=models.CASCADE, related_name="job_posting_bands"
+    )
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job_posting", "band"], name="unique_job_posting_band"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["band", "bucket"], name="job_posting_band_bucket_idx"),
+        ]
+
+
 class JobPostingPhoto(ModelMixin):
     """
     class for storing JobPosting photos
@@ -96,5 +203,158 @@ class Application(ModelMixin):
         JobPosting, on_delete=models.CASCADE, related_name="applications_job_posting"
     )
 
+    class Meta:
+        constraints = [
+            # a job seeker applies once per job posting, makes batch apply idempotent
+            models.UniqueConstraint(
+                fields=["job_seeker", "job_posting"],
+                condition=models.Q(is_removed=False),
+                name="unique_active_application",
+            ),
+        ]
+        indexes = [
+            # changes since the watermark of the analytics rollups (jobs.rollups)
+            models.Index(fields=["updated_at"], name="application_updated_at_idx"),
+        ]
+
     def __str__(self):
         return f"Application by {self.job_seeker} for {self.job_posting}"
+
+
+class SavedSearch(ModelMixin):
+    """
+    search of a job seeker to be alerted of new job postings matching it,
+    stored in elasticsearch as a percolator query (see jobs.alerts)
+    """
+
+    job_seeker = models.ForeignKey(
+        JobSeeker, on_delete=models.CASCADE, related_name="saved_searches_job_seeker"
+    )
+    name = models.CharField(max_length=100)
+    # cleaned parameters of the search route (JobPostingSearchFilter), empty
+    # ones left out
+    params = models.JSONField(default=dict)
+    is_active = models.BooleanField(default=True)
+
+    def __str__(self):
+        return self.name
+
+
+class JobAlert(ModelMixin):
+    """
+    a job posting matching a saved search, queued until sent with the other
+    alerts of the job seeker (manage.py send_job_alerts)
+    """
+
+    saved_search = models.ForeignKey(
+        SavedSearch, on_delete=models.CASCADE, related_name="job_alerts_saved_search"
+    )
+    job_posting = models.ForeignKey(
+        JobPosting, on_delete=models.CASCADE, related_name="job_alerts_job_posting"
+    )
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # a posting is alerted once per saved search, however often it is
+            # edited
+            models.UniqueConstraint(
+                fields=["saved_search", "job_posting"], name="unique_job_alert"
+            ),
+        ]
+        indexes = [
+            # the queue: pending alerts in insertion order
+            models.Index(
+                fields=["id"],
+                name="job_alert_pending_idx",
+                condition=models.Q(sent_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Alert of {self.job_posting} for {self.saved_search}"
+
+
+class ApplicationDailyRollup(models.Model):
+    """
+    number of applications to a job posting made on `day` that are in
+    `status` now, kept up to date by jobs.rollups
+    """
+
+    day = models.DateField()
+    company = models.ForeignKey(
+        Company, on_delete=models.CASCADE, related_name="application_rollups_company"
+    )
+    job_posting = models.ForeignKey(
+        JobPosting,
+        on_delete=models.CASCADE,
+        related_name="application_rollups_job_posting",
+    )
+    status = models.CharField(max_length=20, choices=APPLICATION_STATUS_CHOICES)
+    count = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "job_posting", "status"],
+                name="unique_application_rollup",
+            ),
+        ]
+        indexes = [
+            # dashboards of a company over a date range
+            models.Index(fields=["company", "day"], name="app_rollup_company_day_idx"),
+            models.Index(fields=["day"], name="app_rollup_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.job_posting_id} {self.status}: {self.count}"
+
+
+class RollupWatermark(models.Model):
+    """
+    rows changed up to `value` (an `updated_at`) are reflected in the rollup
+    `name`
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class RecommendationFeed(models.Model):
+    """
+    top job postings of a job seeker, precomputed by manage.py
+    refresh_recommendation_feeds (see jobs.recommendations). ids and scores
+    are packed arrays of 4 bytes per value in rank order
+    """
+
+    job_seeker = models.OneToOneField(
+        JobSeeker,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="recommendation_feed",
+    )
+    job_posting_ids = models.BinaryField()
+    scores = models.BinaryField()
+    # first expiry date of the postings, the feed is refreshed once it passes
+    expires_on = models.DateField(null=True, blank=True)
+    # skills of the job seeker changed since the feed was computed
+    is_stale = models.BooleanField(default=False)
+    # last time skills changed, a feed computed before it stays stale
+    stale_since = models.DateTimeField(null=True, blank=True)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["expires_on"], name="feed_expires_on_idx"),
+            models.Index(
+                fields=["is_stale"],
+                condition=models.Q(is_stale=True),
+                name="feed_stale_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"feed of {self.job_seeker_id} at {self.computed_at}"
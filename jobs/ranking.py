@@ -0,0 +1,152 @@
+"""
+relevance ranking of job posting searches
+
+the elasticsearch query is wrapped in a `function_score` whose parts are
+summed, each scaled by its weight of JOB_POSTING_RANKING:
+    text: BM25 of the words on title, skills, description and company name
+    skills: share of the job seeker's skills the posting asks for
+    recency: gaussian decay of `created_at`, 0.5 after `recency_scale_days`
+    expiry: linear decay of `expiry_date`, full within `expiry_horizon_days`
+        and dropping to 0.5 for postings expiring now
+
+`manage.py evaluate_ranking` measures NDCG and latency of weight sets on
+labeled queries before they are changed in the settings. `recency_score` and
+`expiry_score` compute the same functions in python for precomputed
+recommendation feeds (jobs.recommendations).
+"""
+
+from django.conf import settings
+
+DEFAULT_RANKING_WEIGHTS = {
+    "text": 1.0,
+    "skills": 2.0,
+    "recency": 1.0,
+    "recency_scale_days": 30,
+    "expiry": 1.0,
+    "expiry_horizon_days": 14,
+}
+
+TEXT_SEARCH_FIELDS = ("title^3", "skills^2", "description", "company_name")
+
+# expiry dates past the horizon all score 1, up to this many days after it
+EXPIRY_PLATEAU_DAYS = 3650
+
+
+def ranking_weights(overrides=None):
+    """
+    default weights updated with the JOB_POSTING_RANKING setting and
+    `overrides`
+    """
+    return {
+        **DEFAULT_RANKING_WEIGHTS,
+        **getattr(settings, "JOB_POSTING_RANKING", {}),
+        **(overrides or {}),
+    }
+
+
+def skill_clauses(skill_ids, weight):
+    """
+    one constant score clause per skill of the job seeker, the matching ones
+    add up to `weight` times the share of skills the posting asks for
+    """
+    skill_ids = sorted(set(skill_ids or ()))
+    if not skill_ids or not weight:
+        return []
+    boost = weight / len(skill_ids)
+    return [
+        {"constant_score": {"filter": {"term": {"skill_ids": pk}}, "boost": boost}}
+        for pk in skill_ids
+    ]
+
+
+def score_functions(weights):
+    functions = []
+    if weights["recency"]:
+        functions.append(
+            {
+                "gauss": {
+                    "created_at": {
+                        "origin": "now",
+                        "scale": f"{weights['recency_scale_days']}d",
+                        "decay": 0.5,
+                    }
+                },
+                "weight": weights["recency"],
+            }
+        )
+    if weights["expiry"]:
+        # decay functions are symmetric around the origin, putting it far in
+        # the future with a wide offset only penalizes expiry dates close to now
+        horizon = weights["expiry_horizon_days"]
+        functions.append(
+            {
+                "linear": {
+                    "expiry_date": {
+                        "origin": f"now+{horizon + EXPIRY_PLATEAU_DAYS}d",
+                        "offset": f"{EXPIRY_PLATEAU_DAYS}d",
+                        "scale": f"{horizon}d",
+                        "decay": 0.5,
+                    }
+                },
+                "weight": weights["expiry"],
+            }
+        )
+    return functions
+
+
+def recency_score(age_days, weights):
+    """
+    gauss decay of `score_functions` for a posting created `age_days` ago
+    """
+    if not weights["recency"]:
+        return 0.0
+    return weights["recency"] * 0.5 ** ((age_days / weights["recency_scale_days"]) ** 2)
+
+
+def expiry_score(days_left, weights):
+    """
+    linear decay of `score_functions` for a posting expiring in `days_left`
+    """
+    if not weights["expiry"]:
+        return 0.0
+    horizon = weights["expiry_horizon_days"]
+    distance = max(horizon - days_left, 0)
+    return weights["expiry"] * max(1 - 0.5 * distance / horizon, 0.0)
+
+
+def ranked_query(text, filters, skill_ids=None, weights=None):
+    """
+    function_score query of the words `text` (optional) within `filters`,
+    ranked by the weights of `ranking_weights()` unless given
+    """
+    weights = weights or ranking_weights()
+    query = {
+        "bool": {
+            "should": skill_clauses(skill_ids, weights["skills"]),
+            "filter": filters,
+        }
+    }
+    if text:
+        query["bool"]["must"] = [text_clause(text, boost=weights["text"])]
+    functions = score_functions(weights)
+    if not functions:
+        return query
+    return {
+        "function_score": {
+            "query": query,
+            "functions": functions,
+            "score_mode": "sum",
+            "boost_mode": "sum",
+        }
+    }
+
+
+def text_clause(text, boost=1.0):
+    return {
+        "multi_match": {
+            "query": text,
+            "fields": list(TEXT_SEARCH_FIELDS),
+            "operator": "and",
+            "boost": boost,
+        }
+    }
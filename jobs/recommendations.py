@@ -0,0 +1,293 @@
+"""
+precomputed recommendation feeds of job seekers
+
+the feed of a job seeker holds the RECOMMENDATION_FEED_SIZE current job
+postings scoring best for them, as ranked searches without words score them
+(jobs.ranking): share of the job seeker's skills the posting asks for,
+recency and expiry proximity, weighted by JOB_POSTING_RANKING.
+
+manage.py refresh_recommendation_feeds computes feeds in batches across
+worker processes, each loading the current postings once, and stores ids and
+scores as packed arrays of one RecommendationFeed row per job seeker. only
+missing feeds, stale ones (skills changed, see jobs.signals) and feeds with
+an expired posting are computed again, also by the task queued when skills
+change (jobs.tasks). the feed route reads that one row, a job seeker without
+one gets a provisional feed of a bounded set of postings until the queued
+task computes theirs.
+"""
+
+import array
+import heapq
+from collections import Counter, defaultdict
+from itertools import chain, islice
+from multiprocessing import Pool
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import JobSeeker
+
+from .models import JobPosting, RecommendationFeed
+from .ranking import expiry_score, ranking_weights, recency_score
+
+FEED_SIZE = 50
+FEED_BATCH_SIZE = 500
+# newest postings of the job seeker's skills and newest overall scored for a
+# provisional feed, each
+PROVISIONAL_CANDIDATES = 500
+
+
+def feed_size():
+    return getattr(settings, "RECOMMENDATION_FEED_SIZE", FEED_SIZE)
+
+
+def feed_postings():
+    # near-duplicates are left out as in searches
+    return JobPosting.objects.filter(
+        expiry_date__gte=timezone.localdate(), duplicate_of__isnull=True
+    )
+
+
+def posting_table(queryset):
+    """
+    {id: (skill ids, created_at, expiry_date)} of the postings of
+    `queryset`, with two queries
+    """
+    skills = defaultdict(list)
+    for job_posting_id, skill_id in JobPosting.skills.through.objects.filter(
+        jobposting_id__in=queryset.values("pk")
+    ).values_list("jobposting_id", "skill_id"):
+        skills[job_posting_id].append(skill_id)
+    return {
+        pk: (tuple(skills[pk]), created_at, expiry_date)
+        for pk, created_at, expiry_date in queryset.values_list(
+            "pk", "created_at", "expiry_date"
+        )
+    }
+
+
+class FeedScorer:
+    """
+    top postings of a posting table for sets of skills. postings are scored
+    by recency and expiry once, skills only add to the postings asking for
+    them, so a feed costs the postings of the job seeker's skills
+    """
+
+    def __init__(self, postings, weights, now, size):
+        self.size = size
+        self.skill_weight = weights["skills"]
+        self.by_skill = defaultdict(list)
+        self.base = {}
+        today = timezone.localdate(now)
+        for pk, (skill_ids, created_at, expiry_date) in postings.items():
+            for skill_id in skill_ids:
+                self.by_skill[skill_id].append(pk)
+            self.base[pk] = recency_score(
+                (now - created_at).total_seconds() / 86400, weights
+            ) + expiry_score((expiry_date - today).days, weights)
+        # best postings for job seekers without skills, also the best of the
+        # postings asking for none of a job seeker's skills
+        self.generic = heapq.nlargest(size, self.base.items(), key=itemgetter(1))
+
+    def feed(self, skill_ids):
+        """
+        [(id, score)] of the best postings for `skill_ids`, best first
+        """
+        if not skill_ids or not self.skill_weight:
+            return self.generic
+        matches = Counter()
+        for skill_id in skill_ids:
+            matches.update(self.by_skill.get(skill_id, ()))
+        boost = self.skill_weight / len(skill_ids)
+        scored = ((pk, self.base[pk] + boost * count) for pk, count in matches.items())
+        unmatched = (item for item in self.generic if item[0] not in matches)
+        return heapq.nlargest(self.size, chain(scored, unmatched), key=itemgetter(1))
+
+
+# scorer of the worker process, see `init_worker`
+scorer = None
+
+
+def init_worker(postings, weights, now, size):
+    global scorer
+    scorer = FeedScorer(postings, weights, now, size)
+
+
+def compute_feeds(job_seekers, feed_scorer=None):
+    """
+    [(job seeker id, feed)] of (job seeker id, skill ids) pairs, without
+    database access so it runs in worker processes (with their `scorer`)
+    """
+    feed_scorer = feed_scorer or scorer
+    return [(pk, feed_scorer.feed(skill_ids)) for pk, skill_ids in job_seekers]
+
+
+def pack_feed(feed):
+    """
+    (ids, scores) of a feed as packed arrays, 4 bytes per value
+    """
+    return (
+        array.array("I", [pk for pk, _ in feed]).tobytes(),
+        array.array("f", [score for _, score in feed]).tobytes(),
+    )
+
+
+def unpack_feed(feed):
+    """
+    [(id, score)] of a RecommendationFeed, best first
+    """
+    job_posting_ids, scores = array.array("I"), array.array("f")
+    job_posting_ids.frombytes(bytes(feed.job_posting_ids))
+    scores.frombytes(bytes(feed.scores))
+    return list(zip(job_posting_ids, scores))
+
+
+def store_feeds(feeds, postings, computed_at, is_stale=False):
+    """
+    upsert the feeds [(job seeker id, feed)] computed from the state at
+    `computed_at`, feeds marked stale since then stay stale
+    """
+    rows = []
+    for pk, feed in feeds:
+        job_posting_ids, scores = pack_feed(feed)
+        rows.append(
+            RecommendationFeed(
+                job_seeker_id=pk,
+                job_posting_ids=job_posting_ids,
+                scores=scores,
+                expires_on=min(
+                    (postings[job_posting_id][2] for job_posting_id, _ in feed),
+                    default=None,
+                ),
+                is_stale=is_stale,
+                computed_at=computed_at,
+            )
+        )
+    RecommendationFeed.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["job_seeker"],
+        update_fields=[
+            "job_posting_ids",
+            "scores",
+            "expires_on",
+            "is_stale",
+            "computed_at",
+        ],
+    )
+    if not is_stale:
+        # skills changed while the feeds were computed, the upsert locked the
+        # rows so later changes wait for it and mark them stale themselves
+        RecommendationFeed.objects.filter(
+            job_seeker_id__in=[pk for pk, _ in feeds], stale_since__gt=computed_at
+        ).update(is_stale=True)
+
+
+def stale_job_seekers(computed_before=None):
+    """
+    job seekers without a feed, with a stale one or one holding an expired
+    posting, and with one computed before `computed_before` when given
+    """
+    stale = (
+        Q(recommendation_feed__isnull=True)
+        | Q(recommendation_feed__is_stale=True)
+        | Q(recommendation_feed__expires_on__lt=timezone.localdate())
+    )
+    if computed_before is not None:
+        stale |= Q(recommendation_feed__computed_at__lt=computed_before)
+    return JobSeeker.objects.filter(stale)
+
+
+def refresh_feeds(job_seeker_ids, workers=1, batch_size=FEED_BATCH_SIZE):
+    """
+    compute and store the feeds of `job_seeker_ids`, `workers` processes
+    score one batch each at a time. returns the number of feeds stored
+    """
+    job_seeker_ids = sorted(job_seeker_ids)
+    if not job_seeker_ids:
+        return 0
+    now = timezone.now()
+    postings = posting_table(feed_postings())
+    initargs = (postings, ranking_weights(), now, feed_size())
+    pool = local_scorer = None
+    if workers > 1 and len(job_seeker_ids) > batch_size:
+        # forked workers must not share the parent's database connections
+        connections.close_all()
+        pool = Pool(workers, initializer=init_worker, initargs=initargs)
+    else:
+        # not the module scorer, task worker threads may refresh at once
+        local_scorer = FeedScorer(*initargs)
+
+    stored = 0
+    ids = iter(job_seeker_ids)
+    try:
+        while chunk := list(islice(ids, batch_size * max(workers, 1))):
+            skills = defaultdict(list)
+            for job_seeker_id, skill_id in JobSeeker.skills.through.objects.filter(
+                jobseeker_id__in=chunk
+            ).values_list("jobseeker_id", "skill_id"):
+                skills[job_seeker_id].append(skill_id)
+            batches = [
+                [(pk, skills[pk]) for pk in chunk[start : start + batch_size]]
+                for start in range(0, len(chunk), batch_size)
+            ]
+            results = (
+                pool.map(compute_feeds, batches)
+                if pool
+                else (compute_feeds(batch, local_scorer) for batch in batches)
+            )
+            with transaction.atomic():
+                for feeds in results:
+                    store_feeds(feeds, postings, now)
+                    stored += len(feeds)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    return stored
+
+
+def provisional_feed(job_seeker, candidates=PROVISIONAL_CANDIDATES):
+    """
+    store a feed of the best of the newest `candidates` postings asking for
+    the job seeker's skills and the newest `candidates` overall, scored as
+    full feeds are. it is stored stale, so the next refresh replaces it
+    """
+    now = timezone.now()
+    skill_ids = list(
+        JobSeeker.skills.through.objects.filter(
+            jobseeker_id=job_seeker.pk
+        ).values_list("skill_id", flat=True)
+    )
+    newest = feed_postings().order_by("-created_at")
+    candidate_ids = set(newest.values_list("pk", flat=True)[:candidates])
+    if skill_ids:
+        candidate_ids.update(
+            newest.filter(skills__in=skill_ids).values_list("pk", flat=True)[
+                :candidates
+            ]
+        )
+    postings = posting_table(JobPosting.objects.filter(pk__in=candidate_ids))
+    feed_scorer = FeedScorer(postings, ranking_weights(), now, feed_size())
+    store_feeds(
+        [(job_seeker.pk, feed_scorer.feed(skill_ids))], postings, now, is_stale=True
+    )
+
+
+def job_seeker_feed(job_seeker):
+    """
+    the feed of a job seeker. without one a provisional feed is stored and a
+    refresh of the missing and stale feeds is queued, a full feed scores
+    every current posting and is left to the batch
+    """
+    from .tasks import queue_recommendation_feeds_refresh
+
+    feed = RecommendationFeed.objects.filter(job_seeker=job_seeker).first()
+    if feed is None:
+        provisional_feed(job_seeker)
+        queue_recommendation_feeds_refresh()
+        feed = RecommendationFeed.objects.get(job_seeker=job_seeker)
+    return feed
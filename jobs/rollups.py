@@ -0,0 +1,188 @@
+"""
+daily application rollups
+
+ApplicationDailyRollup holds the number of applications per (day they were
+made, company, job posting, current status). a status change moves counts
+between rows of the same (day, job posting) group, so groups are always
+rewritten whole from the applications table:
+
+    update_application_rollups: groups of applications changed since the
+        watermark (`updated_at`), run periodically
+    rewrite_rollups: whole days, used by manage.py backfill_application_rollups
+    refresh_rollups: given groups in the caller's transaction, used by bulk
+        status changes so stats follow them at once
+
+rewrites of groups lock the rows of their job postings first, so rewrites of
+the same job posting wait for each other and others run side by side.
+
+dashboards (ApplicationStatsAPIView) sum a few hundred rollup rows instead of
+scanning applications.
+"""
+
+import datetime
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .choices import APPLICATION_STATUS_CHOICES
+from .models import Application, ApplicationDailyRollup, JobPosting, RollupWatermark
+
+APPLICATION_ROLLUP = "application_daily"
+# `updated_at` is taken before the writing transaction commits, the watermark
+# stays this far behind now so slow transactions are not skipped
+ROLLUP_LAG = datetime.timedelta(minutes=5)
+# job postings per rewrite statement
+ROLLUP_BATCH_SIZE = 1000
+
+STATS_DIMENSIONS = ("day", "company", "job_posting")
+
+
+def day_range(day):
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    return start, start + datetime.timedelta(days=1)
+
+
+def rewrite_rollups(day, job_posting_ids=None):
+    """
+    replace rollups of `day` (of `job_posting_ids` only, when given) with the
+    counts of current applications, returns the number of rows written
+    """
+    start, end = day_range(day)
+    applications = Application.objects.filter(
+        application_date__gte=start, application_date__lt=end
+    )
+    stale = ApplicationDailyRollup.objects.filter(day=day)
+    if job_posting_ids is not None:
+        applications = applications.filter(job_posting_id__in=job_posting_ids)
+        stale = stale.filter(job_posting_id__in=job_posting_ids)
+
+    rows = [
+        ApplicationDailyRollup(
+            day=day,
+            company_id=row["job_posting__company_id"],
+            job_posting_id=row["job_posting_id"],
+            status=row["status"],
+            count=row["count"],
+        )
+        for row in applications.values(
+            "job_posting_id", "job_posting__company_id", "status"
+        )
+        .annotate(count=Count("id"))
+        .order_by()
+    ]
+    stale.delete()
+    ApplicationDailyRollup.objects.bulk_create(rows, batch_size=ROLLUP_BATCH_SIZE)
+    return len(rows)
+
+
+def changed_groups(since, until):
+    """
+    {day: {job posting ids}} of applications (removed ones included) changed
+    after `since` (from the start when None) up to `until`
+    """
+    changed = Application.objects.everything().filter(updated_at__lte=until)
+    if since is not None:
+        changed = changed.filter(updated_at__gt=since)
+    return application_groups(changed)
+
+
+def application_groups(applications):
+    """
+    {day: {job posting ids}} of the rollup groups of `applications`
+    """
+    groups = defaultdict(set)
+    for day, job_posting_id in (
+        applications.annotate(day=TruncDate("application_date"))
+        .values_list("day", "job_posting_id")
+        .distinct()
+    ):
+        groups[day].add(job_posting_id)
+    return groups
+
+
+def lock_job_postings(job_posting_ids, batch_size=ROLLUP_BATCH_SIZE):
+    """
+    lock job posting rows in id order, concurrent rewrites of overlapping
+    groups wait for each other instead of deadlocking
+    """
+    job_posting_ids = sorted(job_posting_ids)
+    for start in range(0, len(job_posting_ids), batch_size):
+        list(
+            JobPosting.objects.everything()
+            .select_for_update()
+            .filter(pk__in=job_posting_ids[start : start + batch_size])
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+
+def rewrite_groups(groups, batch_size=ROLLUP_BATCH_SIZE):
+    """
+    rewrite rollup groups {day: {job posting ids}}, in a transaction
+    """
+    lock_job_postings(set().union(*groups.values()), batch_size)
+    for day, job_posting_ids in sorted(groups.items()):
+        job_posting_ids = sorted(job_posting_ids)
+        for start in range(0, len(job_posting_ids), batch_size):
+            rewrite_rollups(day, job_posting_ids[start : start + batch_size])
+
+
+def update_application_rollups(now=None, batch_size=ROLLUP_BATCH_SIZE):
+    """
+    rewrite the rollup groups of applications changed since the watermark
+    and move it to `now` - ROLLUP_LAG, returns the number of (day, job
+    posting) groups rewritten. the first run covers every application.
+    concurrent runs wait for each other on the watermark row, bulk status
+    changes (refresh_rollups) do not take it
+    """
+    until = (now or timezone.now()) - ROLLUP_LAG
+    with transaction.atomic():
+        watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(
+            name=APPLICATION_ROLLUP
+        )
+        if watermark.value is not None and watermark.value >= until:
+            return 0
+        groups = changed_groups(watermark.value, until)
+        rewrite_groups(groups, batch_size)
+        watermark.value = until
+        watermark.save(update_fields=["value"])
+    return sum(len(job_posting_ids) for job_posting_ids in groups.values())
+
+
+def refresh_rollups(groups, batch_size=ROLLUP_BATCH_SIZE):
+    """
+    rewrite rollup groups {day: {job posting ids}} in the current transaction,
+    only waiting for rewrites of the same job postings
+    """
+    rewrite_groups(groups, batch_size)
+
+
+def application_stats(rollups, group_by):
+    """
+    rows of summed `rollups` per value of the `group_by` dimensions (of
+    STATS_DIMENSIONS), with counts per status, total and conversion: the
+    share of the applications that are accepted now
+    """
+    stats = {}
+    for row in (
+        rollups.values(*group_by, "status")
+        .annotate(count=Sum("count"))
+        .order_by(*group_by)
+    ):
+        key = tuple(row[dimension] for dimension in group_by)
+        if key not in stats:
+            stats[key] = {
+                **{dimension: row[dimension] for dimension in group_by},
+                "statuses": {status: 0 for status, _ in APPLICATION_STATUS_CHOICES},
+                "total": 0,
+            }
+        stats[key]["statuses"][row["status"]] = row["count"]
+        stats[key]["total"] += row["count"]
+    for row in stats.values():
+        row["conversion"] = (
+            round(row["statuses"]["Accepted"] / row["total"], 4) if row["total"] else 0
+        )
+    return list(stats.values())
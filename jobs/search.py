@@ -0,0 +1,95 @@
+"""
+job posting search on elasticsearch
+
+elasticsearch returns the ids of one page, the rows are loaded from the
+database in hit order. the in-memory backend has no query dsl, searches then
+run on the database (jobs.filters) as they do when elasticsearch fails.
+"""
+
+from shared_features.utils.elasticsearch_utils import (
+    SearchResults,
+    elasticsearch_search_enabled,
+)
+from shared_features.utils.geocoding import geocode_city
+
+from .elastic_index_keys import job_posting_index_keys
+from .filters import search_radius_km
+from .ranking import ranked_query
+
+
+def salary_range_clause(minimum=None, maximum=None):
+    """
+    postings whose `salary_range` intersects [minimum, maximum], a missing
+    bound is open. documents without salary have no `salary_range` and never
+    match, as in the database filter
+    """
+    bounds = {}
+    if minimum is not None:
+        bounds["gte"] = minimum
+    if maximum is not None:
+        bounds["lte"] = maximum
+    return {"range": {"salary_range": {**bounds, "relation": "intersects"}}}
+
+
+def job_posting_filters(params, include_expired=False):
+    """
+    filter clauses of validated search parameters (cleaned data of
+    JobPostingSearchFilter), expired postings are left out unless
+    `include_expired`, near-duplicates unless `include_duplicates` is given
+    """
+    filters = []
+    if not include_expired:
+        filters.append({"range": {"expiry_date": {"gte": "now/d"}}})
+    if not params.get("include_duplicates"):
+        filters.append({"bool": {"must_not": {"exists": {"field": "duplicate_of"}}}})
+    if params.get("salary_min") is not None or params.get("salary_max") is not None:
+        filters.append(
+            salary_range_clause(params.get("salary_min"), params.get("salary_max"))
+        )
+    if params.get("city"):
+        filters.append({"term": {"location_city": geocode_city(params["city"]).city}})
+    if params.get("lat") is not None:
+        filters.append(
+            {
+                "geo_distance": {
+                    "distance": f"{search_radius_km(params)}km",
+                    "location": {"lat": params["lat"], "lon": params["lon"]},
+                }
+            }
+        )
+    return filters
+
+
+def job_posting_search_body(params, skill_ids=None, weights=None):
+    """
+    search request body of validated search parameters, without `from` /
+    `size`. searches with words or a job seeker's skills are ranked by
+    relevance (jobs.ranking), the others list newest or nearest first
+    """
+    filters = job_posting_filters(params)
+    if params.get("lat") is not None:
+        # nearest first, as the database filter
+        point = {"lat": params["lat"], "lon": params["lon"]}
+        sort = [
+            {"_geo_distance": {"location": point, "order": "asc", "unit": "km"}},
+            {"id": "desc"},
+        ]
+    else:
+        sort = [{"created_at": "desc"}, {"id": "desc"}]
+
+    if params.get("q") or skill_ids:
+        query = ranked_query(params.get("q"), filters, skill_ids, weights)
+        sort.insert(0, "_score")
+    else:
+        query = {"bool": {"filter": filters}}
+    return {"query": query, "sort": sort}
+
+
+class JobPostingSearchResults(SearchResults):
+    """
+    job postings matching a search body, removed or expired postings still
+    in the index are left out by `queryset`
+    """
+
+    def __init__(self, body, queryset, index_name=job_posting_index_keys):
+        super().__init__(body, queryset, index_name)
@@ -0,0 +1,446 @@
+import datetime
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Prefetch
+from django.utils import timezone
+
+from rest_framework import serializers
+
+from accounts.models import IndustryArea
+from shared_features.models import Skill
+from shared_features.reference_data import industry_areas, skills
+from shared_features.serializers import (
+    MeasuredRepresentationMixin,
+    ReferenceNameField,
+    ReferencePrimaryKeyField,
+    SkillsWriteSerializerMixin,
+)
+from shared_features.utils.m2m import set_m2m
+
+from .choices import APPLICATION_STATUS_CHOICES, APPLICATION_STATUS_TRANSITIONS
+from .filters import JobPostingSearchFilter
+from .models import Application, JobPosting, SavedSearch
+from .rollups import STATS_DIMENSIONS, application_groups, refresh_rollups
+from .tasks import queue_application_rollups_update
+
+BATCH_APPLY_MAX_SIZE = 100
+APPLICATION_STATUS_BATCH_MAX_SIZE = 500
+JOB_POSTING_MAX_INDUSTRY_AREAS = 20
+MAX_SAVED_SEARCHES = 20
+APPLICATION_STATS_DEFAULT_DAYS = 30
+APPLICATION_STATS_MAX_DAYS = 366
+
+
+def job_posting_prefetches():
+    """
+    prefetch lookups of JobPostingSerializer, only the ids of skills and
+    industry areas are loaded, their names come from the reference data
+    caches
+    """
+    return (
+        Prefetch("skills", queryset=Skill.objects.only("pk")),
+        Prefetch("industry_areas", queryset=IndustryArea.objects.only("pk")),
+    )
+
+
+class JobPostingSerializer(MeasuredRepresentationMixin, serializers.ModelSerializer):
+    """
+    read serializer for job posting list and detail routes, prefetch
+    `job_posting_prefetches()`
+
+    fields:
+        company_name: name of company that posted the job
+        skills: names of skills required for the job
+        industry_areas: names of industry areas of the job
+        active_photo: url of current active photo of job posting
+        location_city / latitude / longitude: location of the company's
+            active address, coordinates are null for unknown cities
+        duplicate_of: id of the posting shown in searches for this
+            near-duplicate, null for postings that are shown
+    """
+
+    company_name = serializers.CharField(source="company.name", read_only=True)
+    skills = serializers.ListField(
+        child=ReferenceNameField(skills), source="skills.all", read_only=True
+    )
+    industry_areas = serializers.ListField(
+        child=ReferenceNameField(industry_areas),
+        source="industry_areas.all",
+        read_only=True,
+    )
+    active_photo = serializers.ImageField(
+        source="active_photo.file_path", read_only=True, default=None
+    )
+
+    class Meta:
+        model = JobPosting
+        fields = (
+            "id",
+            "title",
+            "description",
+            "expiry_date",
+            "salary_range_start",
+            "salary_range_end",
+            "working_hours",
+            "location_city",
+            "latitude",
+            "longitude",
+            "company",
+            "company_name",
+            "skills",
+            "industry_areas",
+            "active_photo",
+            "duplicate_of",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = fields
+
+
+class JobPostingWriteSerializer(
+    MeasuredRepresentationMixin, SkillsWriteSerializerMixin, serializers.ModelSerializer
+):
+    """
+    create and edit serializer of job postings of the employer's company
+
+    fields:
+        skill_ids / skill_names: see SkillsWriteSerializerMixin
+        industry_area_ids: ids of industry areas
+
+    relations left out of a partial update are kept, given ones are replaced
+    with one bulk insert and one delete (shared_features.utils.m2m).
+    """
+
+    industry_area_ids = serializers.ListField(
+        child=ReferencePrimaryKeyField(industry_areas),
+        required=False,
+        write_only=True,
+        max_length=JOB_POSTING_MAX_INDUSTRY_AREAS,
+    )
+
+    class Meta:
+        model = JobPosting
+        fields = (
+            "title",
+            "description",
+            "expiry_date",
+            "salary_range_start",
+            "salary_range_end",
+            "working_hours",
+            "skill_ids",
+            "skill_names",
+            "industry_area_ids",
+        )
+
+    def validate(self, attrs):
+        salary_range_start = attrs.get(
+            "salary_range_start", getattr(self.instance, "salary_range_start", None)
+        )
+        salary_range_end = attrs.get(
+            "salary_range_end", getattr(self.instance, "salary_range_end", None)
+        )
+        if (
+            salary_range_start is not None
+            and salary_range_end is not None
+            and salary_range_start > salary_range_end
+        ):
+            raise serializers.ValidationError(
+                {"salary_range_end": "Must be greater than salary_range_start."}
+            )
+        return attrs
+
+    def pop_relations(self, validated_data):
+        relations = {}
+        skill_ids = self.pop_skill_ids(validated_data)
+        if skill_ids is not None:
+            relations["skills"] = skill_ids
+        if "industry_area_ids" in validated_data:
+            relations["industry_areas"] = set(validated_data.pop("industry_area_ids"))
+        return relations
+
+    def save_relations(self, instance, relations):
+        for field_name, target_ids in relations.items():
+            set_m2m(instance, field_name, target_ids)
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            relations = self.pop_relations(validated_data)
+            instance = JobPosting.objects.create(
+                company=self.context["company"], **validated_data
+            )
+            self.save_relations(instance, relations)
+        return instance
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            relations = self.pop_relations(validated_data)
+            instance = super().update(instance, validated_data)
+            self.save_relations(instance, relations)
+        return instance
+
+    def to_representation(self, instance):
+        instance = (
+            JobPosting.objects.select_related("company", "active_photo")
+            .prefetch_related(*job_posting_prefetches())
+            .get(pk=instance.pk)
+        )
+        return JobPostingSerializer(instance, context=self.context).data
+
+
+class BatchApplySerializer(serializers.Serializer):
+    """
+    apply a job seeker to many job postings at once
+
+    fields:
+        job_posting_ids: ids of job postings to apply to (max 100)
+
+    results are reported per job posting id in request order with status:
+        created: application is created by this request
+        already_applied: job seeker already applied (safe to retry)
+        expired: job posting is expired
+        not_found: job posting does not exist or is removed
+    """
+
+    job_posting_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BATCH_APPLY_MAX_SIZE,
+    )
+
+    def create(self, validated_data):
+        job_seeker = self.context["job_seeker"]
+        job_posting_ids = list(dict.fromkeys(validated_data["job_posting_ids"]))
+        today = timezone.localdate()
+
+        # validate every job posting in one query
+        postings = (
+            JobPosting.objects.filter(pk__in=job_posting_ids)
+            .annotate(
+                already_applied=Exists(
+                    Application.objects.filter(
+                        job_posting=OuterRef("pk"), job_seeker=job_seeker
+                    )
+                )
+            )
+            .values_list("pk", "expiry_date", "already_applied")
+        )
+        statuses = dict.fromkeys(job_posting_ids, "not_found")
+        for pk, expiry_date, already_applied in postings:
+            if already_applied:
+                statuses[pk] = "already_applied"
+            elif expiry_date < today:
+                statuses[pk] = "expired"
+            else:
+                statuses[pk] = "created"
+
+        to_create = [pk for pk, status in statuses.items() if status == "created"]
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    Application.objects.bulk_create(
+                        [
+                            Application(job_seeker=job_seeker, job_posting_id=pk)
+                            for pk in to_create
+                        ]
+                    )
+            except IntegrityError:
+                # a concurrent retry of the batch applied to some of them
+                # first, insert one by one to tell which this request created
+                for pk in to_create:
+                    try:
+                        with transaction.atomic():
+                            Application.objects.bulk_create(
+                                [Application(job_seeker=job_seeker, job_posting_id=pk)]
+                            )
+                    except IntegrityError:
+                        statuses[pk] = "already_applied"
+            if "created" in statuses.values():
+                queue_application_rollups_update()
+
+        application_ids = dict(
+            Application.objects.filter(
+                job_seeker=job_seeker, job_posting_id__in=job_posting_ids
+            ).values_list("job_posting_id", "id")
+        )
+        return [
+            {
+                "job_posting": pk,
+                "status": status,
+                "application": application_ids.get(pk),
+            }
+            for pk, status in statuses.items()
+        ]
+
+
+class ApplicationStatusChangeSerializer(serializers.Serializer):
+    application = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(APPLICATION_STATUS_CHOICES)
+
+
+class ApplicationStatusBatchSerializer(serializers.Serializer):
+    """
+    change the status of many applications to job postings of the employer's
+    company at once, as APPLICATION_STATUS_TRANSITIONS allows
+
+    fields:
+        changes: new `status` per `application` id (max 500), each
+            application once
+
+    results are reported per application in request order with result:
+        updated: status is changed by this request
+        unchanged: application already has the status (safe to retry)
+        invalid_transition: current status cannot change to the new one
+        not_found: application does not exist, is removed or is not to a job
+            posting of the company
+    """
+
+    changes = serializers.ListField(
+        child=ApplicationStatusChangeSerializer(),
+        allow_empty=False,
+        max_length=APPLICATION_STATUS_BATCH_MAX_SIZE,
+    )
+
+    def validate_changes(self, changes):
+        application_ids = [change["application"] for change in changes]
+        if len(set(application_ids)) != len(application_ids):
+            raise serializers.ValidationError("Each application may appear once.")
+        return changes
+
+    def create(self, validated_data):
+        company_id = self.context["company_id"]
+        targets = {
+            change["application"]: change["status"]
+            for change in validated_data["changes"]
+        }
+        applications = Application.objects.filter(pk__in=targets)
+        if company_id is not None:
+            applications = applications.filter(job_posting__company_id=company_id)
+
+        with transaction.atomic():
+            current = dict(applications.values_list("pk", "status"))
+            by_target = defaultdict(list)
+            for pk, target in targets.items():
+                if pk in current and current[pk] != target:
+                    by_target[target].append(pk)
+            now = timezone.now()
+            for target, pks in by_target.items():
+                # one conditional update per new status, applications changed
+                # by a concurrent request since they were read are left alone
+                Application.objects.filter(
+                    pk__in=pks,
+                    status__in=[
+                        status
+                        for status, allowed in APPLICATION_STATUS_TRANSITIONS.items()
+                        if target in allowed
+                    ],
+                ).update(status=target, updated_at=now)
+            changed = dict(
+                Application.objects.filter(
+                    pk__in=[pk for pks in by_target.values() for pk in pks]
+                ).values_list("pk", "status")
+            )
+            updated = [pk for pk, status in changed.items() if status == targets[pk]]
+            if updated:
+                # daily rollups are the per job posting counts of stats
+                refresh_rollups(
+                    application_groups(Application.objects.filter(pk__in=updated))
+                )
+
+        results = []
+        for pk, target in targets.items():
+            if pk not in current:
+                result = "not_found"
+            elif current[pk] == target:
+                result = "unchanged"
+            elif changed.get(pk) == target:
+                result = "updated"
+            else:
+                result = "invalid_transition"
+            results.append(
+                {
+                    "application": pk,
+                    "result": result,
+                    "status": changed.get(pk, current.get(pk)),
+                }
+            )
+        return results
+
+
+class SavedSearchSerializer(MeasuredRepresentationMixin, serializers.ModelSerializer):
+    """
+    saved search of the requesting job seeker
+
+    fields:
+        params: parameters of the search route (q, salary_min, salary_max,
+            city, lat, lon, radius_km), validated as the route does, at
+            least one is required
+        is_active: alerts are sent for active searches only
+    """
+
+    params = serializers.DictField()
+
+    class Meta:
+        model = SavedSearch
+        fields = ("id", "name", "params", "is_active", "created_at", "updated_at")
+        read_only_fields = ("id", "created_at", "updated_at")
+
+    def validate_params(self, value):
+        filterset = JobPostingSearchFilter(value, queryset=JobPosting.objects.none())
+        if not filterset.is_valid():
+            raise serializers.ValidationError(filterset.errors)
+        params = {
+            name: param
+            for name, param in filterset.form.cleaned_data.items()
+            if param not in (None, "")
+        }
+        if not params:
+            raise serializers.ValidationError("At least one search parameter.")
+        return params
+
+    def validate(self, attrs):
+        if self.instance is None and (
+            SavedSearch.objects.filter(job_seeker=self.context["job_seeker"]).count()
+            >= MAX_SAVED_SEARCHES
+        ):
+            raise serializers.ValidationError(
+                f"At most {MAX_SAVED_SEARCHES} saved searches."
+            )
+        return attrs
+
+
+class ApplicationStatsSerializer(serializers.Serializer):
+    """
+    query parameters of the application stats route
+
+    fields:
+        date_from / date_to: days the applications were made, inclusive,
+            the last APPLICATION_STATS_DEFAULT_DAYS days by default
+        group_by: dimensions of the rows (day, company, job_posting),
+            repeatable, `day` by default
+        job_posting: only applications to this job posting
+    """
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    group_by = serializers.ListField(
+        child=serializers.ChoiceField(STATS_DIMENSIONS), required=False
+    )
+    job_posting = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        date_to = attrs.setdefault("date_to", timezone.localdate())
+        date_from = attrs.setdefault(
+            "date_from",
+            date_to - datetime.timedelta(days=APPLICATION_STATS_DEFAULT_DAYS - 1),
+        )
+        if date_from > date_to:
+            raise serializers.ValidationError(
+                {"date_to": "Must be on or after date_from."}
+            )
+        if (date_to - date_from).days >= APPLICATION_STATS_MAX_DAYS:
+            raise serializers.ValidationError(
+                {"date_from": f"At most {APPLICATION_STATS_MAX_DAYS} days."}
+            )
+        attrs["group_by"] = list(dict.fromkeys(attrs.get("group_by") or ["day"]))
+        return attrs
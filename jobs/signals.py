@@ -0,0 +1,258 @@
+import threading
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import Address, Company, JobSeeker
+from shared_features.signals import m2m_bulk_changed, skills_merged
+
+from .alerts import index_saved_search
+from .cache_keys import job_posting_detail_cache_key
+from .dedup import detect_duplicates
+from .locations import location_fields, stale_job_postings
+from .models import JobPosting, JobPostingPhoto, RecommendationFeed, SavedSearch
+from .tasks import queue_job_postings_index, queue_recommendation_feeds_refresh
+
+# reindex task of job postings changed by the current transaction
+pending_index = threading.local()
+
+
+@receiver(post_save, sender=JobPosting)
+@receiver(post_delete, sender=JobPosting)
+def invalidate_job_posting_detail_cache(sender, instance, **kwargs):
+    """
+    drop cached detail payload of the job posting after it changes
+    """
+    cache.delete(job_posting_detail_cache_key.format(pk=instance.pk))
+
+
+@receiver(post_save, sender=JobPosting)
+def reindex_saved_job_posting(sender, instance, raw=False, **kwargs):
+    """
+    saved job postings are reindexed (and percolated against saved searches)
+    with the other changes of the transaction
+    """
+    if not raw:
+        queue_index([instance.pk])
+
+
+@receiver(post_save, sender=JobPosting)
+def group_duplicate_job_posting(sender, instance, raw=False, **kwargs):
+    """
+    a saved job posting joins the group of a near-duplicate current posting,
+    and leaves its group when its text changes or it is removed
+    """
+    if not raw:
+        detect_duplicates(instance, apply_duplicate_changes)
+
+
+def apply_duplicate_changes(changes):
+    by_duplicate_of = defaultdict(list)
+    for pk, duplicate_of_id in changes.items():
+        by_duplicate_of[duplicate_of_id].append(pk)
+    for duplicate_of_id, pks in by_duplicate_of.items():
+        job_postings_changed(pks, duplicate_of_id=duplicate_of_id)
+
+
+@receiver(post_save, sender=JobPostingPhoto)
+@receiver(post_delete, sender=JobPostingPhoto)
+def invalidate_job_posting_photo_cache(sender, instance, **kwargs):
+    """
+    photo changes are part of the job posting payload, so move `updated_at`
+    of the job posting (ETag and Last-Modified) and drop its cached payload
+    """
+    JobPosting.objects.everything().filter(pk=instance.job_posting_id).update(
+        updated_at=timezone.now()
+    )
+    cache.delete(job_posting_detail_cache_key.format(pk=instance.job_posting_id))
+
+
+@receiver(m2m_changed, sender=JobPosting.skills.through)
+@receiver(m2m_changed, sender=JobPosting.industry_areas.through)
+def refresh_changed_job_posting_relations(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    skills and industry areas are rendered and indexed by name, so treat
+    changing them (admin, shell) as an edit of the job posting. clearing
+    the job postings of a skill or industry area lists them beforehand, the
+    signal after it has no ids
+    """
+    if reverse and action == "pre_clear":
+        relation = next(
+            field.name
+            for field in JobPosting._meta.many_to_many
+            if field.remote_field.through is sender
+        )
+        instance.cleared_job_posting_ids = list(
+            JobPosting.objects.everything()
+            .filter(**{relation: instance})
+            .values_list("pk", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        pks = [instance.pk] if action == "post_clear" or pk_set else []
+    elif action == "post_clear":
+        pks = instance.__dict__.pop("cleared_job_posting_ids", [])
+    else:
+        pks = pk_set
+    if pks:
+        job_postings_changed(pks)
+
+
+@receiver(skills_merged)
+def refresh_merged_skills_job_postings(sender, changed, **kwargs):
+    """
+    job postings whose duplicate skills were merged render and index other
+    skill names and ids
+    """
+    pks = changed.get(JobPosting)
+    if pks:
+        job_postings_changed(pks)
+
+
+def job_postings_changed(pks, **fields):
+    """
+    write `fields` and a new `updated_at` to job postings `pks`, drop their
+    cached payloads and queue their reindexing, one task shared by every
+    change of the transaction
+    """
+    pks = list(pks)
+    JobPosting.objects.everything().filter(pk__in=pks).update(
+        updated_at=timezone.now(), **fields
+    )
+    cache.delete_many([job_posting_detail_cache_key.format(pk=pk) for pk in pks])
+    queue_index(pks)
+
+
+def queue_index(pks):
+    queue_job_postings_index(pks, pending_index)
+
+
+@receiver(m2m_bulk_changed, sender=JobPosting.skills.through)
+@receiver(m2m_bulk_changed, sender=JobPosting.industry_areas.through)
+def refresh_job_posting_relations(sender, pks, **kwargs):
+    """
+    one notification for every job posting of a bulk skill or industry area
+    write
+    """
+    job_postings_changed(pks)
+
+
+@receiver(post_save, sender=Company)
+def refresh_company_job_posting_locations(sender, instance, raw=False, **kwargs):
+    """
+    job postings carry the location of their company's active address
+    """
+    if not raw:
+        relocate_company_job_postings([instance.pk])
+
+
+@receiver(pre_save, sender=Company)
+def remember_company_name(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    keep the stored name of an edited company, to tell renames apart
+    """
+    instance.previous_name = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and "name" not in update_fields:
+        return
+    instance.previous_name = (
+        Company.objects.filter(pk=instance.pk).values_list("name", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Company)
+def refresh_renamed_company_job_postings(sender, instance, raw=False, **kwargs):
+    """
+    job postings render the name of their company, so renaming it is an edit
+    of all of them (ETag, cached payloads and indexed company_name)
+    """
+    previous_name = getattr(instance, "previous_name", None)
+    if raw or previous_name is None or previous_name == instance.name:
+        return
+    pks = list(
+        JobPosting.objects.everything()
+        .filter(company=instance)
+        .values_list("pk", flat=True)
+    )
+    if pks:
+        job_postings_changed(pks)
+
+
+@receiver(post_save, sender=Address)
+def refresh_address_job_posting_locations(sender, instance, raw=False, **kwargs):
+    """
+    an edited address moves the job postings of companies using it
+    """
+    if raw:
+        return
+    company_ids = list(
+        Company.objects.filter(active_address=instance).values_list("pk", flat=True)
+    )
+    if company_ids:
+        relocate_company_job_postings(company_ids)
+
+
+def relocate_company_job_postings(company_ids):
+    for queryset, location in stale_job_postings(JobPosting, Company, company_ids):
+        pks = list(queryset.values_list("pk", flat=True))
+        if pks:
+            job_postings_changed(pks, **location_fields(location))
+
+
+@receiver(post_save, sender=SavedSearch)
+def reindex_saved_search(sender, instance, raw=False, **kwargs):
+    """
+    keep the percolator query of the saved search in sync, removing or
+    deactivating it drops the query
+    """
+    if not raw:
+        transaction.on_commit(lambda: index_saved_search(instance))
+
+
+def feeds_stale(pks):
+    # marked once the skills are committed, a refresh that read the previous
+    # skills was computed before `stale_since` and keeps the feed stale
+    pks = list(pks)
+
+    def mark_stale():
+        if RecommendationFeed.objects.filter(job_seeker_id__in=pks).update(
+            is_stale=True, stale_since=timezone.now()
+        ):
+            queue_recommendation_feeds_refresh()
+
+    transaction.on_commit(mark_stale)
+
+
+@receiver(m2m_changed, sender=JobSeeker.skills.through)
+def stale_skills_feed(sender, instance, action, **kwargs):
+    """
+    recommendation feeds are scored on the job seeker's skills, the next
+    refresh_recommendation_feeds run computes them again
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, JobSeeker):
+        feeds_stale([instance.pk])
+    elif kwargs["pk_set"]:
+        feeds_stale(kwargs["pk_set"])
+
+
+@receiver(m2m_bulk_changed, sender=JobSeeker.skills.through)
+def stale_bulk_skills_feeds(sender, pks, **kwargs):
+    feeds_stale(pks)
+
+
+@receiver(skills_merged)
+def stale_merged_skills_feeds(sender, changed, **kwargs):
+    pks = changed.get(JobSeeker)
+    if pks:
+        feeds_stale(pks)
@@ -0,0 +1,73 @@
+"""
+background tasks of jobs, run by manage.py run_workers (see
+shared_features.task_queue). each is queued with a dedup key, so bursts of
+changes queue one run, or once per transaction for the ids it changed
+"""
+
+import datetime
+
+from django.utils import timezone
+
+from shared_features.task_queue import enqueue, enqueue_in_transaction, task
+
+from .alerts import ALERT_BATCH_SIZE, queue_job_alerts, send_job_alerts
+from .documents import index_job_postings
+from .recommendations import refresh_feeds, stale_job_seekers
+from .rollups import ROLLUP_LAG, update_application_rollups
+
+# skill edits of a job seeker usually come in a row
+FEED_REFRESH_DELAY = datetime.timedelta(minutes=1)
+
+
+@task(name="jobs.index_job_postings")
+def index_job_postings_task(pks):
+    """
+    reindex job postings `pks` with one bulk request and percolate them
+    against saved searches
+    """
+    if queue_job_alerts(index_job_postings(pks)):
+        queue_job_alerts_sending()
+
+
+def queue_job_postings_index(pks, pending):
+    enqueue_in_transaction(index_job_postings_task, pks, pending)
+
+
+@task(name="jobs.send_job_alerts")
+def send_job_alerts_task(batch_size=ALERT_BATCH_SIZE):
+    """
+    send a batch of queued alerts, queued again while batches are full
+    """
+    if send_job_alerts(batch_size) == batch_size:
+        queue_job_alerts_sending()
+
+
+def queue_job_alerts_sending():
+    enqueue(send_job_alerts_task, dedup_key="jobs.send_job_alerts")
+
+
+@task(name="jobs.update_application_rollups")
+def update_application_rollups_task():
+    update_application_rollups()
+
+
+def queue_application_rollups_update():
+    # the update covers changes up to ROLLUP_LAG before it runs
+    enqueue(
+        update_application_rollups_task,
+        dedup_key="jobs.update_application_rollups",
+        run_at=timezone.now() + ROLLUP_LAG,
+    )
+
+
+@task(name="jobs.refresh_recommendation_feeds")
+def refresh_recommendation_feeds_task():
+    refresh_feeds(stale_job_seekers().values_list("pk", flat=True))
+
+
+def queue_recommendation_feeds_refresh():
+    enqueue(
+        refresh_recommendation_feeds_task,
+        dedup_key="jobs.refresh_recommendation_feeds",
+        run_at=timezone.now() + FEED_REFRESH_DELAY,
+    )
@@ -1,3 +1,554 @@
-from django.test import TestCase
+import datetime
+from unittest import mock
 
-# Create your tests here.
+from django.db.models import Sum, Value
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Company, IndustryArea, JobSeeker, User
+from shared_features.models import InMemoryElasticsearchService, Skill, Task
+
+from .documents import index_job_postings, salary_range_document
+from .elastic_index_keys import job_posting_index_keys
+from .filters import salary_overlap
+from .management.commands.benchmark_salary_search import naive_salary_overlap
+from .models import (
+    Application,
+    ApplicationDailyRollup,
+    JobPosting,
+    JobPostingPhoto,
+    RecommendationFeed,
+)
+from .recommendations import store_feeds
+from .search import salary_range_clause
+
+
+def create_company(email):
+    user = User.objects.create_user(email=email, password="x", usage_type="Employer")
+    company = Company.objects.create(
+        name=email, establishment_year=2000, phone_number="0", user=user
+    )
+    return user, company
+
+
+def create_job_posting(company, days=30, **fields):
+    fields.setdefault("title", "Backend developer")
+    fields.setdefault("description", "Django")
+    return JobPosting.objects.create(
+        expiry_date=timezone.localdate() + datetime.timedelta(days=days),
+        working_hours="full time",
+        company=company,
+        **fields,
+    )
+
+
+def create_application(job_posting, email, application_status="Pending"):
+    user = User.objects.create_user(email=email, password="x", usage_type="JobSeeker")
+    job_seeker = JobSeeker.objects.create(user=user)
+    return Application.objects.create(
+        job_seeker=job_seeker, job_posting=job_posting, status=application_status
+    )
+
+
+class BatchApplyTests(APITestCase):
+    url = reverse("v1_application_batch_apply")
+
+    @classmethod
+    def setUpTestData(cls):
+        _, company = create_company("employer@example.com")
+        cls.job_postings = [create_job_posting(company) for _ in range(3)]
+        cls.expired = create_job_posting(company, days=-1)
+        cls.removed = create_job_posting(company)
+        cls.removed.delete()
+        user = User.objects.create_user(
+            email="seeker@example.com", password="x", usage_type="JobSeeker"
+        )
+        cls.job_seeker = JobSeeker.objects.create(user=user)
+
+    def post(self, job_posting_ids):
+        self.client.force_authenticate(self.job_seeker.user)
+        return self.client.post(
+            self.url, {"job_posting_ids": job_posting_ids}, format="json"
+        )
+
+    def statuses(self, response):
+        return [result["status"] for result in response.data["results"]]
+
+    def test_results_per_job_posting_in_request_order(self):
+        first, second, _ = self.job_postings
+        missing = self.removed.pk + 100
+        response = self.post(
+            [second.pk, self.expired.pk, missing, self.removed.pk, first.pk, second.pk]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [result["job_posting"] for result in response.data["results"]],
+            [second.pk, self.expired.pk, missing, self.removed.pk, first.pk],
+        )
+        self.assertEqual(
+            self.statuses(response),
+            ["created", "expired", "not_found", "not_found", "created"],
+        )
+        applications = dict(
+            Application.objects.filter(job_seeker=self.job_seeker).values_list(
+                "job_posting_id", "pk"
+            )
+        )
+        self.assertEqual(
+            response.data["results"][0]["application"], applications[second.pk]
+        )
+        self.assertEqual(set(applications), {first.pk, second.pk})
+
+    def test_retry_reports_already_applied(self):
+        first, second, _ = self.job_postings
+        created = self.post([first.pk, second.pk])
+
+        response = self.post([first.pk, second.pk])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.statuses(response), ["already_applied"] * 2)
+        self.assertEqual(
+            [result["application"] for result in response.data["results"]],
+            [result["application"] for result in created.data["results"]],
+        )
+
+    def test_concurrent_insert_is_reported_as_already_applied(self):
+        first, second, third = self.job_postings
+        # applied by a concurrent request after this one validated the batch
+        concurrent = Application.objects.create(
+            job_seeker=self.job_seeker, job_posting=second
+        )
+        with mock.patch("jobs.serializers.Exists", return_value=Value(False)):
+            response = self.post([first.pk, second.pk, third.pk])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            self.statuses(response), ["created", "already_applied", "created"]
+        )
+        self.assertEqual(response.data["results"][1]["application"], concurrent.pk)
+        self.assertEqual(
+            Application.objects.filter(job_seeker=self.job_seeker).count(), 3
+        )
+
+    def test_employers_are_forbidden(self):
+        self.client.force_authenticate(User.objects.get(email="employer@example.com"))
+        response = self.client.post(
+            self.url, {"job_posting_ids": [self.job_postings[0].pk]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ApplicationStatusBatchUpdateTests(APITestCase):
+    url = reverse("v1_application_batch_status")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, company = create_company("employer@example.com")
+        job_posting = create_job_posting(company)
+        cls.pending = create_application(job_posting, "pending@example.com")
+        cls.other_pending = create_application(job_posting, "other@example.com")
+        cls.accepted = create_application(
+            job_posting, "accepted@example.com", "Accepted"
+        )
+        _, other_company = create_company("other-employer@example.com")
+        cls.foreign = create_application(
+            create_job_posting(other_company), "foreign@example.com"
+        )
+
+    def post(self, changes):
+        self.client.force_authenticate(self.employer)
+        return self.client.post(self.url, {"changes": changes}, format="json")
+
+    def test_results_per_application_in_request_order(self):
+        missing = self.foreign.pk + 100
+        response = self.post(
+            [
+                {"application": self.accepted.pk, "status": "Rejected"},
+                {"application": self.pending.pk, "status": "Accepted"},
+                {"application": missing, "status": "Accepted"},
+                {"application": self.other_pending.pk, "status": "Pending"},
+                {"application": self.foreign.pk, "status": "Rejected"},
+            ]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "application": self.accepted.pk,
+                    "result": "invalid_transition",
+                    "status": "Accepted",
+                },
+                {
+                    "application": self.pending.pk,
+                    "result": "updated",
+                    "status": "Accepted",
+                },
+                {"application": missing, "result": "not_found", "status": None},
+                {
+                    "application": self.other_pending.pk,
+                    "result": "unchanged",
+                    "status": "Pending",
+                },
+                {
+                    "application": self.foreign.pk,
+                    "result": "not_found",
+                    "status": None,
+                },
+            ],
+        )
+        statuses = dict(Application.objects.values_list("pk", "status"))
+        self.assertEqual(statuses[self.pending.pk], "Accepted")
+        self.assertEqual(statuses[self.accepted.pk], "Accepted")
+        self.assertEqual(statuses[self.foreign.pk], "Pending")
+
+    def test_retry_is_unchanged(self):
+        changes = [{"application": self.pending.pk, "status": "Rejected"}]
+        self.post(changes)
+        response = self.post(changes)
+
+        self.assertEqual(response.data["results"][0]["result"], "unchanged")
+
+    def test_final_statuses_do_not_change(self):
+        self.post([{"application": self.pending.pk, "status": "Rejected"}])
+        response = self.post([{"application": self.pending.pk, "status": "Accepted"}])
+
+        self.assertEqual(
+            response.data["results"][0],
+            {
+                "application": self.pending.pk,
+                "result": "invalid_transition",
+                "status": "Rejected",
+            },
+        )
+
+    def test_rollups_follow_the_changes(self):
+        self.post(
+            [
+                {"application": self.pending.pk, "status": "Accepted"},
+                {"application": self.other_pending.pk, "status": "Rejected"},
+            ]
+        )
+
+        counts = dict(
+            ApplicationDailyRollup.objects.filter(
+                job_posting=self.pending.job_posting
+            )
+            .values_list("status")
+            .annotate(total=Sum("count"))
+        )
+        self.assertEqual(counts, {"Accepted": 2, "Rejected": 1})
+
+    def test_repeated_application_is_rejected(self):
+        response = self.post(
+            [
+                {"application": self.pending.pk, "status": "Accepted"},
+                {"application": self.pending.pk, "status": "Rejected"},
+            ]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            Application.objects.get(pk=self.pending.pk).status, "Pending"
+        )
+
+    def test_job_seekers_are_forbidden(self):
+        self.client.force_authenticate(self.pending.job_seeker.user)
+        response = self.client.post(
+            self.url,
+            {"changes": [{"application": self.pending.pk, "status": "Accepted"}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class JobPostingIndexTests(APITestCase):
+    def setUp(self):
+        self.es_service = InMemoryElasticsearchService()
+        patcher = mock.patch("jobs.documents.es_service", self.es_service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_removed_job_postings_are_deleted_from_the_index(self):
+        _, company = create_company("employer@example.com")
+        kept = create_job_posting(company)
+        removed = create_job_posting(company)
+        index_job_postings([kept.pk, removed.pk])
+
+        removed.delete()
+        documents = index_job_postings([kept.pk, removed.pk])
+
+        self.assertEqual([document["id"] for document in documents], [kept.pk])
+        self.assertEqual(
+            set(self.es_service.indices[job_posting_index_keys]), {str(kept.pk)}
+        )
+
+
+class DuplicateJobPostingTests(APITestCase):
+    description = (
+        "We are hiring a backend developer to build our job search platform "
+        "with Django, PostgreSQL and Elasticsearch in a small remote team."
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.company = create_company("employer@example.com")
+
+    def create(self, days, description=None):
+        return create_job_posting(
+            self.company, days, description=description or self.description
+        )
+
+    def duplicates(self, *job_postings):
+        return [
+            JobPosting.objects.get(pk=job_posting.pk).duplicate_of_id
+            for job_posting in job_postings
+        ]
+
+    def test_group_is_shown_by_the_posting_expiring_last(self):
+        first = self.create(30)
+        last = self.create(60)
+        middle = self.create(40)
+        other = self.create(90, "Nurse for the night shift of a small clinic")
+
+        self.assertEqual(
+            self.duplicates(first, last, middle, other), [last.pk, None, last.pk, None]
+        )
+
+    def test_edited_text_leaves_the_group(self):
+        first, middle, last = self.create(30), self.create(40), self.create(60)
+
+        last.description = "Nurse for the night shift of a small clinic"
+        last.save()
+
+        self.assertEqual(self.duplicates(first, middle, last), [middle.pk, None, None])
+
+    def test_removed_shown_posting_hands_the_group_over(self):
+        first, middle, last = self.create(30), self.create(40), self.create(60)
+
+        last.delete()
+
+        self.assertEqual(self.duplicates(first, middle), [middle.pk, None])
+
+    def test_expiry_edit_moves_the_group_to_the_posting_expiring_last(self):
+        first, last = self.create(30), self.create(60)
+
+        first.refresh_from_db()
+        first.expiry_date = timezone.localdate() + datetime.timedelta(days=90)
+        first.save()
+
+        self.assertEqual(self.duplicates(first, last), [None, first.pk])
+
+
+class JobPostingRelationsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        _, company = create_company("employer@example.com")
+        cls.skill = Skill.objects.create(name="Django")
+        cls.job_postings = [create_job_posting(company), create_job_posting(company)]
+        for job_posting in cls.job_postings:
+            job_posting.skills.add(cls.skill)
+
+    def indexed_pks(self):
+        return {
+            pk
+            for args in Task.objects.filter(name="jobs.index_job_postings")
+            .values_list("args", flat=True)
+            for pk in args[0]
+        }
+
+    def test_relation_edits_are_job_posting_edits(self):
+        job_posting = self.job_postings[0]
+        updated_at = job_posting.updated_at
+        Task.objects.all().delete()
+
+        job_posting.skills.remove(self.skill)
+
+        job_posting.refresh_from_db()
+        self.assertGreater(job_posting.updated_at, updated_at)
+        self.assertEqual(self.indexed_pks(), {job_posting.pk})
+
+    def test_payload_renders_cached_names(self):
+        industry_area = IndustryArea.objects.create(name="Software")
+        self.job_postings[0].industry_areas.add(industry_area)
+
+        response = self.client.get(
+            reverse("v1_job_posting_detail", args=[self.job_postings[0].pk])
+        )
+
+        self.assertEqual(response.data["skills"], ["Django"])
+        self.assertEqual(response.data["industry_areas"], ["Software"])
+
+    def test_cleared_skill_refreshes_its_job_postings(self):
+        Task.objects.all().delete()
+
+        self.skill.job_posting_skills.clear()
+
+        self.assertEqual(
+            self.indexed_pks(), {job_posting.pk for job_posting in self.job_postings}
+        )
+
+
+class RecommendationFeedTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        _, company = create_company("employer@example.com")
+        cls.job_seeker = create_application(
+            create_job_posting(company), "seeker@example.com"
+        ).job_seeker
+        cls.skill = Skill.objects.create(name="Django")
+
+    def is_stale(self):
+        return RecommendationFeed.objects.get(job_seeker=self.job_seeker).is_stale
+
+    def test_skill_changes_mark_the_feed_stale(self):
+        store_feeds([(self.job_seeker.pk, [])], {}, timezone.now())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job_seeker.skills.add(self.skill)
+
+        self.assertTrue(self.is_stale())
+
+    def test_feed_computed_before_a_skill_change_stays_stale(self):
+        computed_at = timezone.now()
+        store_feeds([(self.job_seeker.pk, [])], {}, computed_at)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job_seeker.skills.add(self.skill)
+
+        store_feeds([(self.job_seeker.pk, [])], {}, computed_at)
+        self.assertTrue(self.is_stale())
+
+        store_feeds([(self.job_seeker.pk, [])], {}, timezone.now())
+        self.assertFalse(self.is_stale())
+
+
+class SalaryOverlapTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        _, company = create_company("employer@example.com")
+        cls.start_only = create_job_posting(company, salary_range_start=5000)
+        cls.end_only = create_job_posting(company, salary_range_end=3000)
+        cls.both = create_job_posting(
+            company, salary_range_start=2000, salary_range_end=4000
+        )
+        cls.no_salary = create_job_posting(company)
+
+    def test_open_ended_ranges(self):
+        cases = [
+            ((4500, None), {self.start_only}),
+            ((None, 2500), {self.end_only, self.both}),
+            ((2500, 3500), {self.end_only, self.both}),
+            ((4100, 4900), set()),
+            ((None, None), {self.start_only, self.end_only, self.both, self.no_salary}),
+        ]
+        for (minimum, maximum), expected in cases:
+            with self.subTest(minimum=minimum, maximum=maximum):
+                matched = salary_overlap(JobPosting.objects.all(), minimum, maximum)
+                self.assertEqual(set(matched), expected)
+                if minimum is not None or maximum is not None:
+                    self.assertEqual(
+                        set(matched),
+                        set(
+                            naive_salary_overlap(
+                                JobPosting.objects.all(), minimum, maximum
+                            )
+                        ),
+                    )
+
+    def test_search_documents_and_clauses_leave_open_ends_out(self):
+        self.assertEqual(salary_range_document(5000, None), {"gte": 5000})
+        self.assertEqual(salary_range_document(None, 3000), {"lte": 3000})
+        self.assertIsNone(salary_range_document(None, None))
+        self.assertEqual(
+            salary_range_clause(minimum=4500),
+            {"range": {"salary_range": {"gte": 4500, "relation": "intersects"}}},
+        )
+        self.assertEqual(
+            salary_range_clause(2500, 3500),
+            {
+                "range": {
+                    "salary_range": {
+                        "gte": 2500,
+                        "lte": 3500,
+                        "relation": "intersects",
+                    }
+                }
+            },
+        )
+
+
+class ConditionalJobPostingTests(APITestCase):
+    list_url = reverse("v1_job_posting_list")
+
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.company = create_company("employer@example.com")
+        cls.older = create_job_posting(cls.company, description="Django and Celery")
+        cls.job_posting = create_job_posting(cls.company, description="Go and Kafka")
+
+    def detail(self, **headers):
+        return self.client.get(
+            reverse("v1_job_posting_detail", args=[self.job_posting.pk]), **headers
+        )
+
+    def assertChanged(self, etag):
+        response = self.detail(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        return response
+
+    def test_unchanged_job_posting_is_not_modified(self):
+        response = self.detail()
+
+        not_modified = self.detail(HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+        not_modified = self.detail(HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_edits_replace_the_cached_payload(self):
+        etag = self.detail()["ETag"]
+
+        self.job_posting.title = "Platform engineer"
+        self.job_posting.save()
+
+        self.assertEqual(self.assertChanged(etag).data["title"], "Platform engineer")
+
+    def test_photo_changes_replace_the_cached_payload(self):
+        etag = self.detail()["ETag"]
+
+        JobPostingPhoto.objects.create(
+            job_posting=self.job_posting, file_path="job_posting_photos/office.png"
+        )
+
+        active_photo = self.assertChanged(etag).data["active_photo"]
+        self.assertIn("job_posting_photos/office.png", active_photo)
+
+    def test_company_rename_replaces_the_cached_payload(self):
+        etag = self.detail()["ETag"]
+
+        self.company.name = "Renamed"
+        self.company.save()
+
+        self.assertEqual(self.assertChanged(etag).data["company_name"], "Renamed")
+
+    def test_listing_changes_when_an_older_posting_is_removed(self):
+        response = self.client.get(self.list_url)
+        self.assertNotIn("Last-Modified", response)
+        not_modified = self.client.get(
+            self.list_url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.older.delete()
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
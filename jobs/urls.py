@@ -0,0 +1,85 @@
+from django.urls import path
+
+from .views import (
+    ApplicationBatchCreateAPIView,
+    ApplicationExportAPIView,
+    ApplicationStatsAPIView,
+    ApplicationStatusBatchUpdateAPIView,
+    JobPostingCreateAPIView,
+    JobPostingExportAPIView,
+    JobPostingListAPIView,
+    JobPostingRetrieveAPIView,
+    JobPostingSearchAPIView,
+    JobPostingUpdateAPIView,
+    RecommendationFeedAPIView,
+    SavedSearchListCreateAPIView,
+    SavedSearchRetrieveUpdateDestroyAPIView,
+)
+
+urlpatterns = [
+    path(
+        "v1/job-postings/",
+        JobPostingListAPIView.as_view(),
+        name="v1_job_posting_list",
+    ),
+    path(
+        "v1/job-postings/create/",
+        JobPostingCreateAPIView.as_view(),
+        name="v1_job_posting_create",
+    ),
+    path(
+        "v1/job-postings/search/",
+        JobPostingSearchAPIView.as_view(),
+        name="v1_job_posting_search",
+    ),
+    path(
+        "v1/job-postings/recommended/",
+        RecommendationFeedAPIView.as_view(),
+        name="v1_job_posting_recommended",
+    ),
+    path(
+        "v1/job-postings/export/",
+        JobPostingExportAPIView.as_view(),
+        name="v1_job_posting_export",
+    ),
+    path(
+        "v1/job-postings/<int:pk>/",
+        JobPostingRetrieveAPIView.as_view(),
+        name="v1_job_posting_detail",
+    ),
+    path(
+        "v1/job-postings/<int:pk>/update/",
+        JobPostingUpdateAPIView.as_view(),
+        name="v1_job_posting_update",
+    ),
+    path(
+        "v1/applications/export/",
+        ApplicationExportAPIView.as_view(),
+        name="v1_application_export",
+    ),
+    path(
+        "v1/applications/stats/",
+        ApplicationStatsAPIView.as_view(),
+        name="v1_application_stats",
+    ),
+    path(
+        "v1/applications/batch-apply/",
+        ApplicationBatchCreateAPIView.as_view(),
+        name="v1_application_batch_apply",
+    ),
+    path(
+        "v1/applications/batch-status/",
+        ApplicationStatusBatchUpdateAPIView.as_view(),
+        name="v1_application_batch_status",
+    ),
+    path(
+        "v1/saved-searches/",
+        SavedSearchListCreateAPIView.as_view(),
+        name="v1_saved_search_list",
+    ),
+    path(
+        "v1/saved-searches/<int:pk>/",
+        SavedSearchRetrieveUpdateDestroyAPIView.as_view(),
+        name="v1_saved_search_detail",
+    ),
+]
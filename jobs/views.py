@@ -1,3 +1,1030 @@
-from django.shortcuts import render
+import logging
 
-# Create your views here.
+from django.utils import timezone
+
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+
+from accounts.models import Company, JobSeeker
+from accounts.permissions import IsEmployer, IsJobSeeker
+from shared_features.mixins import ConditionalListMixin, ConditionalRetrieveMixin
+from shared_features.paginations import StandardResultsSetPagination
+from shared_features.renderers import CSVRenderer, NDJSONRenderer
+from shared_features.utils.streaming import export_rows, streaming_export_response
+
+from .cache_keys import job_posting_detail_cache_key
+from .exports import (
+    APPLICATION_EXPORT_FIELDS,
+    JOB_POSTING_EXPORT_FIELDS,
+    application_export_queryset,
+    job_posting_export_queryset,
+)
+from .filters import JobPostingFilter, JobPostingSearchFilter
+from .models import ApplicationDailyRollup, JobPosting, SavedSearch
+from .recommendations import job_seeker_feed, unpack_feed
+from .rollups import application_stats
+from .search import (
+    JobPostingSearchResults,
+    elasticsearch_search_enabled,
+    job_posting_search_body,
+)
+from .serializers import (
+    BatchApplySerializer,
+    JobPostingSerializer,
+    ApplicationStatsSerializer,
+    ApplicationStatusBatchSerializer,
+    JobPostingWriteSerializer,
+    SavedSearchSerializer,
+    job_posting_prefetches,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JobPostingQuerysetMixin:
+    """
+    queryset of job postings visible to everyone (not removed, not expired)
+    """
+
+    serializer_class = JobPostingSerializer
+    permission_classes = (permissions.AllowAny,)
+
+    def get_queryset(self):
+        return (
+            JobPosting.objects.select_related("company", "active_photo")
+            .prefetch_related(*job_posting_prefetches())
+            .filter(expiry_date__gte=timezone.localdate())
+            .order_by("-created_at", "-id")
+        )
+
+
+class JobPostingListAPIView(
+    ConditionalListMixin, JobPostingQuerysetMixin, generics.ListAPIView
+):
+    """
+    JOB POSTING LIST ROUTE (JobPostingListAPIView)
+
+        **Permissions**
+        ---------------
+        - **Allow Any**: Job postings are public.
+
+        **Request Method**
+        ------------------
+        - `GET`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/job-postings/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Query Parameters**:
+            - **`page`** (`int`, Optional): page number.
+            - **`page_size`** (`int`, Optional): items per page (max 100).
+            - **`salary_min`**, **`salary_max`** (`int`, Optional): desired
+              salary, postings whose salary range overlaps it. Either end may
+              be left out, open ended posting ranges match accordingly and
+              postings without salary are left out.
+            - **`city`** (`str`, Optional): city of the company, any spelling
+              of the bundled gazetteer (e.g. `Tehran`, `تهران`).
+            - **`lat`**, **`lon`** (`float`, Optional), **`radius_km`**
+              (`float`, Optional, default 25, max 500): postings within the
+              radius of the point, nearest first.
+            - **`include_duplicates`** (`bool`, Optional): near-duplicates of
+              another current posting (`duplicate_of` set) are left out
+              unless `true`.
+
+        **Request Headers**
+        -------------------
+        - **`If-None-Match`** (Optional):
+            - ETag of a previous response, `304 Not Modified` is returned
+              when no visible job posting was added, edited or removed since then.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK` with an `ETag` header
+            - **Body**:
+                ```json
+                {
+                    "count": 1,
+                    "next": null,
+                    "previous": null,
+                    "results": [{"id": 1, "title": "Backend Developer", "...": "..."}]
+                }
+                ```
+        - **Not Modified**:
+            - **Status Code**: `304 Not Modified` *(No content)*
+    """
+
+    pagination_class = StandardResultsSetPagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = JobPostingFilter
+
+
+class JobPostingSearchAPIView(JobPostingQuerysetMixin, generics.ListAPIView):
+    """
+    JOB POSTING SEARCH ROUTE (JobPostingSearchAPIView)
+
+        **Permissions**
+        ---------------
+        - **Allow Any**: Job postings are public.
+
+        **Request Method**
+        ------------------
+        - `GET`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/job-postings/search/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Query Parameters**:
+            - **`q`** (`str`, Optional): words to find in title, skills,
+              description and company name.
+            - **`salary_min`**, **`salary_max`** (`int`, Optional): desired
+              salary, see the job posting list route.
+            - **`city`**, **`lat`**, **`lon`**, **`radius_km`** (Optional):
+              location filters, see the job posting list route.
+            - **`include_duplicates`** (`bool`, Optional): see the job
+              posting list route.
+            - **`page`**, **`page_size`** (`int`, Optional): pagination.
+
+        **Processing & Output**
+        -----------------------
+        1. **Search**:
+            - Elasticsearch returns the ids of the requested page, salary is
+              matched on the `salary_range` integer range field, the point on
+              the `location` geo point (`geo_distance`).
+            - Searches with `q` or from a job seeker with skills are ranked by
+              relevance: BM25 of the words, share of the job seeker's skills,
+              recency and expiry proximity, weighted by `JOB_POSTING_RANKING`
+              (see jobs.ranking). Others list newest (or nearest) first.
+        2. **Load**:
+            - Job postings of the page are loaded from the database in hit
+              order, removed or expired ones are left out.
+        3. **Fallback**:
+            - Searches the database when elasticsearch is unavailable or the
+              in-memory backend is used, without relevance ranking.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK`
+            - **Body**: paginated job postings, as the list route.
+        - **On Failure**:
+            - **Invalid Salary**:
+                ```json
+                {
+                    "salary_max": ["Must be greater than salary_min."]
+                }
+                ```
+    """
+
+    pagination_class = StandardResultsSetPagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = JobPostingSearchFilter
+
+    def list(self, request, *args, **kwargs):
+        if not elasticsearch_search_enabled():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.get_queryset()
+        filterset = self.filterset_class(
+            request.query_params, queryset=queryset, request=request
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        results = JobPostingSearchResults(
+            job_posting_search_body(
+                filterset.form.cleaned_data, self.get_job_seeker_skill_ids()
+            ),
+            queryset,
+        )
+        try:
+            page = self.paginate_queryset(results)
+        except NotFound:
+            raise
+        except Exception:
+            logger.exception("job posting search failed, searching the database")
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def get_job_seeker_skill_ids(self):
+        """
+        skills of the requesting job seeker, ranked searches favour postings
+        asking for them
+        """
+        user = self.request.user
+        if not user.is_authenticated or user.usage_type != "JobSeeker":
+            return []
+        return list(
+            JobSeeker.skills.through.objects.filter(
+                jobseeker__user=user
+            ).values_list("skill_id", flat=True)
+        )
+
+
+class RecommendationFeedAPIView(JobPostingQuerysetMixin, generics.GenericAPIView):
+    """
+    RECOMMENDATION FEED ROUTE (RecommendationFeedAPIView)
+
+        **Permissions**
+        ---------------
+        - **Job Seeker**: Only the job seeker's own feed.
+
+        **Request Method**
+        ------------------
+        - `GET`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/job-postings/recommended/
+            ```
+
+        **Processing & Output**
+        -----------------------
+        1. **Read Feed**:
+            - Reads the job seeker's precomputed feed, one row of ranked ids
+              and scores (see jobs.recommendations). Feeds are refreshed by
+              `manage.py refresh_recommendation_feeds` when skills change or
+              a posting of the feed expires. A missing feed is replaced by a
+              provisional one, scored over the newest postings of the job
+              seeker's skills, and a refresh is queued.
+        2. **Load**:
+            - Job postings of the feed are loaded in rank order, removed,
+              expired and near-duplicate ones are left out.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK`
+            - **Body**:
+                ```json
+                {
+                    "computed_at": "2025-01-10T03:00:00Z",
+                    "results": [
+                        {"score": 3.42, "job_posting": {"id": 1, "title": "...", "...": "..."}}
+                    ]
+                }
+                ```
+        - **On Failure**:
+            - **No Job Seeker Profile**:
+                ```json
+                {
+                    "detail": "Job seeker profile not found."
+                }
+                ```
+    """
+
+    permission_classes = (IsJobSeeker,)
+
+    def get(self, request, *args, **kwargs):
+        job_seeker = JobSeeker.objects.filter(user=request.user).first()
+        if job_seeker is None:
+            raise NotFound("Job seeker profile not found.")
+        feed = job_seeker_feed(job_seeker)
+        ranked = unpack_feed(feed)
+        job_postings = (
+            self.get_queryset()
+            .filter(duplicate_of__isnull=True)
+            .in_bulk([pk for pk, _ in ranked])
+        )
+        ranked = [(pk, score) for pk, score in ranked if pk in job_postings]
+        data = self.get_serializer(
+            [job_postings[pk] for pk, _ in ranked], many=True
+        ).data
+        return Response(
+            {
+                "computed_at": feed.computed_at,
+                "results": [
+                    {"score": round(score, 4), "job_posting": job_posting}
+                    for (_, score), job_posting in zip(ranked, data)
+                ],
+            }
+        )
+
+
+class JobPostingRetrieveAPIView(
+    ConditionalRetrieveMixin, JobPostingQuerysetMixin, generics.RetrieveAPIView
+):
+    """
+    JOB POSTING DETAIL ROUTE (JobPostingRetrieveAPIView)
+
+        **Permissions**
+        ---------------
+        - **Allow Any**: Job postings are public.
+
+        **Request Method**
+        ------------------
+        - `GET`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/job-postings/<id>/
+            ```
+
+        **Request Headers**
+        -------------------
+        - **`If-None-Match`** / **`If-Modified-Since`** (Optional):
+            - validators from a previous response, `304 Not Modified` is returned
+              while `updated_at` of the job posting has not moved.
+
+        **Processing & Output**
+        -----------------------
+        1. **Check Validators**:
+            - Reads only `updated_at` of the job posting and answers `304` when
+              the client copy is still fresh.
+        2. **Serve Payload**:
+            - Serves the serialized job posting from the cache, serializing it
+              again only after the job posting or its photo changed.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK` with `ETag` and `Last-Modified` headers
+        - **Not Modified**:
+            - **Status Code**: `304 Not Modified` *(No content)*
+        - **On Failure**:
+            - **Status Code**: `404 Not Found`
+    """
+
+    detail_cache_key = job_posting_detail_cache_key
+
+
+class JobPostingCreateAPIView(generics.CreateAPIView):
+    """
+    JOB POSTING CREATE ROUTE (JobPostingCreateAPIView)
+
+        **Permissions**
+        ---------------
+        - **Employer**: Only authenticated employers with a company.
+
+        **Request Method**
+        ------------------
+        - `POST`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/job-postings/create/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Body Parameters**:
+            - **`title`**, **`description`**, **`expiry_date`**,
+              **`working_hours`** (**Required**)
+            - **`salary_range_start`**, **`salary_range_end`** (`int`, Optional)
+            - **`skill_ids`** (`list[int]`, Optional): ids of existing skills.
+            - **`skill_names`** (`list[str]`, Optional): free text skill names,
+              matched case and whitespace insensitively, missing skills are created.
+            - **`industry_area_ids`** (`list[int]`, Optional): ids of industry areas.
+
+        **Processing & Output**
+        -----------------------
+        1. **Validate**:
+            - Skill and industry area ids are checked against the in-process
+              reference data cache, without queries.
+        2. **Create**:
+            - Inserts the job posting, its skills and industry areas with one
+              bulk insert per relation, the search index is refreshed once.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `201 Created`
+            - **Body**: the job posting as returned by the detail route.
+        - **On Failure**:
+            - **Invalid Skill**:
+                ```json
+                {
+                    "skill_ids": {"0": ["Invalid pk \"999\" - object does not exist."]}
+                }
+                ```
+            - **No Company**:
+                ```json
+                {
+                    "detail": "Company not found."
+                }
+                ```
+    """
+
+    permission_classes = (IsEmployer,)
+    serializer_class = JobPostingWriteSerializer
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.user.is_authenticated:
+            context["company"] = Company.objects.filter(user=self.request.user).first()
+        return context
+
+    def perform_create(self, serializer):
+        if serializer.context["company"] is None:
+            raise NotFound("Company not found.")
+        serializer.save()
+
+
+class JobPostingUpdateAPIView(generics.UpdateAPIView):
+    """
+    JOB POSTING UPDATE ROUTE (JobPostingUpdateAPIView)
+
+        **Permissions**
+        ---------------
+        - **Employer**: Only job postings of the employer's own company.
+
+        **Request Method**
+        ------------------
+        - `PUT`, `PATCH`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/job-postings/<id>/update/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Body Parameters**: same as the create route, all optional with
+          `PATCH`. `skill_ids` / `skill_names` and `industry_area_ids` replace
+          the current relation when given and keep it when left out.
+
+        **Processing & Output**
+        -----------------------
+        1. **Diff Relations**:
+            - Current skills and industry areas are read once and compared
+              with the request in memory.
+        2. **Apply**:
+            - Added rows are inserted with one bulk insert and removed rows
+              deleted with one statement per relation, so an edit costs the
+              same number of queries for 1 or 50 skills.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK`
+            - **Body**: the job posting as returned by the detail route.
+        - **On Failure**:
+            - **Status Code**: `404 Not Found` for job postings of other companies.
+    """
+
+    permission_classes = (IsEmployer,)
+    serializer_class = JobPostingWriteSerializer
+
+    def get_queryset(self):
+        return JobPosting.objects.filter(company__user=self.request.user)
+
+
+class CompanyScopeMixin:
+    """
+    routes of employers over their own company, staff see every company
+    """
+
+    permission_classes = (IsEmployer | permissions.IsAdminUser,)
+
+    def get_company_id(self):
+        """
+        employers export their own company, staff may pass `company`
+        """
+        if self.request.user.is_staff:
+            company_id = self.request.query_params.get("company")
+            if company_id in (None, ""):
+                return None
+            if not company_id.isdigit():
+                raise ValidationError({"company": "A valid integer is required."})
+            return int(company_id)
+
+        company_id = (
+            Company.objects.filter(user=self.request.user)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if company_id is None:
+            raise NotFound("Company not found.")
+        return company_id
+
+
+class ExportAPIViewMixin(CompanyScopeMixin, generics.GenericAPIView):
+    """
+    Streaming export mixin, rows are read with a chunked iterator and
+    written to the response as they arrive (csv or ndjson).
+    """
+
+    renderer_classes = (NDJSONRenderer, CSVRenderer)
+    export_fields = None
+    export_filename = None
+
+    def get_export_queryset(self, company_id):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        rows = export_rows(
+            self.get_export_queryset(self.get_company_id()), self.export_fields
+        )
+        return streaming_export_response(
+            request.accepted_renderer.format,
+            self.export_fields,
+            rows,
+            self.export_filename,
+        )
+
+
+class ApplicationExportAPIView(ExportAPIViewMixin):
+    """
+    APPLICATION EXPORT ROUTE (ApplicationExportAPIView)
+
+        **Permissions**
+        ---------------
+        - **Employer**: exports applications of their own company.
+        - **Staff**: exports every application, or one company with `company`.
+
+        **Request Method**
+        ------------------
+        - `GET`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/applications/export/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Query Parameters**:
+            - **`format`** (`str`, Optional): `ndjson` (default) or `csv`,
+              `Accept: text/csv` / `Accept: application/x-ndjson` work as well.
+            - **`company`** (`int`, Optional): company id, staff only.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK`, streamed as attachment
+            - **Body** (`ndjson`):
+                ```
+                {"id": 1, "application_date": "2025-01-10T16:57:00Z", "status": "Pending", ...}
+                {"id": 2, "application_date": "2025-01-11T08:12:00Z", "status": "Accepted", ...}
+                ```
+        - **On Failure**:
+            - **Status Code**: `404 Not Found` when the employer has no company.
+    """
+
+    export_fields = APPLICATION_EXPORT_FIELDS
+    export_filename = "applications"
+
+    def get_export_queryset(self, company_id):
+        return application_export_queryset(company_id)
+
+
+class JobPostingExportAPIView(ExportAPIViewMixin):
+    """
+    JOB POSTING EXPORT ROUTE (JobPostingExportAPIView)
+
+        **Permissions**
+        ---------------
+        - **Employer**: exports job postings of their own company.
+        - **Staff**: exports every job posting, or one company with `company`.
+
+        **Request Method**
+        ------------------
+        - `GET`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/job-postings/export/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Query Parameters**:
+            - **`format`** (`str`, Optional): `ndjson` (default) or `csv`.
+            - **`company`** (`int`, Optional): company id, staff only.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK`, streamed as attachment
+    """
+
+    export_fields = JOB_POSTING_EXPORT_FIELDS
+    export_filename = "job_postings"
+
+    def get_export_queryset(self, company_id):
+        return job_posting_export_queryset(company_id)
+
+
+class ApplicationStatsAPIView(CompanyScopeMixin, generics.GenericAPIView):
+    """
+    APPLICATION STATS ROUTE (ApplicationStatsAPIView)
+
+        **Permissions**
+        ---------------
+        - **Employer**: Applications to the employer's own company.
+        - **Staff**: Every company, or one with `company`.
+
+        **Request Method**
+        ------------------
+        - `GET`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/applications/stats/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Query Parameters**:
+            - **`date_from`**, **`date_to`** (`date`, Optional): days the
+              applications were made, inclusive, the last 30 days by default
+              and at most 366 days.
+            - **`group_by`** (`str`, Optional, repeatable): `day`, `company`
+              and / or `job_posting`, `day` by default.
+            - **`job_posting`** (`int`, Optional): one job posting only.
+            - **`company`** (`int`, Optional): staff only, one company.
+
+        **Processing & Output**
+        -----------------------
+        1. **Read Rollups**:
+            - Sums the daily rollups of (day, company, job posting, status),
+              maintained incrementally by `manage.py update_application_rollups`
+              (a few minutes behind, bulk status changes show at once)
+              instead of scanning applications.
+        2. **Conversion**:
+            - `conversion` is the share of the applications made in the
+              period that are accepted now.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK`
+            - **Body**:
+                ```json
+                {
+                    "date_from": "2024-01-01",
+                    "date_to": "2024-01-30",
+                    "results": [
+                        {
+                            "day": "2024-01-01",
+                            "statuses": {"Pending": 7, "Accepted": 2, "Rejected": 1},
+                            "total": 10,
+                            "conversion": 0.2
+                        }
+                    ]
+                }
+                ```
+        - **On Failure**:
+            - **Invalid Range**:
+                ```json
+                {
+                    "date_to": ["Must be on or after date_from."]
+                }
+                ```
+    """
+
+    serializer_class = ApplicationStatsSerializer
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        rollups = ApplicationDailyRollup.objects.filter(
+            day__gte=params["date_from"], day__lte=params["date_to"]
+        )
+        company_id = self.get_company_id()
+        if company_id is not None:
+            rollups = rollups.filter(company_id=company_id)
+        if params.get("job_posting") is not None:
+            rollups = rollups.filter(job_posting_id=params["job_posting"])
+        return Response(
+            {
+                "date_from": params["date_from"],
+                "date_to": params["date_to"],
+                "results": application_stats(rollups, params["group_by"]),
+            }
+        )
+
+
+class ApplicationBatchCreateAPIView(generics.GenericAPIView):
+    """
+    BATCH APPLY ROUTE (ApplicationBatchCreateAPIView)
+
+        **Permissions**
+        ---------------
+        - **Job Seeker**: Only authenticated job seekers with a profile.
+
+        **Request Method**
+        ------------------
+        - `POST`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/applications/batch-apply/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Body Parameters**:
+            - **`job_posting_ids`** (`list[int]`, **Required**):
+                - **Description**: Ids of job postings to apply to (max 100).
+
+        **Processing & Output**
+        -----------------------
+        1. **Validate Job Postings**:
+            - Checks every job posting in one query (exists, not removed, not
+              expired, not already applied by the job seeker).
+        2. **Create Applications**:
+            - Inserts all new applications with one `bulk_create` in a
+              transaction. Retrying the same request is safe, applied job
+              postings are reported as `already_applied`.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `201 Created` when any application is created,
+              otherwise `200 OK`
+            - **Body**:
+                ```json
+                {
+                    "results": [
+                        {"job_posting": 1, "status": "created", "application": 10},
+                        {"job_posting": 2, "status": "already_applied", "application": 7},
+                        {"job_posting": 3, "status": "expired", "application": null},
+                        {"job_posting": 4, "status": "not_found", "application": null}
+                    ]
+                }
+                ```
+
+        - **On Failure**:
+            - **Missing or Invalid `job_posting_ids`**:
+                ```json
+                {
+                    "job_posting_ids": ["This field is required."]
+                }
+                ```
+            - **No Job Seeker Profile**:
+                ```json
+                {
+                    "detail": "Job seeker profile not found."
+                }
+                ```
+    """
+
+    permission_classes = (IsJobSeeker,)
+    serializer_class = BatchApplySerializer
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.user.is_authenticated:
+            context["job_seeker"] = JobSeeker.objects.filter(
+                user=self.request.user
+            ).first()
+        return context
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if serializer.context["job_seeker"] is None:
+            raise NotFound("Job seeker profile not found.")
+        results = serializer.save()
+
+        created = any(result["status"] == "created" for result in results)
+        return Response(
+            {"results": results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+
+class ApplicationStatusBatchUpdateAPIView(CompanyScopeMixin, generics.GenericAPIView):
+    """
+    BULK APPLICATION STATUS ROUTE (ApplicationStatusBatchUpdateAPIView)
+
+        **Permissions**
+        ---------------
+        - **Employer**: Applications to the employer's own company.
+        - **Staff**: Every company, or one with `company`.
+
+        **Request Method**
+        ------------------
+        - `POST`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/applications/batch-status/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Query Parameters**:
+            - **`company`** (`int`, Optional): staff only, one company.
+        - **Body Parameters**:
+            - **`changes`** (`list`, **Required**):
+                - **Description**: `{"application": id, "status": "Accepted"}`
+                  per application (max 500), each application once.
+
+        **Processing & Output**
+        -----------------------
+        1. **Transitions**:
+            - `Pending` may become `Accepted` or `Rejected`, both are final.
+        2. **Update**:
+            - Reads the current statuses in one query, then runs one
+              conditional `UPDATE ... WHERE status IN (...)` per new status,
+              so applications changed concurrently are not overwritten.
+        3. **Counters**:
+            - Rewrites the daily rollups of the changed applications' job
+              postings in the same transaction, stats show the change at once.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK`
+            - **Body**: per application in request order, `status` is the
+              current status (null when not found):
+                ```json
+                {
+                    "results": [
+                        {"application": 1, "result": "updated", "status": "Accepted"},
+                        {"application": 2, "result": "unchanged", "status": "Rejected"},
+                        {"application": 3, "result": "invalid_transition", "status": "Accepted"},
+                        {"application": 4, "result": "not_found", "status": null}
+                    ]
+                }
+                ```
+        - **On Failure**:
+            - **Repeated Application**:
+                ```json
+                {
+                    "changes": ["Each application may appear once."]
+                }
+                ```
+    """
+
+    serializer_class = ApplicationStatusBatchSerializer
+
+    def post(self, request, *args, **kwargs):
+        context = self.get_serializer_context()
+        context["company_id"] = self.get_company_id()
+        serializer = self.get_serializer(data=request.data, context=context)
+        serializer.is_valid(raise_exception=True)
+        return Response({"results": serializer.save()})
+
+
+class SavedSearchQuerysetMixin:
+    permission_classes = (IsJobSeeker,)
+    serializer_class = SavedSearchSerializer
+
+    def get_queryset(self):
+        return SavedSearch.objects.filter(job_seeker__user=self.request.user).order_by(
+            "-id"
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.user.is_authenticated:
+            context["job_seeker"] = JobSeeker.objects.filter(
+                user=self.request.user
+            ).first()
+        return context
+
+
+class SavedSearchListCreateAPIView(
+    SavedSearchQuerysetMixin, generics.ListCreateAPIView
+):
+    """
+    SAVED SEARCH LIST AND CREATE ROUTE (SavedSearchListCreateAPIView)
+
+        **Permissions**
+        ---------------
+        - **Job Seeker**: Only the job seeker's own saved searches.
+
+        **Request Method**
+        ------------------
+        - `GET`, `POST`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/saved-searches/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Body Parameters** (`POST`):
+            - **`name`** (`str`, **Required**)
+            - **`params`** (`dict`, **Required**): query parameters of the job
+              posting search route (`q`, `salary_min`, `salary_max`, `city`,
+              `lat`, `lon`, `radius_km`), at least one.
+            - **`is_active`** (`bool`, Optional): defaults to `true`.
+
+        **Processing & Output**
+        -----------------------
+        1. **Store**:
+            - The search is stored as an elasticsearch percolator query once
+              the transaction commits.
+        2. **Alert**:
+            - New and edited job postings are matched against every saved
+              search with one percolate request per write, matches are queued
+              and sent as one email per job seeker by
+              `manage.py send_job_alerts`. A posting is alerted once per search.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK` (list), `201 Created` (create)
+            - **Body**:
+                ```json
+                {
+                    "id": 1,
+                    "name": "python in tehran",
+                    "params": {"q": "python", "city": "Tehran"},
+                    "is_active": true,
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "updated_at": "2024-01-01T00:00:00Z"
+                }
+                ```
+        - **On Failure**:
+            - **Invalid Parameters**:
+                ```json
+                {
+                    "params": {"salary_max": ["Must be greater than salary_min."]}
+                }
+                ```
+            - **No Job Seeker Profile**:
+                ```json
+                {
+                    "detail": "Job seeker profile not found."
+                }
+                ```
+    """
+
+    pagination_class = StandardResultsSetPagination
+
+    def perform_create(self, serializer):
+        if serializer.context["job_seeker"] is None:
+            raise NotFound("Job seeker profile not found.")
+        serializer.save(job_seeker=serializer.context["job_seeker"])
+
+
+class SavedSearchRetrieveUpdateDestroyAPIView(
+    SavedSearchQuerysetMixin, generics.RetrieveUpdateDestroyAPIView
+):
+    """
+    SAVED SEARCH DETAIL ROUTE (SavedSearchRetrieveUpdateDestroyAPIView)
+
+        **Permissions**
+        ---------------
+        - **Job Seeker**: Only the job seeker's own saved searches.
+
+        **Request Method**
+        ------------------
+        - `GET`, `PUT`, `PATCH`, `DELETE`
+
+        **URL Patterns**
+        ----------------
+        - **Endpoint**:
+            ```
+            /api/jobs/v1/saved-searches/<id>/
+            ```
+
+        **Request Parameters**
+        -----------------------
+        - **Body Parameters**: same as the create route, all optional with
+          `PATCH`.
+
+        **Processing & Output**
+        -----------------------
+        - Edits replace the percolator query, deactivating or deleting the
+          search drops it, queued alerts of the search are not sent.
+
+        **Returns**
+        ----------
+        - **On Success**:
+            - **Status Code**: `200 OK`, `204 No Content` after `DELETE`
+        - **On Failure**:
+            - **Status Code**: `404 Not Found` for searches of other job seekers.
+    """
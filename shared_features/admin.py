@@ -1,5 +1,17 @@
 from django.contrib import admin
 
-from .models import Skill
+from .models import Skill, Task
 
 admin.site.register(Skill)
+
+
+@admin.register(Task)
+class TaskModelAdmin(admin.ModelAdmin):
+    """
+    handle Task class instance in Django admin panel
+    """
+
+    list_display = ("id", "name", "status", "attempts", "run_at", "finished_at")
+    list_filter = ("status", "name")
+    search_fields = ("name__startswith", "dedup_key__startswith")
+    readonly_fields = ("created_at", "locked_by", "locked_at", "finished_at")
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SharedFeaturesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'shared_features'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,89 @@
+"""
+primary / replica database routing
+
+writes always go to the primary ("default" database), reads go to one of
+DATABASE_REPLICAS unless the current request is pinned to the primary:
+    - requests with unsafe methods (POST, PUT, PATCH, DELETE) are pinned
+    - a request is pinned after its first write
+    - clients that wrote in the last REPLICA_PIN_SECONDS are pinned, so they
+      read their own writes (see ReplicaPinningMiddleware)
+    - reads inside a transaction of the primary stay on the primary
+
+code running outside of a request (management commands, shell, tasks)
+reads from the primary, wrap it in `read_from_replicas()` to use replicas.
+"""
+
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRIMARY = DEFAULT_DB_ALIAS
+
+current_routing = contextvars.ContextVar("current_routing", default=None)
+
+
+def get_replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+class Routing:
+    """
+    routing state of one request or block of code
+    """
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+@contextmanager
+def database_routing(pinned=False):
+    routing = Routing(pinned)
+    token = current_routing.set(routing)
+    try:
+        yield routing
+    finally:
+        current_routing.reset(token)
+
+
+def read_from_replicas():
+    return database_routing(pinned=False)
+
+
+def pin_to_primary():
+    return database_routing(pinned=True)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = current_routing.get()
+        replicas = get_replicas()
+        if (
+            routing is None
+            or routing.pinned
+            or not replicas
+            or connections[PRIMARY].in_atomic_block
+        ):
+            return PRIMARY
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        routing = current_routing.get()
+        if routing is not None:
+            routing.pinned = routing.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replicas receive the schema through replication
+        if db in get_replicas():
+            return False
+        return None
@@ -0,0 +1,133 @@
+import io
+import random
+import statistics
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from shared_features.parsers import MessagePackParser, ORJSONParser
+from shared_features.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+WORDS = (
+    "python django backend developer senior junior remote engineer data "
+    "platform team product design customer support sales marketing cloud"
+).split()
+
+
+def job_posting_item(pk):
+    """payload shaped like JobPostingSerializer output"""
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=pk)
+    return OrderedDict(
+        id=pk,
+        title=" ".join(random.choices(WORDS, k=4)).title(),
+        description=" ".join(random.choices(WORDS, k=120)),
+        expiry_date=(date(2026, 1, 1) + timedelta(days=pk % 365)).isoformat(),
+        salary_range_start=random.randrange(1000, 5000, 100),
+        salary_range_end=random.randrange(5000, 9000, 100),
+        working_hours="9-17",
+        company=pk % 500,
+        company_name=f"Company {pk % 500}",
+        skills=random.sample(WORDS, 8),
+        industry_areas=random.sample(WORDS, 2),
+        active_photo=f"http://localhost:8000/media/job_posting_photos/{pk}.jpg",
+        created_at=created_at.isoformat(),
+        updated_at=created_at.isoformat(),
+    )
+
+
+def application_item(pk):
+    """payload shaped like an application list item"""
+    application_date = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(
+        minutes=pk
+    )
+    return OrderedDict(
+        id=pk,
+        application_date=application_date.isoformat(),
+        status=random.choice(("Pending", "Accepted", "Rejected")),
+        job_seeker=pk % 10000,
+        job_posting=pk % 2000,
+        job_posting_title=" ".join(random.choices(WORDS, k=4)).title(),
+        created_at=application_date.isoformat(),
+        updated_at=application_date.isoformat(),
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark serialization time and payload size of the available "
+        "renderers and parsers for typical job posting and application lists."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=100)
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        items, iterations = options["items"], options["iterations"]
+        payloads = {
+            "job postings": self.page(job_posting_item, items),
+            "applications": self.page(application_item, items),
+        }
+        codecs = (
+            ("json (stdlib)", JSONRenderer(), JSONParser(), "application/json"),
+            ("orjson", ORJSONRenderer(), ORJSONParser(), "application/json"),
+            (
+                "msgpack",
+                MessagePackRenderer(),
+                MessagePackParser(),
+                "application/msgpack",
+            ),
+        )
+
+        self.stdout.write(
+            f"{items} items per page, median of {iterations} iterations\n"
+        )
+        header = f"{'payload':<14}{'codec':<15}{'render ms':>11}{'parse ms':>10}{'bytes':>11}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for payload_name, payload in payloads.items():
+            for codec_name, renderer, parser, media_type in codecs:
+                try:
+                    body = renderer.render(payload, media_type, {})
+                except RuntimeError as exc:
+                    self.stdout.write(f"{payload_name:<14}{codec_name:<15} {exc}")
+                    continue
+                render_ms = self.measure(
+                    lambda: renderer.render(payload, media_type, {}), iterations
+                )
+                parse_ms = self.measure(
+                    lambda: parser.parse(io.BytesIO(body), media_type, {}),
+                    iterations,
+                )
+                self.stdout.write(
+                    f"{payload_name:<14}{codec_name:<15}"
+                    f"{render_ms:>11.3f}{parse_ms:>10.3f}{len(body):>11}"
+                )
+
+    @staticmethod
+    def page(item_factory, items):
+        """list pages are rendered from ReturnList of OrderedDict like DRF"""
+        return OrderedDict(
+            count=items,
+            next=None,
+            previous=None,
+            results=ReturnList([item_factory(pk) for pk in range(items)], serializer=None),
+        )
+
+    @staticmethod
+    def measure(func, iterations):
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,71 @@
+import os
+import shlex
+import sys
+import tempfile
+from pathlib import Path
+from urllib.parse import urlparse
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare runserver with the production server (gunicorn with "
+        "core/gunicorn.conf.py) by running the same load test against each, "
+        "by default the auth scenario (login, token refresh, logout). Auth "
+        "routes are rate limited per process with the memory store of "
+        "AUTH_RATE_LIMIT, raise the limits or share them through the cache so "
+        "both servers throttle alike."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--duration", type=float, default=30, help="seconds")
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument(
+            "--users", type=int, default=20, help="job seeker pool size"
+        )
+        parser.add_argument("--scenarios", default="auth=1")
+        parser.add_argument("--workers", type=int, help="WEB_WORKERS of gunicorn")
+        parser.add_argument("--threads", type=int, help="WEB_THREADS of gunicorn")
+        parser.add_argument(
+            "--output-dir", help="keep the json results of both runs in this directory"
+        )
+
+    def handle(self, *args, **options):
+        # the servers are started with this environment
+        for option in ("workers", "threads"):
+            if options[option] is not None:
+                os.environ[f"WEB_{option.upper()}"] = str(options[option])
+
+        address = urlparse(options["base_url"]).netloc
+        python = shlex.quote(sys.executable)
+        servers = {
+            "runserver": f"{python} manage.py runserver --noreload {address}",
+            "gunicorn": (
+                f"{python} -m gunicorn -c core/gunicorn.conf.py --bind {address} "
+                "core.wsgi:application"
+            ),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            output_dir = Path(options["output_dir"] or directory)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            previous = None
+            for name, command in servers.items():
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n{name}: {command}"))
+                output = output_dir / f"{name}.json"
+                call_command(
+                    "run_load_test",
+                    base_url=options["base_url"],
+                    duration=options["duration"],
+                    concurrency=options["concurrency"],
+                    users=options["users"],
+                    scenarios=options["scenarios"],
+                    start_server=True,
+                    server_command=command,
+                    output=str(output),
+                    compare=previous,
+                    stdout=self.stdout,
+                )
+                previous = str(output)
@@ -0,0 +1,98 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from shared_features.models import Skill
+from shared_features.reference_data import skills
+from shared_features.signals import skills_merged
+from shared_features.utils.skills import (
+    MERGE_BATCH_SIZE,
+    canonical_skill_name,
+    duplicate_skill_groups,
+    merge_skills,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge active skills sharing a canonical name into the one with the "
+        "lowest id, rewriting job posting and job seeker skill references with "
+        "set based statements. Skills whose stored canonical name is stale "
+        "(rows written with raw sql, a changed canonicalization) are fixed and "
+        "merged as well."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true", help="only report what would be merged"
+        )
+        parser.add_argument("--batch-size", type=int, default=MERGE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            stale_groups, stale_names = self.stale_skill_groups()
+            groups = {**duplicate_skill_groups(Skill), **stale_groups}
+            self.stdout.write(
+                f"{len(stale_names)} stale canonical names, "
+                f"{sum(len(pks) for pks in groups.values())} duplicate skills "
+                f"in {len(groups)} groups"
+            )
+            if options["dry_run"]:
+                for kept_id, duplicate_ids in groups.items():
+                    self.stdout.write(f"  {kept_id} <- {duplicate_ids}")
+                transaction.set_rollback(True)
+                return
+
+            changed = merge_skills(Skill, groups, options["batch_size"])
+            # kept skills take their canonical name once duplicates are removed
+            duplicate_ids = {pk for pks in groups.values() for pk in pks}
+            Skill.objects.bulk_update(
+                [
+                    Skill(pk=pk, canonical_name=canonical_name)
+                    for pk, canonical_name in stale_names.items()
+                    if pk not in duplicate_ids
+                ],
+                ["canonical_name"],
+                batch_size=options["batch_size"],
+            )
+            if groups or stale_names:
+                skills.invalidate()
+            if changed:
+                skills_merged.send(sender=Skill, changed=changed)
+
+        for model, pks in changed.items():
+            self.stdout.write(
+                f"rewrote skills of {len(pks)} {model._meta.verbose_name_plural}"
+            )
+        self.stdout.write(self.style.SUCCESS("done"))
+
+    @staticmethod
+    def stale_skill_groups():
+        """
+        ({kept id: [duplicate ids]}, {id: canonical name}) of active skills
+        whose canonical name does not match their name, grouped with the
+        skills already holding the correct canonical name
+        """
+        stale_names = {
+            pk: canonical_skill_name(name)
+            for pk, name, canonical_name in Skill.objects.values_list(
+                "id", "name", "canonical_name"
+            ).iterator(chunk_size=2000)
+            if canonical_skill_name(name) != canonical_name
+        }
+        members = defaultdict(list)
+        for pk, canonical_name in stale_names.items():
+            members[canonical_name].append(pk)
+        for canonical_name, pk in Skill.objects.filter(
+            canonical_name__in=list(members)
+        ).values_list("canonical_name", "id"):
+            if pk not in stale_names:
+                members[canonical_name].append(pk)
+
+        groups = {}
+        for pks in members.values():
+            if len(pks) > 1:
+                pks.sort()
+                groups[pks[0]] = pks[1:]
+        return groups, stale_names
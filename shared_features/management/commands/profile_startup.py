@@ -0,0 +1,164 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+# runs in a fresh interpreter, times django.setup(), every AppConfig.ready()
+# and the first load of the root urlconf (done by the first request)
+PROBE = """
+import json
+import time
+
+started = time.perf_counter()
+
+import django
+from django.apps import AppConfig
+
+ready_times = {}
+create = AppConfig.create.__func__
+
+
+def timed_create(cls, entry):
+    app_config = create(cls, entry)
+    ready = app_config.ready
+
+    def timed_ready():
+        ready_started = time.perf_counter()
+        ready()
+        ready_times[app_config.label] = time.perf_counter() - ready_started
+
+    app_config.ready = timed_ready
+    return app_config
+
+
+AppConfig.create = classmethod(timed_create)
+django.setup()
+setup_time = time.perf_counter() - started
+
+from django.urls import get_resolver
+
+urlconf_started = time.perf_counter()
+get_resolver().url_patterns
+urlconf_time = time.perf_counter() - urlconf_started
+
+print(json.dumps({"setup": setup_time, "urlconf": urlconf_time, "ready": ready_times}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start of a fresh process: django.setup(), AppConfig.ready() "
+        "hooks, root urlconf load and the slowest imports (python -X importtime). "
+        "Run once as is and once with --lean to compare with LEAN_STARTUP=1."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20, help="slowest imports to list")
+        parser.add_argument(
+            "--sort",
+            choices=("cumulative", "self"),
+            default="cumulative",
+            help="rank imports by cumulative or self time",
+        )
+        parser.add_argument(
+            "--lean", action="store_true", help="profile with LEAN_STARTUP=1"
+        )
+        parser.add_argument(
+            "--package",
+            help="only list imports of this top level package, e.g. elasticsearch",
+        )
+        parser.add_argument("--output", help="save results as json")
+
+    def handle(self, *args, **options):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get(
+                "DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE
+            ),
+            "LEAN_STARTUP": "1" if options["lean"] else "0",
+        }
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        process_time = time.perf_counter() - started
+        if process.returncode != 0:
+            raise CommandError(f"startup probe failed:\n{process.stderr[-2000:]}")
+
+        timings = json.loads(process.stdout.strip().splitlines()[-1])
+        imports = self.parse_import_times(process.stderr)
+        if options["package"]:
+            imports = [
+                row for row in imports if row["module"].split(".")[0] == options["package"]
+            ]
+        imports.sort(key=lambda row: row[options["sort"]], reverse=True)
+
+        results = {
+            "lean": options["lean"],
+            "process_ms": round(process_time * 1000, 1),
+            "setup_ms": round(timings["setup"] * 1000, 1),
+            "urlconf_ms": round(timings["urlconf"] * 1000, 1),
+            "ready_ms": {
+                label: round(seconds * 1000, 1)
+                for label, seconds in sorted(
+                    timings["ready"].items(), key=lambda item: item[1], reverse=True
+                )
+            },
+            "imports": imports[: options["top"]],
+        }
+        self.print_results(results, options["sort"])
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"results saved to {options['output']}")
+
+    @staticmethod
+    def parse_import_times(stderr):
+        """
+        rows of python -X importtime output, times in milliseconds and depth
+        as the nesting level of the import
+        """
+        rows = []
+        for line in stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if match is None:
+                continue
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append(
+                {
+                    "module": module,
+                    "self": round(int(self_us) / 1000, 1),
+                    "cumulative": round(int(cumulative_us) / 1000, 1),
+                    "depth": len(indent) // 2,
+                }
+            )
+        return rows
+
+    def print_results(self, results, sort):
+        self.stdout.write(
+            f"process {results['process_ms']} ms, django.setup() {results['setup_ms']} ms, "
+            f"root urlconf {results['urlconf_ms']} ms"
+            + (" (lean)" if results["lean"] else "")
+        )
+
+        self.stdout.write(f"\n{'app ready()':<40}{'ms':>10}")
+        for label, milliseconds in results["ready_ms"].items():
+            self.stdout.write(f"{label:<40}{milliseconds:>10}")
+
+        self.stdout.write(f"\n{'import (by ' + sort + ')':<60}{'self ms':>10}{'cumul. ms':>12}")
+        for row in results["imports"]:
+            self.stdout.write(
+                f"{row['module']:<60}{row['self']:>10}{row['cumulative']:>12}"
+            )
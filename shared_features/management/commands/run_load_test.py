@@ -0,0 +1,198 @@
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import JobSeeker
+from shared_features.utils.load_test import (
+    DEFAULT_PASSWORD,
+    DEFAULT_SCENARIO_WEIGHTS,
+    LoadTest,
+    LoadTestClient,
+    PostmanCollection,
+    compare_results,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the postman collection as weighted load scenarios (register, "
+        "auth, browse, apply) and report p50/p95/p99 latency and requests per "
+        "second. Login and register routes are rate limited, raise "
+        "AUTH_RATE_LIMIT of the server under test or expect throttled counts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument(
+            "--collection",
+            default=str(
+                settings.BASE_DIR / "job_search_system_sample_request.postman_collection.json"
+            ),
+        )
+        parser.add_argument("--duration", type=float, default=30, help="seconds")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--users", type=int, default=20, help="job seeker pool size")
+        parser.add_argument(
+            "--scenarios",
+            default=",".join(f"{name}={weight}" for name, weight in DEFAULT_SCENARIO_WEIGHTS.items()),
+            help="weights, e.g. auth=4,browse=10",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="save results as json")
+        parser.add_argument("--compare", help="json results of a previous run")
+        parser.add_argument(
+            "--start-server",
+            action="store_true",
+            help="start a local server (in-memory elasticsearch) for the run",
+        )
+        parser.add_argument(
+            "--server-command",
+            help="command used by --start-server, defaults to runserver on --base-url",
+        )
+
+    def handle(self, *args, **options):
+        weights = self.parse_weights(options["scenarios"])
+        client = LoadTestClient(PostmanCollection(options["collection"]), options["base_url"])
+        load_test = LoadTest(client, weights, users=options["users"], seed=options["seed"])
+
+        server = self.start_server(options) if options["start_server"] else None
+        try:
+            load_test.setup(provision_user=self.provision_job_seeker)
+            self.stdout.write(
+                f"running {options['duration']}s with {options['concurrency']} "
+                f"virtual users, scenarios {weights}"
+            )
+            summary = load_test.run(options["duration"], options["concurrency"])
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+
+        results = {
+            "meta": {
+                "commit": self.git_commit(),
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "base_url": options["base_url"],
+                "server_command": options["server_command"],
+                "duration": options["duration"],
+                "concurrency": options["concurrency"],
+                "users": options["users"],
+                "scenarios": weights,
+            },
+            **summary,
+        }
+        self.print_summary(results)
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"results saved to {options['output']}")
+        if options["compare"]:
+            with open(options["compare"]) as previous:
+                self.print_comparison(json.load(previous), results)
+
+    @staticmethod
+    def parse_weights(value):
+        weights = {}
+        for part in value.split(","):
+            name, _, weight = part.partition("=")
+            name = name.strip()
+            if name not in DEFAULT_SCENARIO_WEIGHTS:
+                raise CommandError(f"unknown scenario {name!r}")
+            try:
+                weights[name] = float(weight or 1)
+            except ValueError:
+                raise CommandError(f"invalid weight of scenario {name!r}")
+        return weights
+
+    @staticmethod
+    def provision_job_seeker(email):
+        """
+        create a pool user with a job seeker profile and mint its access token
+        in process, the server under test uses the same database and secret
+        key as this command, so setup does not hit the rate limited routes
+        """
+        User = get_user_model()
+        user = User.objects.filter(email=email).first()
+        if user is None:
+            user = User.objects.create_user(
+                email=email, password=DEFAULT_PASSWORD, usage_type="JobSeeker"
+            )
+        JobSeeker.objects.get_or_create(user=user)
+        return str(AccessToken.for_user(user))
+
+    def start_server(self, options):
+        address = urlparse(options["base_url"]).netloc
+        command = options["server_command"] or (
+            f"{shlex.quote(sys.executable)} manage.py runserver --noreload {address}"
+        )
+        server = subprocess.Popen(
+            shlex.split(command),
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "ELASTICSEARCH_BACKEND": "memory"},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"server exited with code {server.returncode}")
+            try:
+                urllib.request.urlopen(options["base_url"] + "/metrics", timeout=1)
+                return server
+            except urllib.error.HTTPError:
+                return server
+            except OSError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError("server did not start within 30 seconds")
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def print_summary(self, results):
+        header = (
+            f"{'step':<20}{'count':>8}{'errors':>8}{'429':>6}{'rps':>9}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for step, row in [*results["steps"].items(), ("total", results["total"])]:
+            self.stdout.write(
+                f"{step:<20}{row['count']:>8}{row['errors']:>8}{row['throttled']:>6}"
+                f"{row['rps']:>9}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+            )
+
+    def print_comparison(self, previous, current):
+        self.stdout.write(
+            f"\ncompared to {previous['meta'].get('commit')} "
+            f"({previous['meta'].get('started_at')})"
+        )
+        self.stdout.write(f"{'step':<20}{'p95 ms':>22}{'rps':>22}")
+        for step, p95_before, p95_now, rps_before, rps_now in compare_results(previous, current):
+            self.stdout.write(
+                f"{step:<20}{p95_before:>10} -> {p95_now:<8}{rps_before:>10} -> {rps_now:<8}"
+            )
@@ -0,0 +1,160 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.module_loading import autodiscover_modules
+
+from shared_features.task_queue import (
+    purge_finished_tasks,
+    ready_count,
+    release_expired_leases,
+    tasks,
+    work,
+)
+from shared_features.utils.metrics import TaskMetrics
+
+logger = logging.getLogger("shared_features.task_queue")
+
+# seconds between releases of expired leases and purges of finished tasks
+MAINTENANCE_INTERVAL = 60
+
+
+def run_process(index, options, stop):
+    """
+    worker threads of one process. its main thread logs their throughput
+    every `--stats-interval` seconds, the first process also releases
+    expired leases and purges finished tasks
+    """
+    metrics = TaskMetrics()
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    threads = [
+        threading.Thread(
+            target=work,
+            args=(
+                f"{prefix}:{number}",
+                stop,
+                metrics,
+                options["poll_interval"],
+                options["burst"],
+            ),
+            name=f"task-worker-{number}",
+        )
+        for number in range(options["threads"])
+    ]
+    for thread in threads:
+        thread.start()
+
+    next_stats = time.monotonic() + options["stats_interval"]
+    next_maintenance = time.monotonic()
+    while alive := [thread for thread in threads if thread.is_alive()]:
+        now = time.monotonic()
+        if index == 0 and now >= next_maintenance and not stop.is_set():
+            try:
+                released = release_expired_leases()
+                purge_finished_tasks()
+            except Exception:
+                logger.exception("task queue maintenance failed")
+            else:
+                if released:
+                    logger.warning("%s tasks of dead workers released", released)
+            next_maintenance = now + MAINTENANCE_INTERVAL
+        if now >= next_stats:
+            logger.info("%s %s, %s ready", prefix, metrics.summary(), ready_count())
+            next_stats = now + options["stats_interval"]
+        alive[0].join(1.0)
+    logger.info("%s stopped, %s", prefix, metrics.summary())
+    connections.close_all()
+
+
+def run_child(index, options, stop):
+    # the supervisor handles interrupts of the terminal, SIGTERM of a single
+    # process stops it gracefully
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    run_process(index, options, stop)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued tasks (shared_features.task_queue) in --processes worker "
+        "processes of --threads worker threads each, without an external "
+        "broker. SIGTERM or SIGINT stops after the running tasks finish, "
+        "crashed processes are restarted. Throughput is logged every "
+        "--stats-interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1)
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="seconds between claims while no task is ready",
+        )
+        parser.add_argument("--stats-interval", type=float, default=60.0)
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="exit once no task is ready instead of waiting for more",
+        )
+
+    def handle(self, *args, **options):
+        if options["processes"] < 1 or options["threads"] < 1:
+            raise CommandError("--processes and --threads must be at least 1")
+        autodiscover_modules("tasks")
+        logger.info(
+            "%s processes x %s threads, tasks: %s",
+            options["processes"],
+            options["threads"],
+            ", ".join(sorted(tasks)),
+        )
+
+        if options["processes"] == 1:
+            stop = threading.Event()
+        else:
+            # children are forked so they share the registry and settings
+            context = multiprocessing.get_context("fork")
+            stop = context.Event()
+
+        def shutdown(signum, frame):
+            logger.info("stopping after the running tasks")
+            stop.set()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        if options["processes"] == 1:
+            run_process(0, options, stop)
+            return
+
+        # forked children must not share the parent's database connections
+        connections.close_all()
+        children = {}
+        while True:
+            for index in range(options["processes"]):
+                child = children.get(index)
+                if child is not None and (
+                    child.is_alive() or child.exitcode == 0 or stop.is_set()
+                ):
+                    continue
+                if child is not None:
+                    logger.error(
+                        "worker process %s exited with %s, restarting",
+                        child.pid,
+                        child.exitcode,
+                    )
+                children[index] = context.Process(
+                    target=run_child, args=(index, options, stop)
+                )
+                children[index].start()
+            alive = [child for child in children.values() if child.is_alive()]
+            if not alive:
+                return
+            alive[0].join(1.0)
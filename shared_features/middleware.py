@@ -0,0 +1,109 @@
+import hashlib
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .db_routers import database_routing, get_replicas
+from .utils.metrics import RequestMetrics, current_request_metrics, registry
+
+logger = logging.getLogger("performance")
+
+
+class PerformanceMetricsMiddleware:
+    """
+    Measures sql, elasticsearch, serialization and total time of every
+    request. Timings are sent back in the `Server-Timing` header and
+    collected into per endpoint latency histograms served on `/metrics`.
+    Requests slower than SLOW_REQUEST_THRESHOLD_MS are logged.
+
+    Should be the first middleware so the total covers the whole stack.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_threshold = (
+            getattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 1000) / 1000
+        )
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.sql_wrapper))
+                response = self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+        metrics.total_time = time.perf_counter() - start
+
+        match = request.resolver_match
+        route = match.route if match is not None else "unmatched"
+        response["Server-Timing"] = metrics.server_timing()
+        registry.observe(request.method, route, response.status_code, metrics)
+
+        if metrics.total_time >= self.slow_threshold:
+            logger.warning(
+                "slow request %s %s (%s) %s",
+                request.method,
+                request.path,
+                route,
+                metrics.server_timing(),
+            )
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    Routes reads of each request to the read replicas (see
+    shared_features.db_routers) and pins clients to the primary for
+    REPLICA_PIN_SECONDS after a request of theirs wrote, so they read their
+    own writes. Clients are recognized by a short lived cookie and, for API
+    clients that ignore cookies, by their Authorization header.
+
+    Does nothing while DATABASE_REPLICAS is empty.
+    """
+
+    pin_cookie = "primary_pin"
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+
+    def __call__(self, request):
+        if not get_replicas():
+            return self.get_response(request)
+
+        pin_key = self.get_pin_key(request)
+        pinned = (
+            request.method not in self.safe_methods
+            or self.pin_cookie in request.COOKIES
+            or (pin_key is not None and cache.get(pin_key) is not None)
+        )
+        with database_routing(pinned) as routing:
+            response = self.get_response(request)
+
+        if routing.wrote:
+            response.set_cookie(
+                self.pin_cookie,
+                "1",
+                max_age=self.pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+            if pin_key is not None:
+                cache.set(pin_key, 1, self.pin_seconds)
+        return response
+
+    @staticmethod
+    def get_pin_key(request):
+        authorization = request.META.get("HTTP_AUTHORIZATION")
+        if not authorization:
+            return None
+        return "replica_pin:" + hashlib.sha256(authorization.encode()).hexdigest()
@@ -0,0 +1,100 @@
+# Generated by Django 4.2 on 2026-10-19 18:05
+
+import unicodedata
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, Exists, OuterRef
+
+
+# copies of shared_features.utils.skills as of this migration, later changes
+# of that module must not change what it does
+
+
+def canonical_skill_name(name):
+    return " ".join(unicodedata.normalize("NFKC", name).split()).casefold()
+
+
+def merge_duplicate_skills(Skill):
+    """
+    keep the lowest id active skill of every canonical name: rows of the
+    skill relations pointing to the others are moved to it (or deleted when
+    the owner already has it) and the others are soft deleted
+    """
+    active = Skill.objects.filter(is_removed=False)
+    duplicated = (
+        active.values("canonical_name")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .values("canonical_name")
+    )
+    members = defaultdict(list)
+    for canonical_name, pk in (
+        active.filter(canonical_name__in=duplicated)
+        .values_list("canonical_name", "id")
+        .order_by("canonical_name", "id")
+    ):
+        members[canonical_name].append(pk)
+    groups = {pks[0]: pks[1:] for pks in members.values()}
+
+    for relation in Skill._meta.related_objects:
+        if not relation.many_to_many:
+            continue
+        through = relation.field.remote_field.through
+        owner = relation.field.m2m_field_name()
+        skill = relation.field.m2m_reverse_field_name()
+        for kept_id, duplicate_ids in groups.items():
+            rows = through.objects.filter(**{f"{skill}_id__in": duplicate_ids})
+            rows.filter(
+                Exists(
+                    through.objects.filter(
+                        **{
+                            f"{owner}_id": OuterRef(f"{owner}_id"),
+                            f"{skill}_id__in": [kept_id, *duplicate_ids],
+                            f"{skill}_id__lt": OuterRef(f"{skill}_id"),
+                        }
+                    )
+                )
+            ).delete()
+            rows.update(**{f"{skill}_id": kept_id})
+
+    Skill.objects.filter(
+        pk__in=[pk for pks in groups.values() for pk in pks]
+    ).update(is_removed=True)
+
+
+def fill_canonical_names(apps, schema_editor):
+    """
+    set canonical names of existing skills and merge the duplicates, the
+    unique constraint is added afterwards
+    """
+    Skill = apps.get_model("shared_features", "Skill")
+    skills = list(Skill.objects.only("id", "name"))
+    for skill in skills:
+        skill.canonical_name = canonical_skill_name(skill.name)
+    Skill.objects.bulk_update(skills, ["canonical_name"], batch_size=1000)
+    merge_duplicate_skills(Skill)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared_features', '0001_initial'),
+        # many-to-many tables of job postings and job seekers to skills
+        ('accounts', '0005_prefix_search_indexes'),
+        ('jobs', '0003_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='canonical_name',
+            field=models.CharField(default='', editable=False, max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_canonical_names, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='skill',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_removed', False)), fields=('canonical_name',), name='unique_active_skill_canonical_name'),
+        ),
+    ]
@@ -1,5 +1,22 @@
+import hashlib
+
 from django.contrib import admin
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils import timezone
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date
+
+from rest_framework.response import Response
+
+from shared_features.paginations import EstimatedCountPaginator
+from shared_features.utils.admin_changelist import KeysetChangeList
 
 
 class SoftDeleteMixinQuerySet(models.QuerySet):
@@ -8,8 +25,15 @@ class SoftDeleteMixinQuerySet(models.QuerySet):
     for soft deletion and permanent deletion.
     """
     def delete(self):
-        """Soft deletes the records in the current queryset."""
-        return self.update(is_removed=True)
+        """
+        Soft deletes the records in the current queryset. `updated_at` of
+        timestamped models moves too, as a save would, so incremental
+        readers (e.g. analytics rollups) see the deletion.
+        """
+        fields = {"is_removed": True}
+        if any(field.name == "updated_at" for field in self.model._meta.fields):
+            fields["updated_at"] = timezone.now()
+        return self.update(**fields)
 
     def purge(self):
         """Permanently deletes the records in the current queryset."""
@@ -103,4 +127,117 @@ class ModelAdminMixin(admin.ModelAdmin):
         ordering = self.get_ordering(request)
         if ordering:
             qs = qs.order_by(*ordering)
-        return qs
\ No newline at end of file
+        return qs
+
+
+class ScalableModelAdminMixin(ModelAdminMixin):
+    """
+    ModelAdminMixin for big tables, the changelist never counts or offsets
+    through the whole table:
+        - counts are exact up to a limit and estimated beyond it
+        - "next page" links continue after the last primary key of the page
+        - search_fields should be indexed prefix lookups (`field__startswith`)
+        - list_filter should only hold low cardinality fields
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ("-pk",)
+    change_list_template = "admin/keyset_change_list.html"
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+def set_conditional_headers(response, etag, last_modified=None):
+    """
+    Set validators on a response so clients and CDNs can revalidate it
+    with If-None-Match / If-Modified-Since instead of downloading it again.
+    """
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, no_cache=True)
+    # the same url is served as JSON or MessagePack
+    patch_vary_headers(response, ("Accept",))
+    return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    Mixin for retrieve views of models based on TimeStampMixin.
+
+    Answers conditional GET requests from `updated_at` before the object is
+    loaded or serialized, and keeps the serialized payload in the cache
+    under `detail_cache_key` until the object changes. Callers must delete
+    the cache key when the object (or anything it renders) changes.
+    Object level permissions are not checked, only use it for public reads.
+    """
+
+    detail_cache_key = None
+    detail_cache_timeout = 60 * 15
+
+    def get_detail_cache_key(self, pk):
+        return self.detail_cache_key.format(pk=pk)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        state = (
+            self.filter_queryset(self.get_queryset())
+            .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+            .values_list("pk", "updated_at")
+            .first()
+        )
+        if state is None:
+            raise Http404
+        pk, updated_at = state
+
+        etag = f'W/"{pk}-{updated_at.timestamp()}"'
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=int(updated_at.timestamp())
+        )
+        if not_modified is not None:
+            return set_conditional_headers(not_modified, etag, updated_at)
+
+        cache_key = self.get_detail_cache_key(pk)
+        cached = cache.get(cache_key)
+        if cached is not None and cached[0] == updated_at:
+            data = cached[1]
+        else:
+            instance = self.get_object()
+            data = dict(self.get_serializer(instance).data)
+            updated_at = instance.updated_at
+            etag = f'W/"{pk}-{updated_at.timestamp()}"'
+            cache.set(cache_key, (updated_at, data), self.detail_cache_timeout)
+
+        return set_conditional_headers(Response(data), etag, updated_at)
+
+
+class ConditionalListMixin:
+    """
+    Mixin for list views of models based on TimeStampMixin.
+
+    Builds the ETag from the newest `updated_at` and the row count of the
+    filtered queryset in a single aggregate query, so an unchanged listing
+    returns 304 without fetching or serializing any row. Rows leaving the
+    listing (expired, removed) change the count but not the newest
+    `updated_at`, so no Last-Modified is sent: If-Modified-Since alone
+    would answer 304 for them.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        state = queryset.order_by().aggregate(
+            last_modified=Max("updated_at"), count=Count("pk")
+        )
+        digest = hashlib.md5(
+            f"{state['count']}:{state['last_modified']}".encode()
+        ).hexdigest()
+        etag = f'W/"{digest}"'
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return set_conditional_headers(not_modified, etag)
+
+        response = super().list(request, *args, **kwargs)
+        return set_conditional_headers(response, etag)
@@ -1,32 +1,294 @@
+import json
+import uuid
+from collections import defaultdict
+
 from django.db import models
 from django.conf import settings
 
-from elasticsearch import Elasticsearch
+from shared_features.mixins import ModelMixin, SoftDeleteMixinManager
+from shared_features.utils.metrics import measure_es
+from shared_features.utils.skills import canonical_skill_name
+
+
+class SkillManager(SoftDeleteMixinManager):
+    def resolve_ids(self, names):
+        """
+        ids of free text skill names as {name: id}, names are matched by
+        canonical name and missing skills are created.
+
+        known names are answered by the reference data cache, the rest with
+        one query, missing skills are inserted with one bulk_create
+        (conflicts with concurrent inserts are ignored) and read back.
+        """
+        from shared_features.reference_data import skills
+
+        canonical_names = {}
+        for name in names:
+            canonical_name = canonical_skill_name(name)
+            if canonical_name:
+                canonical_names.setdefault(canonical_name, " ".join(name.split()))
+
+        ids = {}
+        unknown = []
+        for canonical_name in canonical_names:
+            pk = skills.get_id(canonical_name)
+            if pk is None:
+                unknown.append(canonical_name)
+            else:
+                ids[canonical_name] = pk
 
-from shared_features.mixins import ModelMixin
+        if unknown:
+            ids.update(
+                self.filter(canonical_name__in=unknown).values_list(
+                    "canonical_name", "id"
+                )
+            )
+            missing = [
+                canonical_name for canonical_name in unknown if canonical_name not in ids
+            ]
+            if missing:
+                self.bulk_create(
+                    [
+                        self.model(
+                            name=canonical_names[canonical_name],
+                            canonical_name=canonical_name,
+                        )
+                        for canonical_name in missing
+                    ],
+                    ignore_conflicts=True,
+                )
+                ids.update(
+                    self.filter(canonical_name__in=missing).values_list(
+                        "canonical_name", "id"
+                    )
+                )
+                # bulk_create does not send the signals refreshing cached names
+                skills.invalidate()
+
+        return {
+            name: ids[canonical_skill_name(name)]
+            for name in names
+            if canonical_skill_name(name) in ids
+        }
 
 
 class Skill(ModelMixin):
     """Skill model"""
 
     name = models.CharField(max_length=255)
+    # see canonical_skill_name, unique among active skills
+    canonical_name = models.CharField(max_length=255, editable=False)
+
+    objects = SkillManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["canonical_name"],
+                condition=models.Q(is_removed=False),
+                name="unique_active_skill_canonical_name",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.canonical_name = canonical_skill_name(self.name)
+        super().save(*args, **kwargs)
+
+
+TASK_STATUS_CHOICES = (
+    ("queued", "Queued"),
+    ("running", "Running"),
+    ("succeeded", "Succeeded"),
+    ("failed", "Failed"),
+)
+
+
+class Task(models.Model):
+    """
+    call of a registered task function, queued until a worker of manage.py
+    run_workers claims it (see shared_features.task_queue)
+    """
+
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=20, choices=TASK_STATUS_CHOICES, default="queued"
+    )
+    # higher first, then the earliest `run_at`
+    priority = models.SmallIntegerField(default=0)
+    run_at = models.DateTimeField()
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField()
+    # at most one queued task per key, enqueueing it again is a no-op
+    dedup_key = models.CharField(max_length=255, null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedup_key"],
+                condition=models.Q(status="queued"),
+                name="unique_queued_task_dedup_key",
+            ),
+        ]
+        indexes = [
+            # tasks ready to be claimed
+            models.Index(
+                fields=["-priority", "run_at"],
+                condition=models.Q(status="queued"),
+                name="task_ready_idx",
+            ),
+            # leases of crashed workers
+            models.Index(
+                fields=["locked_at"],
+                condition=models.Q(status="running"),
+                name="task_running_idx",
+            ),
+            models.Index(fields=["status", "finished_at"], name="task_finished_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
 
 class ElasticsearchService:
     def __init__(self, hosts=None):
+        # the client package is slow to import, load it with the first service
+        from elasticsearch import Elasticsearch
+
         self.client = Elasticsearch(hosts=settings.ELASTICSEARCH_PARAMETERS["address"])
 
     def index(self, document: dict, index_name: str) -> None:
-        self.client.index(index=index_name, body=document)
+        with measure_es():
+            self.client.index(index=index_name, body=document)
 
     def search(self, query: str, index_name: str) -> list:
-        response = self.client.search(
-            index=index_name, body={"query": {"query_string": {"query": query}}}
-        )
+        with measure_es():
+            response = self.client.search(
+                index=index_name, body={"query": {"query_string": {"query": query}}}
+            )
         return response["hits"]["hits"]
 
+    def query(self, body: dict, index_name: str) -> dict:
+        """
+        run a search request body (query dsl) and return the whole response
+        """
+        with measure_es():
+            return self.client.search(index=index_name, body=body)
+
+    def count(self, query: dict, index_name: str) -> int:
+        with measure_es():
+            return self.client.count(index=index_name, query=query)["count"]
+
+    def create_index(self, index_name: str, mappings: dict) -> bool:
+        """
+        create the index with explicit mappings, returns False when it exists
+        """
+        with measure_es():
+            if self.client.indices.exists(index=index_name):
+                return False
+            self.client.indices.create(index=index_name, mappings=mappings)
+        return True
+
+    def delete_index(self, index_name: str) -> None:
+        with measure_es():
+            self.client.indices.delete(index=index_name, ignore_unavailable=True)
+
+    def delete(self, document_id: str, index_name: str) -> None:
+        with measure_es():
+            self.client.delete(index=index_name, id=document_id)
+
+    def bulk_index(self, documents, index_name: str, chunk_size: int = 500) -> int:
+        """
+        index documents (dicts with `id`) in chunked bulk requests
+        """
+        from elasticsearch.helpers import bulk
+
+        actions = (
+            {"_index": index_name, "_id": document["id"], "_source": document}
+            for document in documents
+        )
+        with measure_es():
+            success, _ = bulk(self.client, actions, chunk_size=chunk_size)
+        return success
+
+    def bulk_delete(self, document_ids, index_name: str, chunk_size: int = 500) -> int:
+        """
+        delete documents by id in chunked bulk requests, missing ones are
+        skipped
+        """
+        from elasticsearch.helpers import bulk
+
+        actions = (
+            {"_op_type": "delete", "_index": index_name, "_id": document_id}
+            for document_id in document_ids
+        )
+        with measure_es():
+            success, _ = bulk(
+                self.client, actions, chunk_size=chunk_size, raise_on_error=False
+            )
+        return success
+
+
+class InMemoryElasticsearchService:
+    """
+    local stand-in of ElasticsearchService for development and load tests,
+    documents are kept in process memory and `search` matches every term of
+    the query as a case-insensitive substring of the document. it has no
+    query dsl (`query`, `count`), callers of those check
+    `elasticsearch_search_enabled()` and fall back to the database.
+    enabled with ELASTICSEARCH_PARAMETERS["backend"] = "memory".
+    """
+
+    def __init__(self, hosts=None):
+        self.indices = defaultdict(dict)
+
+    def index(self, document: dict, index_name: str) -> None:
+        with measure_es():
+            document_id = str(document.get("id", uuid.uuid4().hex))
+            self.indices[index_name][document_id] = document
+
+    def search(self, query: str, index_name: str) -> list:
+        with measure_es():
+            terms = [term for term in query.lower().split() if term != "*"]
+            return [
+                {"_index": index_name, "_id": document_id, "_source": document}
+                for document_id, document in self.indices[index_name].items()
+                if all(term in json.dumps(document).lower() for term in terms)
+            ]
+
+    def create_index(self, index_name: str, mappings: dict) -> bool:
+        created = index_name not in self.indices
+        self.indices.setdefault(index_name, {})
+        return created
+
+    def delete_index(self, index_name: str) -> None:
+        self.indices.pop(index_name, None)
+
     def delete(self, document_id: str, index_name: str) -> None:
-        self.client.delete(index=index_name, id=document_id)
+        with measure_es():
+            self.indices[index_name].pop(str(document_id), None)
+
+    def bulk_index(self, documents, index_name: str, chunk_size: int = 500) -> int:
+        count = 0
+        with measure_es():
+            for document in documents:
+                self.indices[index_name][str(document["id"])] = document
+                count += 1
+        return count
+
+    def bulk_delete(self, document_ids, index_name: str, chunk_size: int = 500) -> int:
+        count = 0
+        with measure_es():
+            for document_id in document_ids:
+                if self.indices[index_name].pop(str(document_id), None) is not None:
+                    count += 1
+        return count
@@ -0,0 +1,48 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from rest_framework.pagination import PageNumberPagination
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    """
+    default page number pagination for list routes
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    admin changelist paginator for big tables, rows are counted exactly up to
+    `count_limit`. beyond that unfiltered lists use the planner estimate of
+    the table (PostgreSQL) and filtered lists report `count_limit`, later
+    rows are reached with keyset "next page" links (KeysetChangeList).
+    """
+
+    count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        # count of a limited subquery, stops after count_limit + 1 rows
+        limited = queryset.order_by()[: self.count_limit + 1].count()
+        if limited <= self.count_limit:
+            return limited
+        return max(self.estimate_count(queryset) or 0, self.count_limit)
+
+    @staticmethod
+    def estimate_count(queryset):
+        connection = connections[queryset.db]
+        if queryset.query.where or connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row and row[0] > 0 else None
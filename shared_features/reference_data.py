@@ -0,0 +1,22 @@
+"""
+reference data caches of the project, see shared_features.utils.reference_data
+"""
+
+from accounts.models import IndustryArea
+
+from .db_routers import PRIMARY
+from .models import Skill
+from .utils.reference_data import ReferenceData
+from .utils.skills import canonical_skill_name
+
+# loaded from the primary, a lagging replica would keep stale names until
+# the snapshot expires
+skills = ReferenceData(
+    "skills",
+    lambda: Skill.objects.using(PRIMARY).values_list("id", "name"),
+    name_key=canonical_skill_name,
+)
+industry_areas = ReferenceData(
+    "industry_areas",
+    lambda: IndustryArea.objects.using(PRIMARY).values_list("id", "name"),
+)
@@ -0,0 +1,110 @@
+import csv
+import io
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .utils.metrics import measure_serialization
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional
+    msgpack = None
+
+
+# fallback for types that orjson and msgpack do not know (Decimal, lazy
+# translation strings, QuerySet, ...), same conversions as JSONRenderer
+encoder_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renderer which serializes to JSON with orjson.
+
+    Falls back to the stdlib based JSONRenderer when orjson is not installed.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            with measure_serialization():
+                return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context):
+            option |= orjson.OPT_INDENT_2
+
+        with measure_serialization():
+            return orjson.dumps(data, default=encoder_default, option=option)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer which serializes to MessagePack, selected with
+    `Accept: application/msgpack`.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if msgpack is None:
+            raise RuntimeError("msgpack must be installed to render MessagePack")
+
+        if data is None:
+            return b""
+
+        with measure_serialization():
+            return msgpack.packb(data, default=encoder_default, use_bin_type=True)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renderer for newline delimited json exports.
+
+    Export views stream their rows themselves, this renderer is used for
+    content negotiation and for rendering error responses as a single line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return ORJSONRenderer().render(data) + b"\n"
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renderer for csv exports.
+
+    Export views stream their rows themselves, this renderer is used for
+    content negotiation and for rendering error responses as a single row.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not isinstance(data, dict):
+            data = {"detail": data}
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(data.keys())
+        writer.writerow(data.values())
+        return output.getvalue().encode(self.charset)
@@ -0,0 +1,101 @@
+from rest_framework import serializers
+
+from .models import Skill
+from .reference_data import skills
+from .utils.metrics import measure_serialization
+
+MAX_SKILLS = 50
+
+
+class MeasuredRepresentationMixin:
+    """
+    counts `to_representation` (what `serializer.data` computes, per item of
+    lists) as serialization time of the request, next to rendering, see
+    PerformanceMetricsMiddleware
+    """
+
+    def to_representation(self, instance):
+        with measure_serialization():
+            return super().to_representation(instance)
+
+
+class ReferencePrimaryKeyField(serializers.IntegerField):
+    """
+    id of a reference table row (skill, industry area), validated from the
+    in-process reference data cache without a query
+
+    params:
+        reference: ReferenceData of the table, see shared_features.reference_data
+    """
+
+    default_error_messages = {
+        "does_not_exist": 'Invalid pk "{pk_value}" - object does not exist.',
+    }
+
+    def __init__(self, reference, **kwargs):
+        self.reference = reference
+        kwargs.setdefault("min_value", 1)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        pk = super().to_internal_value(data)
+        if not self.reference.exists(pk):
+            self.fail("does_not_exist", pk_value=pk)
+        return pk
+
+
+class ReferenceNameField(serializers.Field):
+    """
+    read only name of a reference table row from its id, resolved from the
+    in-process reference data cache without a query
+    """
+
+    def __init__(self, reference, **kwargs):
+        self.reference = reference
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return self.reference.get_name(getattr(value, "pk", value))
+
+
+class SkillsWriteSerializerMixin(serializers.Serializer):
+    """
+    `skill_ids` and `skill_names` write fields of serializers of models with
+    a `skills` relation (job posting, job seeker)
+
+    fields:
+        skill_ids: ids of existing skills
+        skill_names: free text skill names, matched by canonical name and
+            created when missing
+    """
+
+    skill_ids = serializers.ListField(
+        child=ReferencePrimaryKeyField(skills),
+        required=False,
+        write_only=True,
+        max_length=MAX_SKILLS,
+    )
+    skill_names = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        required=False,
+        write_only=True,
+        max_length=MAX_SKILLS,
+    )
+
+    def pop_skill_ids(self, validated_data):
+        """
+        union of `skill_ids` and resolved `skill_names`, None when neither
+        is given (the relation is kept)
+        """
+        if "skill_ids" not in validated_data and "skill_names" not in validated_data:
+            return None
+        skill_ids = set(validated_data.pop("skill_ids", []))
+        skill_names = validated_data.pop("skill_names", [])
+        if skill_names:
+            skill_ids.update(Skill.objects.resolve_ids(skill_names).values())
+        if len(skill_ids) > MAX_SKILLS:
+            raise serializers.ValidationError(
+                {"skill_ids": f"Ensure there are no more than {MAX_SKILLS} skills."}
+            )
+        return skill_ids
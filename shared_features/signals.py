@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from accounts.models import IndustryArea
+
+from .models import Skill
+from .reference_data import industry_areas, skills
+
+# sent by merge_duplicate_skills command with `changed`, {owner model: ids of
+# owners (job postings, job seekers) whose skill rows were rewritten}
+skills_merged = Signal()
+
+# sent once by shared_features.utils.m2m.bulk_set_m2m with `model`,
+# `field_name` and `pks` (ids of `model` rows whose relation changed)
+m2m_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def invalidate_skills(sender, **kwargs):
+    """
+    reload cached skill names in every worker after a skill changes
+    """
+    skills.invalidate()
+
+
+@receiver(post_save, sender=IndustryArea)
+@receiver(post_delete, sender=IndustryArea)
+def invalidate_industry_areas(sender, **kwargs):
+    """
+    reload cached industry area names in every worker after one changes
+    """
+    industry_areas.invalidate()
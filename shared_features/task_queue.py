@@ -0,0 +1,302 @@
+"""
+durable task queue in the database
+
+task functions are registered with `@task` in the `tasks` module of an app
+and queued with `enqueue`, as Task rows of the default database: a task
+queued in a transaction is seen by workers once it commits, and is dropped
+with it on rollback. manage.py run_workers runs them in thread and process
+workers, no broker is needed:
+
+    claiming: ready tasks are locked with SELECT ... FOR UPDATE SKIP LOCKED
+        where the database supports it, so concurrent workers take different
+        rows. elsewhere (sqlite) every row is taken with a conditional
+        UPDATE, the database serializes the writers
+    retries: a failing task is queued again after an exponential backoff
+        with jitter, until it ran `max_attempts` times
+    dedup: a task with a `dedup_key` is not queued while one with the same
+        key waits, the waiting one covers both calls. meant for tasks whose
+        arguments do not change (e.g. none): `enqueue` raises ValueError when
+        the waiting task has other arguments
+    leases: tasks running for over TASK_LEASE_SECONDS (their worker died)
+        are queued again, tasks must be safe to run twice
+    batches: `enqueue_in_transaction` queues one task per transaction for
+        calls taking ids (e.g. reindexing), later calls add their ids to it
+
+arguments are stored as json.
+"""
+
+import datetime
+import json
+import logging
+import random
+import time
+import traceback
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from shared_features.models import Task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 5
+# seconds
+DEFAULT_LEASE = 600
+DEFAULT_RETRY_DELAY = 10
+DEFAULT_RETRY_MAX_DELAY = 3600
+DEFAULT_RETENTION_DAYS = 7
+# characters of the traceback kept in `last_error`
+ERROR_LIMIT = 4000
+
+# registered task functions by name
+tasks = {}
+
+
+def task(function=None, *, name=None, max_attempts=None, retry_delay=None, priority=0):
+    """
+    register a task function, named after its module and name unless
+    `name` is given. usable with or without arguments
+    """
+
+    def register(function):
+        function.task_name = name or f"{function.__module__}.{function.__qualname__}"
+        function.max_attempts = max_attempts or getattr(
+            settings, "TASK_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS
+        )
+        function.retry_delay = retry_delay or getattr(
+            settings, "TASK_RETRY_DELAY", DEFAULT_RETRY_DELAY
+        )
+        function.priority = priority
+        tasks[function.task_name] = function
+        return function
+
+    return register(function) if function is not None else register
+
+
+def enqueue(function, args=(), kwargs=None, dedup_key=None, run_at=None, priority=None):
+    """
+    queue a call of a registered task function to run at `run_at` (now by
+    default). returns the Task, None when a task with `dedup_key` and the
+    same arguments waits, a waiting one with other arguments raises ValueError
+    """
+    queued = Task(
+        name=function.task_name,
+        args=list(args),
+        kwargs=kwargs or {},
+        priority=function.priority if priority is None else priority,
+        run_at=run_at or timezone.now(),
+        max_attempts=function.max_attempts,
+        dedup_key=dedup_key,
+    )
+    if dedup_key is None:
+        queued.save()
+        return queued
+    try:
+        with transaction.atomic():
+            queued.save()
+    except IntegrityError:
+        waiting = (
+            Task.objects.filter(dedup_key=dedup_key, status="queued")
+            .values_list("args", "kwargs")
+            .first()
+        )
+        # compared as stored, tuples come back as lists
+        if waiting is not None and list(waiting) != json.loads(
+            json.dumps([queued.args, queued.kwargs])
+        ):
+            raise ValueError(
+                f"task {dedup_key} is queued with other arguments, dedup keys "
+                "must identify the arguments"
+            )
+        return None
+    return queued
+
+
+def enqueue_in_transaction(function, ids, pending):
+    """
+    queue `function(ids)` once for the current transaction: the first call
+    queues a task, the next ones add their ids to it while it waits.
+    `pending` is a threading.local of the caller, as every thread has its
+    own connection
+    """
+    queued = getattr(pending, "task", None)
+    if queued is not None:
+        merged = sorted(set(queued.args[0]) | set(ids))
+        # gone when its transaction was rolled back
+        if Task.objects.filter(
+            pk=queued.pk, name=queued.name, status="queued"
+        ).update(args=[merged]):
+            queued.args = [merged]
+            return queued
+    pending.task = enqueue(function, args=[sorted(set(ids))])
+    # later transactions queue their own task
+    transaction.on_commit(lambda: setattr(pending, "task", None))
+    return pending.task
+
+
+def claim_tasks(worker_id, limit=1):
+    """
+    mark up to `limit` ready tasks as running by `worker_id` and return them
+    """
+    now = timezone.now()
+    ready = Task.objects.filter(status="queued", run_at__lte=now).order_by(
+        "-priority", "run_at", "pk"
+    )
+    claim = {
+        "status": "running",
+        "locked_by": worker_id,
+        "locked_at": now,
+        "attempts": F("attempts") + 1,
+    }
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            claimed = list(ready.select_for_update(skip_locked=True)[:limit])
+            pks = [queued.pk for queued in claimed]
+            Task.objects.filter(pk__in=pks).update(**claim)
+    else:
+        claimed = []
+        for queued in ready[: limit * 4]:
+            # another worker may have taken it since it was read
+            if Task.objects.filter(pk=queued.pk, status="queued").update(**claim):
+                claimed.append(queued)
+                if len(claimed) == limit:
+                    break
+    for queued in claimed:
+        queued.status, queued.locked_by, queued.locked_at = "running", worker_id, now
+        queued.attempts += 1
+    return claimed
+
+
+def retry_delay(queued, function):
+    """
+    seconds before the next attempt, doubled per attempt with jitter
+    """
+    delay = min(
+        function.retry_delay * 2 ** (queued.attempts - 1),
+        getattr(settings, "TASK_RETRY_MAX_DELAY", DEFAULT_RETRY_MAX_DELAY),
+    )
+    return delay * random.uniform(0.5, 1.0)
+
+
+def run_task(queued, worker_id, metrics):
+    """
+    call the function of a claimed task and record the outcome, unless the
+    lease expired and the task was claimed again meanwhile
+    """
+    function = tasks.get(queued.name)
+    started = time.monotonic()
+    update = {"locked_by": "", "locked_at": None}
+    try:
+        if function is None:
+            raise LookupError(f"task {queued.name} is not registered")
+        function(*queued.args, **queued.kwargs)
+    except Exception:
+        logger.exception("task %s #%s failed", queued.name, queued.pk)
+        update["last_error"] = traceback.format_exc()[-ERROR_LIMIT:]
+        if function is not None and queued.attempts < queued.max_attempts:
+            outcome = "retried"
+            update["status"] = "queued"
+            update["run_at"] = timezone.now() + datetime.timedelta(
+                seconds=retry_delay(queued, function)
+            )
+        else:
+            outcome = "failed"
+    else:
+        outcome = "succeeded"
+    if outcome != "retried":
+        update.update(status=outcome, finished_at=timezone.now())
+
+    owned = Task.objects.filter(pk=queued.pk, status="running", locked_by=worker_id)
+    try:
+        with transaction.atomic():
+            owned.update(**update)
+    except IntegrityError:
+        # a task with the same dedup key was queued while this one ran
+        outcome = "failed"
+        owned.update(
+            status="failed",
+            finished_at=timezone.now(),
+            last_error=update.get("last_error", ""),
+            locked_by="",
+            locked_at=None,
+        )
+    metrics.observe(
+        queued.name,
+        outcome,
+        time.monotonic() - started,
+        (queued.locked_at - queued.run_at).total_seconds(),
+    )
+    return outcome
+
+
+def release_expired_leases():
+    """
+    queue tasks of dead workers again, tasks that used up their attempts or
+    whose dedup key is queued meanwhile fail. returns the number released
+    """
+    now = timezone.now()
+    lease = getattr(settings, "TASK_LEASE_SECONDS", DEFAULT_LEASE)
+    expired = Task.objects.filter(
+        status="running", locked_at__lt=now - datetime.timedelta(seconds=lease)
+    )
+    failed = {
+        "status": "failed",
+        "finished_at": now,
+        "last_error": "lease expired",
+        "locked_by": "",
+        "locked_at": None,
+    }
+    released = expired.filter(attempts__gte=F("max_attempts")).update(**failed)
+    for pk in expired.values_list("pk", flat=True):
+        lost = Task.objects.filter(pk=pk, status="running")
+        try:
+            with transaction.atomic():
+                released += lost.update(
+                    status="queued",
+                    run_at=now,
+                    last_error="lease expired",
+                    locked_by="",
+                    locked_at=None,
+                )
+        except IntegrityError:
+            released += lost.update(**failed)
+    return released
+
+
+def purge_finished_tasks():
+    """
+    delete tasks finished over TASK_RETENTION_DAYS ago
+    """
+    retention = getattr(settings, "TASK_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)
+    deleted, _ = Task.objects.filter(
+        status__in=("succeeded", "failed"),
+        finished_at__lt=timezone.now() - datetime.timedelta(days=retention),
+    ).delete()
+    return deleted
+
+
+def ready_count():
+    return Task.objects.filter(status="queued", run_at__lte=timezone.now()).count()
+
+
+def work(worker_id, stop, metrics, poll_interval=1.0, burst=False):
+    """
+    loop of one worker thread: claim a task, run it, wait `poll_interval`
+    (with jitter) when none is ready. returns once `stop` is set, or when no
+    task is ready with `burst`
+    """
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            claimed = claim_tasks(worker_id)
+            if not claimed:
+                if burst:
+                    return
+                stop.wait(poll_interval * random.uniform(0.5, 1.5))
+            for queued in claimed:
+                run_task(queued, worker_id, metrics)
+    finally:
+        # every thread has its own connection
+        connection.close()
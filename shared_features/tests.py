@@ -1,3 +1,366 @@
-from django.test import TestCase
+import datetime
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import JobSeeker, User
+
+from .models import Skill, Task
+from .signals import m2m_bulk_changed
+from .task_queue import (
+    claim_tasks,
+    enqueue,
+    enqueue_in_transaction,
+    release_expired_leases,
+    run_task,
+    task,
+    tasks,
+)
+from .utils import minhash
+from .utils.m2m import bulk_set_m2m
+from .utils.skills import canonical_skill_name, merge_skills
+from .utils.metrics import (
+    METRICS_ARCHIVE,
+    MetricsRegistry,
+    RequestMetrics,
+    TaskMetrics,
+    archive_worker_metrics,
+)
+
+calls = []
+
+
+@task(name="tests.record")
+def record(*args, **kwargs):
+    calls.append((args, kwargs))
+
+
+@task(name="tests.fail", max_attempts=2, retry_delay=60)
+def fail():
+    raise RuntimeError("always")
+
+
+class TaskQueueTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        tasks.pop("tests.record", None)
+        tasks.pop("tests.fail", None)
+
+    def setUp(self):
+        calls.clear()
+        self.metrics = TaskMetrics()
+
+    def claim_one(self, worker_id="worker-1"):
+        claimed = claim_tasks(worker_id)
+        self.assertEqual(len(claimed), 1)
+        return claimed[0]
+
+    def test_claims_ready_tasks_by_priority_once(self):
+        low = enqueue(record, args=[1])
+        high = enqueue(record, args=[2], priority=10)
+        enqueue(record, run_at=timezone.now() + datetime.timedelta(hours=1))
+
+        claimed = claim_tasks("worker-1", limit=5)
+
+        self.assertEqual([queued.pk for queued in claimed], [high.pk, low.pk])
+        self.assertEqual(claim_tasks("worker-2", limit=5), [])
+        high.refresh_from_db()
+        self.assertEqual(
+            (high.status, high.locked_by, high.attempts), ("running", "worker-1", 1)
+        )
+
+    def test_succeeded_task_is_finished(self):
+        enqueue(record, args=[1, [2, 3]], kwargs={"name": "a"})
+        queued = self.claim_one()
+
+        self.assertEqual(run_task(queued, "worker-1", self.metrics), "succeeded")
+
+        self.assertEqual(calls, [((1, [2, 3]), {"name": "a"})])
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, "succeeded")
+        self.assertIsNotNone(queued.finished_at)
+        self.assertEqual(queued.locked_by, "")
+
+    def test_failed_task_is_retried_later_until_attempts_run_out(self):
+        enqueue(fail)
+        queued = self.claim_one()
+
+        self.assertEqual(run_task(queued, "worker-1", self.metrics), "retried")
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, "queued")
+        self.assertGreater(queued.run_at, timezone.now())
+        self.assertIn("RuntimeError: always", queued.last_error)
+        self.assertEqual(claim_tasks("worker-1"), [])
+
+        Task.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        queued = self.claim_one()
+        self.assertEqual(run_task(queued, "worker-1", self.metrics), "failed")
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ("failed", 2))
+
+    def test_unregistered_task_fails(self):
+        Task.objects.create(name="tests.missing", run_at=timezone.now(), max_attempts=1)
+        queued = self.claim_one()
+
+        self.assertEqual(run_task(queued, "worker-1", self.metrics), "failed")
+        self.assertIn("not registered", Task.objects.get(pk=queued.pk).last_error)
+
+    def test_dedup_key_collapses_waiting_calls(self):
+        first = enqueue(record, args=[1], dedup_key="record")
+
+        self.assertIsNone(enqueue(record, args=(1,), dedup_key="record"))
+        with self.assertRaises(ValueError):
+            enqueue(record, args=[2], dedup_key="record")
+
+        # a running task does not cover later calls
+        self.claim_one()
+        second = enqueue(record, args=[1], dedup_key="record")
+        self.assertNotEqual(second.pk, first.pk)
+
+    def test_one_task_per_transaction(self):
+        pending = threading.local()
+        with self.captureOnCommitCallbacks(execute=True):
+            first = enqueue_in_transaction(record, [3, 1], pending)
+            enqueue_in_transaction(record, [2, 3], pending)
+        second = enqueue_in_transaction(record, [4], pending)
+
+        self.assertEqual(
+            list(Task.objects.order_by("pk").values_list("pk", "args")),
+            [(first.pk, [[1, 2, 3]]), (second.pk, [[4]])],
+        )
+
+    def test_rolled_back_transaction_task_is_queued_again(self):
+        pending = threading.local()
+        with transaction.atomic():
+            enqueue_in_transaction(record, [1], pending)
+            transaction.set_rollback(True)
+
+        queued = enqueue_in_transaction(record, [2], pending)
+
+        self.assertEqual(
+            list(Task.objects.values_list("pk", "args")), [(queued.pk, [[2]])]
+        )
+
+    @override_settings(TASK_LEASE_SECONDS=60)
+    def test_expired_leases_are_released(self):
+        enqueue(record)
+        enqueue(fail)
+        claimed = claim_tasks("worker-1", limit=2)
+        exhausted = next(queued for queued in claimed if queued.name == "tests.fail")
+        Task.objects.filter(pk=exhausted.pk).update(attempts=2)
+        Task.objects.update(locked_at=timezone.now() - datetime.timedelta(minutes=5))
+
+        self.assertEqual(release_expired_leases(), 2)
+
+        statuses = dict(Task.objects.values_list("name", "status"))
+        self.assertEqual(statuses, {"tests.record": "queued", "tests.fail": "failed"})
+
+    @override_settings(TASK_LEASE_SECONDS=60)
+    def test_outcome_of_a_lost_lease_is_dropped(self):
+        enqueue(record)
+        lost = self.claim_one("worker-1")
+        Task.objects.update(locked_at=timezone.now() - datetime.timedelta(minutes=5))
+        release_expired_leases()
+        self.claim_one("worker-2")
+
+        run_task(lost, "worker-1", self.metrics)
+
+        queued = Task.objects.get(pk=lost.pk)
+        self.assertEqual((queued.status, queued.locked_by), ("running", "worker-2"))
+
+
+class MetricsRegistryTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write_worker(self, pid, requests):
+        worker = MetricsRegistry()
+        for _ in range(requests):
+            worker.observe("GET", "jobs", 200, RequestMetrics())
+        (self.directory / f"{pid}.json").write_text(json.dumps(worker.state()))
+
+    def test_renders_the_sum_of_live_and_exited_workers(self):
+        self.write_worker(1, requests=2)
+        self.write_worker(2, requests=3)
+        archive_worker_metrics(self.directory, 1)
+        self.write_worker(3, requests=1)
+        archive_worker_metrics(self.directory, 3)
+
+        with override_settings(METRICS_DIRECTORY=str(self.directory)):
+            rendered = MetricsRegistry().render_all()
+
+        self.assertIn(
+            'http_requests_total{method="GET",route="jobs",status="200"} 6',
+            rendered,
+        )
+        self.assertIn(
+            'http_request_duration_seconds_count{method="GET",route="jobs"} 6',
+            rendered,
+        )
+        # the rendering process writes its own registry next to the others
+        self.assertEqual(
+            {path.name for path in self.directory.glob("*.json")},
+            {"2.json", f"{os.getpid()}.json", METRICS_ARCHIVE},
+        )
+
+
+class MinHashTests(TestCase):
+    text = "Backend developer for our Django and PostgreSQL job search platform"
+
+    def test_shingles_ignore_case_and_punctuation(self):
+        self.assertEqual(
+            minhash.shingles("Senior, Django developer!"),
+            {"senior django developer"},
+        )
+        self.assertEqual(minhash.shingles("a b c d"), {"a b c", "b c d"})
+        self.assertIsNone(minhash.signature(" - "))
+
+    def test_similar_texts_share_buckets(self):
+        values = minhash.signature(self.text)
+        same = minhash.signature(self.text.upper() + ".")
+        other = minhash.signature("Night shift nurse for a small clinic downtown")
+
+        self.assertEqual(minhash.similarity(values, same), 1.0)
+        self.assertLess(minhash.similarity(values, other), 0.2)
+        self.assertEqual(minhash.band_buckets(values), minhash.band_buckets(same))
+        self.assertFalse(
+            set(minhash.band_buckets(values)) & set(minhash.band_buckets(other))
+        )
+        self.assertEqual(minhash.unpack(minhash.pack(values)), values)
+
+
+class BulkSetM2MTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.skills = [Skill.objects.create(name=f"skill {index}") for index in range(4)]
+        cls.job_seekers = [
+            JobSeeker.objects.create(
+                user=User.objects.create_user(
+                    email=f"seeker{index}@example.com", usage_type="JobSeeker"
+                )
+            )
+            for index in range(20)
+        ]
+
+    def skill_ids(self, job_seeker):
+        return set(job_seeker.skills.values_list("pk", flat=True))
+
+    def test_applies_the_difference_with_one_notification(self):
+        first, second = self.job_seekers[:2]
+        s0, s1, s2, _ = [skill.pk for skill in self.skills]
+        first.skills.set([s0, s1])
+        second.skills.set([s2])
+
+        with mock.patch.object(m2m_bulk_changed, "send") as send:
+            changed = bulk_set_m2m(
+                JobSeeker, "skills", {first.pk: [s1, s2], second.pk: [s2]}
+            )
+
+        self.assertEqual(changed, {first.pk})
+        self.assertEqual(self.skill_ids(first), {s1, s2})
+        self.assertEqual(self.skill_ids(second), {s2})
+        send.assert_called_once_with(
+            sender=JobSeeker.skills.through,
+            model=JobSeeker,
+            field_name="skills",
+            pks={first.pk},
+        )
+
+    def test_queries_do_not_grow_with_owners(self):
+        skill_ids = [skill.pk for skill in self.skills]
+        for owners in (self.job_seekers[:2], self.job_seekers):
+            with self.subTest(owners=len(owners)):
+                for job_seeker in owners:
+                    job_seeker.skills.set(skill_ids[:2])
+                # one read, one delete, one insert, inside a savepoint
+                with mock.patch.object(m2m_bulk_changed, "send"):
+                    with self.assertNumQueries(5):
+                        bulk_set_m2m(
+                            JobSeeker,
+                            "skills",
+                            {job_seeker.pk: skill_ids[1:] for job_seeker in owners},
+                        )
+
+    def test_unchanged_relations_are_not_written(self):
+        job_seeker = self.job_seekers[0]
+        job_seeker.skills.set([self.skills[0].pk])
+
+        with mock.patch.object(m2m_bulk_changed, "send") as send:
+            with self.assertNumQueries(3):
+                changed = bulk_set_m2m(
+                    JobSeeker, "skills", {job_seeker.pk: [self.skills[0].pk]}
+                )
+
+        self.assertEqual(changed, set())
+        send.assert_not_called()
+
+
+class SkillTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = Skill.objects.create(name="Python")
+
+    def test_canonical_names_ignore_case_spacing_and_width(self):
+        full_width = "\uff30\uff59\uff54\uff48\uff4f\uff4e"
+        for name in ("Python", " python ", "PYTHON", full_width):
+            with self.subTest(name=name):
+                self.assertEqual(canonical_skill_name(name), "python")
+        self.assertEqual(
+            canonical_skill_name("Machine \t Learning"), "machine learning"
+        )
+
+    def test_resolve_ids_matches_canonical_names_and_creates_missing(self):
+        ids = Skill.objects.resolve_ids(
+            [" PYTHON ", "Machine  Learning", "machine learning", "  "]
+        )
+
+        created = Skill.objects.get(canonical_name="machine learning")
+        self.assertEqual(created.name, "Machine Learning")
+        self.assertEqual(
+            ids,
+            {
+                " PYTHON ": self.python.pk,
+                "Machine  Learning": created.pk,
+                "machine learning": created.pk,
+            },
+        )
+        self.assertEqual(
+            Skill.objects.resolve_ids(["Machine learning"]),
+            {"Machine learning": created.pk},
+        )
+        self.assertEqual(Skill.objects.count(), 2)
+
+    def test_merge_rewrites_rows_and_drops_redundant_ones(self):
+        duplicate = Skill.objects.create(name="Python 3")
+        both, only_duplicate, unrelated = [
+            JobSeeker.objects.create(
+                user=User.objects.create_user(
+                    email=f"seeker{index}@example.com", usage_type="JobSeeker"
+                )
+            )
+            for index in range(3)
+        ]
+        both.skills.set([self.python, duplicate])
+        only_duplicate.skills.set([duplicate])
+        unrelated.skills.set([self.python])
+
+        changed = merge_skills(Skill, {self.python.pk: [duplicate.pk]})
+
+        self.assertEqual(changed, {JobSeeker: {both.pk, only_duplicate.pk}})
+        for job_seeker in (both, only_duplicate, unrelated):
+            self.assertEqual(
+                list(job_seeker.skills.values_list("pk", flat=True)), [self.python.pk]
+            )
+        self.assertFalse(Skill.objects.filter(pk=duplicate.pk).exists())
+        self.assertTrue(Skill.objects.everything().get(pk=duplicate.pk).is_removed)
@@ -0,0 +1,52 @@
+from django.contrib.admin.views.main import ChangeList
+
+# primary key of the last row of the previous page
+CURSOR_VAR = "after"
+
+
+class KeysetChangeList(ChangeList):
+    """
+    changelist with keyset "next page" navigation, pages after the first are
+    read with `pk < after` instead of an OFFSET over every previous row.
+    used while the list is ordered by `-pk` only (the default order of
+    ScalableModelAdminMixin), sorting by a column falls back to page numbers.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        cursor = request.GET.get(CURSOR_VAR, "")
+        self.cursor = int(cursor) if cursor.isdigit() else None
+        self.keyset = False
+        self.next_page_url = None
+        super().__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # links to other filters, orderings and page numbers start from the top
+        return super().get_query_string(
+            {CURSOR_VAR: None, **(new_params or {})}, remove
+        )
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        # the admin ordering may be repeated, e.g. ("-pk", "-pk")
+        descending_pk = {"-pk", f"-{self.lookup_opts.pk.attname}"}
+        ordering = set(qs.query.order_by)
+        self.keyset = bool(ordering) and ordering <= descending_pk
+        if self.keyset and self.cursor is not None:
+            qs = qs.filter(pk__lt=self.cursor)
+            self.page_num = 1
+        return qs
+
+    def get_results(self, request):
+        super().get_results(request)
+        if not (self.keyset and self.multi_page) or self.show_all:
+            return
+        results = self.result_list
+        if len(results) == self.list_per_page:
+            self.next_page_url = self.get_query_string(
+                {CURSOR_VAR: results[len(results) - 1].pk}
+            )
@@ -1,6 +1,24 @@
-from ..models import ElasticsearchService
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject, cached_property
 
-es_service = ElasticsearchService()
+from ..models import ElasticsearchService, InMemoryElasticsearchService
+
+
+def create_es_service():
+    if settings.ELASTICSEARCH_PARAMETERS.get("backend") == "memory":
+        return InMemoryElasticsearchService()
+    return ElasticsearchService()
+
+
+# created on first use, importing this module does not build a client
+es_service = SimpleLazyObject(create_es_service)
+
+
+def elasticsearch_search_enabled():
+    """
+    False with the in-memory backend, which has no query dsl
+    """
+    return settings.ELASTICSEARCH_PARAMETERS.get("backend") != "memory"
 
 
 def index_document(sender, index_name, document):
@@ -21,3 +39,48 @@ def delete_document(document_id, index_name):
     """
 
     es_service.delete(document_id=str(document_id), index_name=index_name)
+
+
+class SearchResults:
+    """
+    lazy sequence of the rows matching a search body, sliced by django's
+    Paginator: `count()` sends a count request and a slice one search request
+    for the ids of that page, the rows come from `queryset` so removed rows
+    still in the index are left out.
+
+    subclasses serving stored documents set `source` (fields to return) and
+    override `load`.
+    """
+
+    source = False
+
+    def __init__(self, body, queryset, index_name):
+        self.body = body
+        self.queryset = queryset
+        self.index_name = index_name
+
+    @cached_property
+    def total(self):
+        return es_service.count(self.body["query"], self.index_name)
+
+    def count(self):
+        return self.total
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError("search results only support slicing")
+        start = key.start or 0
+        size = max((key.stop or self.total) - start, 0)
+        response = es_service.query(
+            {**self.body, "from": start, "size": size, "_source": self.source},
+            self.index_name,
+        )
+        return self.load(response["hits"]["hits"])
+
+    def load(self, hits):
+        ids = [int(hit["_id"]) for hit in hits]
+        rows = self.queryset.in_bulk(ids)
+        return [rows[pk] for pk in ids if pk in rows]
@@ -0,0 +1,95 @@
+"""
+offline geocoding of city names with a bundled gazetteer
+
+the gazetteer (shared_features/data/gazetteer.csv, GAZETTEER_PATH setting)
+lists cities with their coordinates and alternative spellings. names are
+compared by `normalize_city`, unknown cities keep their normalized name
+without coordinates.
+"""
+
+import csv
+import functools
+import math
+import unicodedata
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+
+DEFAULT_GAZETTEER_PATH = (
+    Path(__file__).resolve().parent.parent / "data" / "gazetteer.csv"
+)
+EARTH_RADIUS_KM = 6371.0088
+
+# arabic letters typed on persian keyboards and the zero width non-joiner
+CITY_NAME_REPLACEMENTS = str.maketrans({"ي": "ی", "ك": "ک", "\u200c": " ", "-": " "})
+
+
+class Location(NamedTuple):
+    city: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+
+def normalize_city(name):
+    """
+    key of a city name: "Bandar-e Abbas", " bandar-e  abbas" share one key
+    """
+    name = unicodedata.normalize("NFKC", name or "").translate(CITY_NAME_REPLACEMENTS)
+    return " ".join(name.split()).casefold()
+
+
+@functools.lru_cache(maxsize=None)
+def load_gazetteer(path):
+    """
+    {normalized name or alias: Location}, the location city is the
+    normalized main name of the gazetteer row
+    """
+    locations = {}
+    with open(path, newline="", encoding="utf-8") as gazetteer:
+        for row in csv.DictReader(gazetteer):
+            location = Location(
+                normalize_city(row["name"]),
+                float(row["latitude"]),
+                float(row["longitude"]),
+            )
+            for name in (row["name"], *row["aliases"].split("|")):
+                if name.strip():
+                    locations.setdefault(normalize_city(name), location)
+    return locations
+
+
+def gazetteer():
+    return load_gazetteer(getattr(settings, "GAZETTEER_PATH", DEFAULT_GAZETTEER_PATH))
+
+
+def geocode_city(name):
+    """
+    Location of a city name, without coordinates when it is not in the
+    gazetteer and with an empty city when the name is blank
+    """
+    key = normalize_city(name)
+    return gazetteer().get(key) or Location(key)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    (min latitude, max latitude, min longitude, max longitude) around a
+    point, contains every point within `radius_km` (cheap indexed pre-filter
+    of an exact distance check). longitudes are not limited near the poles
+    or when the box crosses the antimeridian
+    """
+    latitude_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_latitude = latitude - latitude_delta
+    max_latitude = latitude + latitude_delta
+    if min_latitude <= -90 or max_latitude >= 90:
+        return max(min_latitude, -90.0), min(max_latitude, 90.0), -180.0, 180.0
+
+    longitude_delta = math.degrees(
+        radius_km / EARTH_RADIUS_KM / math.cos(math.radians(latitude))
+    )
+    min_longitude = longitude - longitude_delta
+    max_longitude = longitude + longitude_delta
+    if min_longitude < -180 or max_longitude > 180:
+        return min_latitude, max_latitude, -180.0, 180.0
+    return min_latitude, max_latitude, min_longitude, max_longitude
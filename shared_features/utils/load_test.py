@@ -0,0 +1,331 @@
+"""
+load test harness driven by the sample postman collection
+
+requests are taken from the collection (method, headers, body) and replayed
+in weighted scenarios by concurrent virtual users. latencies are reported
+per step as p50/p95/p99 and throughput as requests per second.
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+COMMENT_LINE = re.compile(r"^\s*//.*$", re.MULTILINE)
+VARIABLE = re.compile(r"{{\s*(\w+)\s*}}")
+
+DEFAULT_PASSWORD = "StrongPassword123!"
+
+# scenario name -> default weight
+DEFAULT_SCENARIO_WEIGHTS = {
+    "register": 1,
+    "auth": 4,
+    "browse": 10,
+    "apply": 2,
+}
+
+
+class PostmanCollection:
+    """
+    requests of a postman collection (v2.1) keyed by url path
+    """
+
+    def __init__(self, path):
+        with open(path) as collection_file:
+            collection = json.load(collection_file)
+        self.requests = {}
+        self.collect(collection["item"])
+
+    def collect(self, items):
+        for item in items:
+            if "item" in item:
+                self.collect(item["item"])
+                continue
+            request = item["request"]
+            raw_body = request.get("body", {}).get("raw")
+            self.requests[self.url_path(request["url"]["raw"])] = {
+                "name": item["name"],
+                "method": request["method"],
+                "headers": {
+                    header["key"]: header["value"]
+                    for header in request.get("header", [])
+                    if not header.get("disabled")
+                },
+                # postman allows // comments in raw json bodies
+                "body": json.loads(COMMENT_LINE.sub("", raw_body)) if raw_body else None,
+            }
+
+    @staticmethod
+    def url_path(raw_url):
+        return raw_url.replace("{{base_url}}", "", 1)
+
+    def get(self, path):
+        return self.requests[path]
+
+
+class LoadTestClient:
+    """
+    replays collection requests against `base_url`, overriding body fields
+    and filling `{{variables}}`
+    """
+
+    def __init__(self, collection, base_url, timeout=30):
+        self.collection = collection
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, path, variables=None, body=None):
+        """
+        returns (status code, parsed json body or None, seconds)
+        """
+        variables = variables or {}
+        template = self.collection.get(path)
+
+        def fill(value):
+            return VARIABLE.sub(lambda match: str(variables.get(match[1], "")), value)
+
+        data = None
+        if template["body"] is not None:
+            data = json.dumps({**template["body"], **(body or {})}).encode()
+        request = urllib.request.Request(
+            self.base_url + fill(path),
+            data=data,
+            method=template["method"],
+            headers={key: fill(value) for key, value in template["headers"].items()},
+        )
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                status, content = response.status, response.read()
+        except urllib.error.HTTPError as error:
+            status, content = error.code, error.read()
+        except (urllib.error.URLError, OSError):
+            status, content = 0, b""
+        elapsed = time.perf_counter() - start
+
+        try:
+            parsed = json.loads(content) if content else None
+        except ValueError:
+            parsed = None
+        return status, parsed, elapsed
+
+
+class LoadTestResults:
+    """
+    thread safe latency samples per step
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.throttled = defaultdict(int)
+
+    def add(self, step, status, elapsed):
+        with self.lock:
+            self.samples[step].append(elapsed)
+            if status == 429:
+                self.throttled[step] += 1
+            elif not 200 <= status < 400:
+                self.errors[step] += 1
+
+    @staticmethod
+    def percentile(sorted_samples, percent):
+        """
+        nearest-rank percentile
+        """
+        if not sorted_samples:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * len(sorted_samples)))
+        return sorted_samples[rank - 1]
+
+    def summary(self, duration):
+        def describe(samples, errors, throttled):
+            samples = sorted(samples)
+            return {
+                "count": len(samples),
+                "errors": errors,
+                "throttled": throttled,
+                "rps": round(len(samples) / duration, 2) if duration else 0.0,
+                "mean_ms": round(sum(samples) / len(samples) * 1000, 2) if samples else 0.0,
+                "p50_ms": round(self.percentile(samples, 50) * 1000, 2),
+                "p95_ms": round(self.percentile(samples, 95) * 1000, 2),
+                "p99_ms": round(self.percentile(samples, 99) * 1000, 2),
+            }
+
+        with self.lock:
+            steps = {
+                step: describe(samples, self.errors[step], self.throttled[step])
+                for step, samples in sorted(self.samples.items())
+            }
+            total = describe(
+                [sample for samples in self.samples.values() for sample in samples],
+                sum(self.errors.values()),
+                sum(self.throttled.values()),
+            )
+        return {"total": total, "steps": steps}
+
+
+class LoadTest:
+    """
+    weighted scenarios run by `concurrency` virtual users for `duration` seconds
+
+    scenarios:
+        register: register a new job seeker or employer
+        auth: login, refresh token, logout
+        browse: job posting list, then detail of one posting from the page
+        apply: batch apply of a logged in job seeker to a few postings
+    """
+
+    def __init__(self, client, weights, users=20, seed=0):
+        self.client = client
+        self.weights = {name: weight for name, weight in weights.items() if weight > 0}
+        self.users = users
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.results = LoadTestResults()
+        self.run_id = f"{int(time.time())}{seed}"
+        self.counter = 0
+        self.pool = []
+        self.access_tokens = []
+        self.job_posting_ids = []
+
+    def pool_email(self, index):
+        return f"loadtest_{index}@example.com"
+
+    def setup(self, provision_user=None):
+        """
+        create the pool of job seekers used by auth and apply scenarios,
+        `provision_user(email)` may create them without the api (which is
+        rate limited) and return an access token
+        """
+        for index in range(self.users):
+            email = self.pool_email(index)
+            if provision_user is not None:
+                access_token = provision_user(email)
+            else:
+                access_token = self.register_and_login(email)
+            self.pool.append(email)
+            if access_token:
+                self.access_tokens.append(access_token)
+
+        status, body, _ = self.client.request("/api/jobs/v1/job-postings/")
+        if status == 200:
+            self.job_posting_ids = [item["id"] for item in body.get("results", [])]
+
+    def register_and_login(self, email):
+        self.client.request(
+            "/api/accounts/v1/jobseeker-register/",
+            body={"email": email, "password": DEFAULT_PASSWORD, "password2": DEFAULT_PASSWORD},
+        )
+        status, body, _ = self.client.request(
+            "/api/accounts/v1/login/",
+            body={"email": email, "password": DEFAULT_PASSWORD},
+        )
+        return body["access"] if status == 200 else None
+
+    def choice(self, sequence):
+        with self.random_lock:
+            return self.random.choice(sequence)
+
+    def pick_scenario(self):
+        names = list(self.weights)
+        with self.random_lock:
+            return self.random.choices(names, [self.weights[name] for name in names])[0]
+
+    def step(self, name, path, variables=None, body=None):
+        status, parsed, elapsed = self.client.request(path, variables, body)
+        self.results.add(name, status, elapsed)
+        return status, parsed
+
+    def scenario_register(self):
+        with self.random_lock:
+            self.counter += 1
+            email = f"loadtest_{self.run_id}_{self.counter}@example.com"
+        path = self.choice(
+            ("/api/accounts/v1/jobseeker-register/", "/api/accounts/v1/employer-register/")
+        )
+        self.step(
+            "register",
+            path,
+            body={"email": email, "password": DEFAULT_PASSWORD, "password2": DEFAULT_PASSWORD},
+        )
+
+    def scenario_auth(self):
+        status, tokens = self.step(
+            "login",
+            "/api/accounts/v1/login/",
+            body={"email": self.choice(self.pool), "password": DEFAULT_PASSWORD},
+        )
+        if status != 200:
+            return
+        status, refreshed = self.step(
+            "refresh", "/api/accounts/v1/token/refresh/", body={"refresh": tokens["refresh"]}
+        )
+        if status == 200:
+            tokens.update(refreshed)
+        self.step(
+            "logout",
+            "/api/accounts/v1/logout/",
+            variables={"access_token": tokens["access"]},
+            body={"refresh": tokens["refresh"]},
+        )
+
+    def scenario_browse(self):
+        status, page = self.step("job_posting_list", "/api/jobs/v1/job-postings/")
+        results = page.get("results") if status == 200 and page else None
+        if results:
+            self.step(
+                "job_posting_detail",
+                "/api/jobs/v1/job-postings/{{job_posting_id}}/",
+                variables={"job_posting_id": self.choice(results)["id"]},
+            )
+
+    def scenario_apply(self):
+        if not self.access_tokens or not self.job_posting_ids:
+            return
+        with self.random_lock:
+            job_posting_ids = self.random.sample(
+                self.job_posting_ids, min(5, len(self.job_posting_ids))
+            )
+        self.step(
+            "batch_apply",
+            "/api/jobs/v1/applications/batch-apply/",
+            variables={"access_token": self.choice(self.access_tokens)},
+            body={"job_posting_ids": job_posting_ids},
+        )
+
+    def virtual_user(self, deadline):
+        while time.monotonic() < deadline:
+            getattr(self, f"scenario_{self.pick_scenario()}")()
+
+    def run(self, duration, concurrency):
+        start = time.monotonic()
+        deadline = start + duration
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [
+                executor.submit(self.virtual_user, deadline) for _ in range(concurrency)
+            ]:
+                future.result()
+        return self.results.summary(time.monotonic() - start)
+
+
+def compare_results(previous, current):
+    """
+    rows of (step, p95 before, p95 now, rps before, rps now) of two saved runs
+    """
+    rows = []
+    for step in ["total"] + sorted(current["steps"]):
+        before = previous["total"] if step == "total" else previous["steps"].get(step)
+        now = current["total"] if step == "total" else current["steps"][step]
+        if before is None:
+            continue
+        rows.append((step, before["p95_ms"], now["p95_ms"], before["rps"], now["rps"]))
+    return rows
@@ -0,0 +1,70 @@
+"""
+diff based many-to-many writes
+
+the wanted target ids of every owner are compared in memory with the rows
+read in one query, then applied with one bulk_create and one delete per
+relation. django's m2m_changed is not sent, receivers listen to the single
+coalesced `m2m_bulk_changed` signal instead.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+
+from shared_features.signals import m2m_bulk_changed
+
+
+def bulk_set_m2m(model, field_name, targets_by_owner):
+    """
+    set many-to-many `field_name` of `model` rows to the given target ids
+
+    params:
+        targets_by_owner: {owner id: iterable of target ids}
+
+    returns ids of owners whose relation changed
+    """
+    field = model._meta.get_field(field_name)
+    through = field.remote_field.through
+    owner_column = f"{field.m2m_field_name()}_id"
+    target_column = f"{field.m2m_reverse_field_name()}_id"
+    wanted = {owner: set(targets) for owner, targets in targets_by_owner.items()}
+    if not wanted:
+        return set()
+
+    current = defaultdict(set)
+    removed = []
+    changed = set()
+    with transaction.atomic():
+        for pk, owner, target in through.objects.filter(
+            **{f"{owner_column}__in": list(wanted)}
+        ).values_list("pk", owner_column, target_column):
+            if target in wanted[owner]:
+                current[owner].add(target)
+            else:
+                removed.append(pk)
+                changed.add(owner)
+
+        added = []
+        for owner, targets in wanted.items():
+            for target in targets - current[owner]:
+                added.append(through(**{owner_column: owner, target_column: target}))
+                changed.add(owner)
+
+        if removed:
+            through.objects.filter(pk__in=removed).delete()
+        if added:
+            # conflicts come from concurrent edits adding the same row
+            through.objects.bulk_create(added, ignore_conflicts=True)
+
+    if changed:
+        m2m_bulk_changed.send(
+            sender=through, model=model, field_name=field_name, pks=changed
+        )
+    return changed
+
+
+def set_m2m(instance, field_name, target_ids):
+    """
+    bulk_set_m2m of a single instance, returns whether the relation changed
+    """
+    return bool(bulk_set_m2m(type(instance), field_name, {instance.pk: target_ids}))
@@ -0,0 +1,355 @@
+import contextvars
+import fcntl
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+# upper bounds of latency histogram buckets in seconds (prometheus defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# seconds between writes of the metrics of a worker to METRICS_DIRECTORY
+METRICS_FLUSH_INTERVAL = 5
+# metrics of exited workers, merged into one file
+METRICS_ARCHIVE = "archive.json"
+
+current_request_metrics = contextvars.ContextVar(
+    "current_request_metrics", default=None
+)
+
+
+class RequestMetrics:
+    """
+    timings collected while one request is handled, durations in seconds
+    """
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.es_count = 0
+        self.es_time = 0.0
+        self.serialize_time = 0.0
+        # nested serializers are measured once, by the outermost one
+        self.serialize_depth = 0
+        self.total_time = 0.0
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        """
+        database execute wrapper, see `connection.execute_wrapper()`
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_count += 1
+            self.sql_time += time.perf_counter() - start
+
+    def server_timing(self):
+        """
+        value of `Server-Timing` header, durations in milliseconds
+        """
+        return ", ".join(
+            (
+                f'sql;dur={self.sql_time * 1000:.1f};desc="{self.sql_count} queries"',
+                f'es;dur={self.es_time * 1000:.1f};desc="{self.es_count} calls"',
+                f"serialize;dur={self.serialize_time * 1000:.1f}",
+                f"total;dur={self.total_time * 1000:.1f}",
+            )
+        )
+
+
+@contextmanager
+def measure_es():
+    """
+    count an elasticsearch call of the current request and measure its time
+    """
+    metrics = current_request_metrics.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.es_count += 1
+            metrics.es_time += time.perf_counter() - start
+
+
+@contextmanager
+def measure_serialization():
+    """
+    measure serializer representations (`serializer.data`) and rendering of
+    the response body of the current request
+    """
+    metrics = current_request_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    metrics.serialize_depth += 1
+    try:
+        yield
+    finally:
+        metrics.serialize_depth -= 1
+        if not metrics.serialize_depth:
+            metrics.serialize_time += time.perf_counter() - start
+
+
+def metrics_directory():
+    return getattr(settings, "METRICS_DIRECTORY", None)
+
+
+@contextmanager
+def locked_metrics_directory(directory, exclusive=False):
+    """
+    readers of the worker files share the lock, archiving a file takes it
+    alone so no scrape counts a worker twice or not at all
+    """
+    with open(Path(directory) / ".lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def write_metrics_state(path, state):
+    # replaced at once, readers never see half a file
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_text(json.dumps(state))
+    os.replace(temporary, path)
+
+
+class MetricsRegistry:
+    """
+    per process latency histograms and counters per endpoint, rendered in
+    prometheus text format. Each worker process keeps its own registry.
+
+    with METRICS_DIRECTORY set (multi-worker servers, see core/gunicorn.conf.py)
+    a thread of every worker writes its registry there every
+    METRICS_FLUSH_INTERVAL seconds and `/metrics` renders the sum of all of
+    them, exited workers are merged into METRICS_ARCHIVE so counters do not
+    reset when workers are recycled.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.requests = defaultdict(int)
+        self.counters = defaultdict(float)
+        self.flushing_pid = None
+
+    def observe(self, method, route, status_code, metrics):
+        labels = (method, route)
+        with self.lock:
+            histogram = self.histograms.get(labels)
+            if histogram is None:
+                # bucket counts, sum, count
+                histogram = self.histograms[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if metrics.total_time <= bound:
+                    histogram[0][index] += 1
+                    break
+            histogram[1] += metrics.total_time
+            histogram[2] += 1
+
+            self.requests[(method, route, str(status_code))] += 1
+            self.counters[("sql_queries_total", labels)] += metrics.sql_count
+            self.counters[("sql_seconds_total", labels)] += metrics.sql_time
+            self.counters[("es_calls_total", labels)] += metrics.es_count
+            self.counters[("es_seconds_total", labels)] += metrics.es_time
+            self.counters[("serialize_seconds_total", labels)] += metrics.serialize_time
+        if metrics_directory() is not None:
+            self.start_flushing()
+
+    def start_flushing(self):
+        # one writer thread per worker, started after the fork
+        with self.lock:
+            if self.flushing_pid == os.getpid():
+                return
+            self.flushing_pid = os.getpid()
+        threading.Thread(target=self.flush_periodically, daemon=True).start()
+
+    def flush_periodically(self):
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL)
+            self.flush()
+
+    def state(self):
+        """
+        json serializable copy of the histograms and counters
+        """
+        with self.lock:
+            return {
+                "histograms": [
+                    [method, route, list(bucket_counts), total, count]
+                    for (method, route), (bucket_counts, total, count) in (
+                        self.histograms.items()
+                    )
+                ],
+                "requests": [
+                    [*labels, value] for labels, value in self.requests.items()
+                ],
+                "counters": [
+                    [name, *labels, value]
+                    for (name, labels), value in self.counters.items()
+                ],
+            }
+
+    def merge(self, state):
+        """
+        add a `state` of another registry to this one
+        """
+        with self.lock:
+            for method, route, bucket_counts, total, count in state["histograms"]:
+                histogram = self.histograms.setdefault(
+                    (method, route), [[0] * len(self.buckets), 0.0, 0]
+                )
+                histogram[0] = [
+                    mine + theirs for mine, theirs in zip(histogram[0], bucket_counts)
+                ]
+                histogram[1] += total
+                histogram[2] += count
+            for method, route, status, value in state["requests"]:
+                self.requests[(method, route, status)] += value
+            for name, method, route, value in state["counters"]:
+                self.counters[(name, (method, route))] += value
+
+    def flush(self):
+        """
+        write the registry of this process to METRICS_DIRECTORY, if set
+        """
+        directory = metrics_directory()
+        if directory is None:
+            return
+        write_metrics_state(Path(directory) / f"{os.getpid()}.json", self.state())
+
+    def render_all(self):
+        """
+        prometheus text of every worker of METRICS_DIRECTORY, of this
+        process only without one
+        """
+        directory = metrics_directory()
+        if directory is None:
+            return self.render()
+        self.flush()
+        merged = MetricsRegistry(self.buckets)
+        with locked_metrics_directory(directory):
+            for path in Path(directory).glob("*.json"):
+                merged.merge(json.loads(path.read_text()))
+        return merged.render()
+
+    @staticmethod
+    def format_labels(**labels):
+        values = ",".join(
+            '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+            for name, value in labels.items()
+        )
+        return "{" + values + "}"
+
+    def render(self):
+        lines = [
+            "# HELP http_request_duration_seconds Request latency per endpoint.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        with self.lock:
+            for (method, route), (bucket_counts, total, count) in sorted(
+                self.histograms.items()
+            ):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative += bucket_count
+                    labels = self.format_labels(method=method, route=route, le=bound)
+                    lines.append(f"http_request_duration_seconds_bucket{labels} {cumulative}")
+                labels = self.format_labels(method=method, route=route, le="+Inf")
+                lines.append(f"http_request_duration_seconds_bucket{labels} {count}")
+                labels = self.format_labels(method=method, route=route)
+                lines.append(f"http_request_duration_seconds_sum{labels} {total}")
+                lines.append(f"http_request_duration_seconds_count{labels} {count}")
+
+            lines.append("# HELP http_requests_total Requests per endpoint and status.")
+            lines.append("# TYPE http_requests_total counter")
+            for (method, route, status), value in sorted(self.requests.items()):
+                labels = self.format_labels(method=method, route=route, status=status)
+                lines.append(f"http_requests_total{labels} {value}")
+
+            names = sorted({name for name, _ in self.counters})
+            for name in names:
+                lines.append(f"# TYPE http_request_{name} counter")
+                for (counter_name, (method, route)), value in sorted(
+                    self.counters.items()
+                ):
+                    if counter_name == name:
+                        labels = self.format_labels(method=method, route=route)
+                        lines.append(f"http_request_{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def archive_worker_metrics(directory, pid):
+    """
+    merge the file of exited worker `pid` into METRICS_ARCHIVE, called by the
+    server master so the directory holds one file per live worker
+    """
+    directory = Path(directory)
+    path = directory / f"{pid}.json"
+    with locked_metrics_directory(directory, exclusive=True):
+        if not path.exists():
+            return
+        archive = MetricsRegistry()
+        archive_path = directory / METRICS_ARCHIVE
+        if archive_path.exists():
+            archive.merge(json.loads(archive_path.read_text()))
+        archive.merge(json.loads(path.read_text()))
+        write_metrics_state(archive_path, archive.state())
+        path.unlink()
+
+
+class TaskMetrics:
+    """
+    outcomes and timings of the tasks run by the worker threads of one
+    process (see shared_features.task_queue), durations in seconds
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.outcomes = defaultdict(int)
+        self.run_time = defaultdict(float)
+        self.runs = defaultdict(int)
+        # from `run_at` to the claim
+        self.wait_time = 0.0
+
+    def observe(self, name, outcome, run_time, wait_time):
+        with self.lock:
+            self.outcomes[outcome] += 1
+            self.run_time[name] += run_time
+            self.runs[name] += 1
+            self.wait_time += max(wait_time, 0.0)
+
+    def summary(self):
+        """
+        one line of throughput since the start, outcomes, average wait and the
+        average run time per task name
+        """
+        with self.lock:
+            total = sum(self.runs.values())
+            elapsed = max(time.monotonic() - self.started, 1e-9)
+            parts = [
+                f"{total / elapsed:.2f} tasks/s",
+                *(
+                    f"{count} {outcome}"
+                    for outcome, count in sorted(self.outcomes.items())
+                ),
+                f"wait {self.wait_time / total if total else 0:.3f}s",
+                *(
+                    f"{name} {self.run_time[name] / runs:.3f}s x{runs}"
+                    for name, runs in sorted(self.runs.items())
+                ),
+            ]
+        return ", ".join(parts)
@@ -0,0 +1,106 @@
+"""
+MinHash signatures and LSH bands of texts for near-duplicate detection
+
+a signature holds, for each of NUM_PERMUTATIONS hash functions, the smallest
+hash of the text's word shingles. the share of equal positions of two
+signatures estimates the Jaccard similarity of their shingle sets.
+signatures are cut into BANDS bands of ROWS_PER_BAND rows, texts sharing a
+band bucket are candidate duplicates, found by index lookups instead of
+comparing every pair: texts of similarity s share a bucket with probability
+1 - (1 - s ** ROWS_PER_BAND) ** BANDS (0.95 at 0.8, 0.05 at 0.5).
+
+signatures depend on MINHASH_SEED and the parameters, stored signatures must
+be computed again after changing them.
+"""
+
+import array
+import hashlib
+import random
+import re
+import unicodedata
+
+NUM_PERMUTATIONS = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+MINHASH_SEED = 1
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# universal hash functions (a * x + b) mod p, fixed by the seed so every
+# process computes the same signatures
+_random = random.Random(MINHASH_SEED)
+PERMUTATIONS = tuple(
+    (_random.randrange(1, MERSENNE_PRIME), _random.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+)
+
+WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text):
+    """
+    set of SHINGLE_SIZE word n-grams of a text, case and punctuation
+    insensitive. texts shorter than a shingle are one shingle
+    """
+    words = WORD_RE.findall(unicodedata.normalize("NFKC", text or "").casefold())
+    if len(words) <= SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {
+        " ".join(words[start : start + SHINGLE_SIZE])
+        for start in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def shingle_hash(shingle):
+    return int.from_bytes(
+        hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little"
+    )
+
+
+def signature(text):
+    """
+    MinHash signature of a text as a tuple of NUM_PERMUTATIONS 32 bit ints,
+    None for texts without words
+    """
+    hashes = [shingle_hash(shingle) for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return tuple(
+        min((a * value + b) % MERSENNE_PRIME for value in hashes) & MAX_HASH
+        for a, b in PERMUTATIONS
+    )
+
+
+def pack(values):
+    """
+    4 bytes per value (NUM_PERMUTATIONS * 4 bytes per signature)
+    """
+    return array.array("I", values).tobytes()
+
+
+def unpack(data):
+    values = array.array("I")
+    values.frombytes(bytes(data))
+    return tuple(values)
+
+
+def similarity(first, second):
+    """
+    estimated Jaccard similarity of the texts of two signatures
+    """
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+def band_buckets(values):
+    """
+    [(band, bucket)] of a signature, buckets are signed 64 bit ints so they
+    fit a BigIntegerField
+    """
+    buckets = []
+    for band in range(BANDS):
+        rows = values[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(pack(rows), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, "little", signed=True)))
+    return buckets
@@ -0,0 +1,118 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+
+class TokenBucketStore:
+    """
+    base token bucket store, a bucket holds up to `capacity` tokens and is
+    refilled with `refill_rate` tokens per second. Each request takes one.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, state, timeout):
+        raise NotImplementedError
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        """
+        take a token from the bucket of `key`
+
+        returns (allowed, seconds to wait until next token)
+        """
+        now = time.monotonic() if now is None else now
+        state = self.get(key)
+        if state is None:
+            tokens, updated = float(capacity), now
+        else:
+            tokens, updated = state
+            tokens = min(float(capacity), tokens + max(0.0, now - updated) * refill_rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / refill_rate
+
+        # an untouched bucket is full again after capacity / refill_rate seconds
+        self.set(key, (tokens, now), timeout=int(capacity / refill_rate) + 1)
+        return wait == 0.0, wait
+
+
+class InMemoryTokenBucketStore(TokenBucketStore):
+    """
+    per process store, keeps at most `max_keys` buckets (least recently used
+    are dropped) so a flood of distinct ips or emails can not grow memory
+    """
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        return self.buckets.get(key)
+
+    def set(self, key, state, timeout):
+        self.buckets[key] = state
+        self.buckets.move_to_end(key)
+        if len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        with self.lock:
+            return super().consume(key, capacity, refill_rate, now)
+
+
+class CacheTokenBucketStore(TokenBucketStore):
+    """
+    store shared between workers through a django cache (e.g. memcached).
+    read and write are not atomic, concurrent requests of one key may take
+    the same token, which is fine for abuse protection.
+    """
+
+    def __init__(self, alias="default", prefix="token_bucket"):
+        self.alias = alias
+        self.prefix = prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def cache_key(self, key):
+        # keys hold client input (emails), memcached rejects long ones and
+        # ones with spaces or control characters
+        return f"{self.prefix}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    def get(self, key):
+        return self.cache.get(self.cache_key(key))
+
+    def set(self, key, state, timeout):
+        # wall clock time, monotonic clocks differ between processes
+        self.cache.set(self.cache_key(key), state, timeout)
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        return super().consume(
+            key, capacity, refill_rate, time.time() if now is None else now
+        )
+
+
+class ConcurrencyLimiter:
+    """
+    caps in flight executions of a code path in this process, callers that
+    can not get a slot immediately are rejected instead of queued
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.semaphore = threading.BoundedSemaphore(limit)
+
+    def try_acquire(self):
+        return self.semaphore.acquire(blocking=False)
+
+    def release(self):
+        self.semaphore.release()
@@ -0,0 +1,161 @@
+"""
+in-process cache of small, rarely changing tables (skills, industry areas)
+
+every worker keeps the whole table as a sorted id array and a tuple of names
+and answers lookups without queries. a version stamp in the shared cache is
+bumped after each save or delete (see shared_features.signals), workers
+compare it at most every REFERENCE_DATA_CHECK_INTERVAL seconds and reload
+when it moved. writes that bypass signals (bulk_create, update) must call
+`invalidate()`, snapshots older than REFERENCE_DATA_MAX_AGE are reloaded in
+any case.
+"""
+
+import threading
+import time
+import uuid
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def default_name_key(name):
+    return " ".join(name.split()).casefold()
+
+
+class ReferenceSnapshot:
+    """
+    immutable id/name maps of one version of a table
+    """
+
+    __slots__ = ("ids", "names", "id_by_key", "version", "loaded_at")
+
+    def __init__(self, rows, name_key, version):
+        rows = sorted(rows)
+        self.ids = array("q", (pk for pk, _ in rows))
+        self.names = tuple(name for _, name in rows)
+        # first (lowest) id wins when names collide
+        self.id_by_key = {}
+        for pk, name in rows:
+            self.id_by_key.setdefault(name_key(name), pk)
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+    def index(self, pk):
+        position = bisect_left(self.ids, pk)
+        if position < len(self.ids) and self.ids[position] == pk:
+            return position
+        return None
+
+
+class ReferenceData:
+    """
+    id <-> name lookups of a reference table with zero queries
+
+    `get_rows` returns (id, name) pairs of the live rows, `name_key`
+    normalizes names for `get_id` / `get_ids`.
+    """
+
+    def __init__(self, label, get_rows, name_key=default_name_key):
+        self.label = label
+        self.get_rows = get_rows
+        self.name_key = name_key
+        self.version_key = f"reference_data_version:{label}"
+        self.snapshot = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        # shared by the copies serializers make of their fields
+        return self
+
+    @property
+    def check_interval(self):
+        return getattr(settings, "REFERENCE_DATA_CHECK_INTERVAL", 1)
+
+    @property
+    def max_age(self):
+        return getattr(settings, "REFERENCE_DATA_MAX_AGE", 300)
+
+    def current(self):
+        snapshot = self.snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - self.checked_at < self.check_interval:
+            return snapshot
+
+        version = cache.get(self.version_key)
+        if (
+            snapshot is not None
+            and snapshot.version == version
+            and now - snapshot.loaded_at < self.max_age
+        ):
+            self.checked_at = now
+            return snapshot
+
+        with self.lock:
+            # another thread may have reloaded while this one waited
+            if self.snapshot is not None and self.snapshot is not snapshot:
+                return self.snapshot
+            if version is None:
+                version = uuid.uuid4().hex
+                if not cache.add(self.version_key, version, None):
+                    version = cache.get(self.version_key)
+            self.snapshot = ReferenceSnapshot(self.get_rows(), self.name_key, version)
+            self.checked_at = time.monotonic()
+            return self.snapshot
+
+    def invalidate(self):
+        """
+        bump the version stamp once the current transaction commits, every
+        worker reloads on its next check
+        """
+        self.snapshot = None
+        transaction.on_commit(
+            lambda: cache.set(self.version_key, uuid.uuid4().hex, None)
+        )
+
+    def exists(self, pk):
+        return self.current().index(pk) is not None
+
+    def missing(self, pks):
+        """
+        ids of `pks` that do not exist, in the given order
+        """
+        snapshot = self.current()
+        return [pk for pk in pks if snapshot.index(pk) is None]
+
+    def get_name(self, pk, default=None):
+        snapshot = self.current()
+        position = snapshot.index(pk)
+        return default if position is None else snapshot.names[position]
+
+    def get_names(self, pks):
+        """
+        names of existing ids of `pks`, in the given order
+        """
+        snapshot = self.current()
+        positions = (snapshot.index(pk) for pk in pks)
+        return [
+            snapshot.names[position] for position in positions if position is not None
+        ]
+
+    def get_id(self, name, default=None):
+        return self.current().id_by_key.get(self.name_key(name), default)
+
+    def get_ids(self, names):
+        """
+        {name: id} of the known names of `names`
+        """
+        id_by_key = self.current().id_by_key
+        ids = {}
+        for name in names:
+            pk = id_by_key.get(self.name_key(name))
+            if pk is not None:
+                ids[name] = pk
+        return ids
+
+    def as_dict(self):
+        snapshot = self.current()
+        return dict(zip(snapshot.ids, snapshot.names))
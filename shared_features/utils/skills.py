@@ -0,0 +1,100 @@
+"""
+skill name canonicalization and merge of duplicate skills
+
+functions take the Skill model as a parameter. the migration adding
+canonical names keeps its own copy, so changes here do not change it.
+"""
+
+import unicodedata
+from collections import defaultdict
+
+from django.db.models import Count, Exists, OuterRef
+
+MERGE_BATCH_SIZE = 500
+
+
+def canonical_skill_name(name):
+    """
+    key of a skill name, "Python", " python " and "PYTHON" share one key
+    """
+    return " ".join(unicodedata.normalize("NFKC", name).split()).casefold()
+
+
+def skill_relations(Skill):
+    """
+    (through model, owner column, skill column) of every many-to-many
+    relation to Skill (job posting skills, job seeker skills)
+    """
+    relations = []
+    for relation in Skill._meta.related_objects:
+        if not relation.many_to_many:
+            continue
+        field = relation.field
+        relations.append(
+            (
+                field.remote_field.through,
+                field.m2m_field_name(),
+                field.m2m_reverse_field_name(),
+            )
+        )
+    return relations
+
+
+def duplicate_skill_groups(Skill):
+    """
+    {kept id: [duplicate ids]} of active skills sharing a canonical name,
+    the skill with the lowest id is kept
+    """
+    active = Skill.objects.filter(is_removed=False)
+    duplicated = (
+        active.values("canonical_name")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .values("canonical_name")
+    )
+    members = defaultdict(list)
+    for canonical_name, pk in (
+        active.filter(canonical_name__in=duplicated)
+        .values_list("canonical_name", "id")
+        .order_by("canonical_name", "id")
+    ):
+        members[canonical_name].append(pk)
+    return {pks[0]: pks[1:] for pks in members.values()}
+
+
+def merge_skills(Skill, groups, batch_size=MERGE_BATCH_SIZE):
+    """
+    merge each group of `groups` ({kept id: [duplicate ids]}) into its kept
+    skill. per group and many-to-many relation one statement deletes rows
+    made redundant (the owner already has a lower id skill of the group) and
+    one rewrites the others, duplicates are soft deleted in batches.
+
+    returns {owner model: ids of owners whose skill rows were rewritten}
+    """
+    changed = {}
+    for through, owner, skill in skill_relations(Skill):
+        owner_ids = set()
+        for kept_id, duplicate_ids in groups.items():
+            rows = through.objects.filter(**{f"{skill}_id__in": duplicate_ids})
+            owner_ids.update(rows.values_list(f"{owner}_id", flat=True))
+            rows.filter(
+                Exists(
+                    through.objects.filter(
+                        **{
+                            f"{owner}_id": OuterRef(f"{owner}_id"),
+                            f"{skill}_id__in": [kept_id, *duplicate_ids],
+                            f"{skill}_id__lt": OuterRef(f"{skill}_id"),
+                        }
+                    )
+                )
+            ).delete()
+            rows.update(**{f"{skill}_id": kept_id})
+        if owner_ids:
+            changed[through._meta.get_field(owner).related_model] = owner_ids
+
+    duplicate_ids = sorted(pk for pks in groups.values() for pk in pks)
+    for start in range(0, len(duplicate_ids), batch_size):
+        Skill.objects.filter(pk__in=duplicate_ids[start : start + batch_size]).update(
+            is_removed=True
+        )
+    return changed
@@ -0,0 +1,90 @@
+import csv
+
+from django.http import StreamingHttpResponse
+
+from ..renderers import encoder_default, orjson
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    """
+    pseudo buffer for csv.writer, returns the written row instead of storing it
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(fields, rows, buffer_rows=500):
+    """
+    yield `rows` (tuples in order of `fields`) as csv, header first so the
+    response starts before the first database chunk is fetched
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    buffer = []
+    for row in rows:
+        buffer.append(writer.writerow(row))
+        if len(buffer) >= buffer_rows:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def ndjson_stream(fields, rows, buffer_rows=500):
+    """
+    yield `rows` (tuples in order of `fields`) as newline delimited json
+    """
+    if orjson is not None:
+        dumps = lambda obj: orjson.dumps(obj, default=encoder_default)
+    else:  # pragma: no cover - orjson is optional
+        import json
+
+        dumps = lambda obj: json.dumps(obj, default=encoder_default).encode()
+
+    buffer = []
+    for row in rows:
+        buffer.append(dumps(dict(zip(fields, row))))
+        if len(buffer) >= buffer_rows:
+            yield b"\n".join(buffer) + b"\n"
+            buffer = []
+    if buffer:
+        yield b"\n".join(buffer) + b"\n"
+
+
+def export_rows(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    iterate `fields` of `queryset` as tuples without building model instances
+    or caching the result, memory stays bound by `chunk_size`
+    """
+    # rows are read while the response streams, after the request has left
+    # the middlewares, bind the database routed for the request now
+    queryset = queryset.using(queryset.db)
+    return queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+
+
+def export_stream(export_format, fields, rows):
+    if export_format == "csv":
+        return csv_stream(fields, rows)
+    return ndjson_stream(fields, rows)
+
+
+def streaming_export_response(export_format, fields, rows, filename):
+    """
+    build a StreamingHttpResponse for an export in `csv` or `ndjson` format
+    """
+    response = StreamingHttpResponse(
+        export_stream(export_format, fields, rows),
+        content_type=EXPORT_CONTENT_TYPES[export_format],
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    return response
@@ -1,3 +1,28 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
 
-# Create your views here.
+from .utils.metrics import registry
+
+
+def metrics_view(request):
+    """
+    prometheus scrape endpoint with request metrics of every worker process
+    (see MetricsRegistry), of this process when METRICS_DIRECTORY is not set
+
+    when METRICS_TOKEN is set, scrapers must send `Authorization: Bearer <token>`,
+    otherwise only staff users can read it
+    """
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if token:
+        allowed = constant_time_compare(
+            request.headers.get("Authorization", ""), f"Bearer {token}"
+        )
+    else:
+        allowed = request.user.is_authenticated and request.user.is_staff
+    if not allowed:
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        registry.render_all(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )